@@ -1,6 +1,8 @@
 import os
 import time
 import sys
+import queue
+import threading
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
 from pathlib import Path
@@ -9,7 +11,28 @@ from pathlib import Path
 ROOT_DIR = Path(__file__).parent
 sys.path.append(str(ROOT_DIR))
 
+from src.audio_buffer import AudioBuffer
 from src.logic_component import WX_ASR
+from src.segment_asr import TranscriptionCancelled
+
+# 处理流程的各个阶段（用于进度显示）
+PIPELINE_STAGES = [
+    "解码音频",
+    "修改音频",
+    "转录原始音频",
+    "转录修改后音频",
+    "比较转录结果",
+]
+
+# 后台任务进度轮询间隔（毫秒）
+POLL_INTERVAL_MS = 100
+
+# 处理档位（界面显示名称 -> stft_engine 档位），快速预览固定使用 "preview"
+TIER_CHOICES = {"标准": "standard", "最终导出": "final", "预览": "preview"}
+
+
+class JobCancelled(Exception):
+    """用户取消了正在进行的处理任务"""
 
 
 class AudioProcessorGUI:
@@ -33,8 +56,17 @@ class AudioProcessorGUI:
         self.style.configure("TFrame", background="#f0f0f0")
         self.style.configure("TLabelframe", background="#f0f0f0")
 
-        # 初始化语音识别模块
-        self.wxasr = WX_ASR()
+        # 初始化语音识别模块，窗口显示期间在后台导入重量级依赖
+        self.wxasr = WX_ASR(warm_up=True)
+
+        # 后台任务状态：进度队列、取消标记和工作线程
+        self.progress_queue: queue.Queue = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.worker = None
+
+        # 最近一次解码的输入（(路径, 修改时间), AudioBuffer），反复预览时不再重新解码
+        self.source_cache = None
+
         # 设置GUI组件
         self.setup_gui()
 
@@ -104,17 +136,49 @@ class AudioProcessorGUI:
             command=lambda v: self.volume_label.configure(text=f"{float(v)*100:.1f}%")
         )
 
+        # 处理档位
+        tier_frame = ttk.LabelFrame(params_frame, text="处理档位", padding="5")
+        tier_frame.grid(row=0, column=2, padx=10)
+        self.tier_var = tk.StringVar(value="标准")
+        ttk.Combobox(
+            tier_frame,
+            textvariable=self.tier_var,
+            values=list(TIER_CHOICES),
+            state="readonly",
+            width=10,
+        ).grid(row=0, column=0, padx=5, pady=(0, 18))
+
         # 按钮框架
         button_frame = ttk.Frame(control_frame)
         button_frame.grid(row=2, column=0, columnspan=3, pady=10)
 
         # 处理按钮
-        ttk.Button(
+        self.process_button = ttk.Button(
             button_frame,
             text="处理音频",
             style="Action.TButton",
             command=self.process_audio,
-        ).grid(row=0, column=0, padx=10)
+        )
+        self.process_button.grid(row=0, column=0, padx=10)
+
+        # 快速预览按钮（只生成修改后的音频，不做识别）
+        self.preview_button = ttk.Button(
+            button_frame,
+            text="快速预览",
+            style="Action.TButton",
+            command=self.preview_audio,
+        )
+        self.preview_button.grid(row=0, column=1, padx=10)
+
+        # 取消按钮（仅在处理过程中可用）
+        self.cancel_button = ttk.Button(
+            button_frame,
+            text="取消",
+            style="Action.TButton",
+            command=self.cancel_processing,
+            state=tk.DISABLED,
+        )
+        self.cancel_button.grid(row=0, column=2, padx=10)
 
         # 重置按钮
         ttk.Button(
@@ -122,7 +186,7 @@ class AudioProcessorGUI:
             text="重置",
             style="Action.TButton",
             command=self.reset_all,
-        ).grid(row=0, column=1, padx=10)
+        ).grid(row=0, column=3, padx=10)
 
         # 结果显示区域
         result_frame = ttk.LabelFrame(main_frame, text="识别结果", padding="15")
@@ -176,6 +240,12 @@ class AudioProcessorGUI:
         )
         status_label.grid(row=3, column=0, columnspan=3, pady=10)
 
+        # 进度条
+        self.progress_bar = ttk.Progressbar(
+            main_frame, maximum=len(PIPELINE_STAGES), length=600
+        )
+        self.progress_bar.grid(row=4, column=0, columnspan=3, pady=(0, 10))
+
     def select_input_file(self):
         file_path = filedialog.askopenfilename(
             title="选择音频/视频文件",
@@ -201,103 +271,265 @@ class AudioProcessorGUI:
                 messagebox.showerror("错误", "文件大小超过100MB，请选择更小的文件")
                 return
 
-            # 检查是否为视频文件
+            # 视频文件：在后台线程中解码、修改音轨并重新封装，界面保持响应
             if file_path.lower().endswith((".mp4", ".avi", ".mkv", ".mov")):
-                try:
-                    self.status_var.set("[...] 正在处理视频...")
-
-                    # 创建临时和输出目录
-                    temp_dir = ROOT_DIR / "media" / "temp"
-                    output_dir = ROOT_DIR / "media" / "output"
-                    os.makedirs(temp_dir, exist_ok=True)
-                    os.makedirs(output_dir, exist_ok=True)
-
-                    # 生成临时音频文件路径
-                    temp_audio = temp_dir / f"temp_audio_{int(time.time())}.wav"
-
-                    # 提取音频
-                    import moviepy.editor as mp
-
-                    video = mp.VideoFileClip(file_path)
-                    video.audio.write_audiofile(str(temp_audio))
-                    video.close()
-
-                    # 修改音频
-                    modified_audio, sr = WX_ASR.modify_audio(
-                        file_path=str(temp_audio),
-                        output_path=str(temp_audio),
-                        noise_level=0.02,
-                        volume_gain=0.8,
-                    )
-
-                    # 生成输出视频路径
-                    output_video = output_dir / f"modified_video_{int(time.time())}.mp4"
-
-                    # 替换视频音频
-                    WX_ASR.modify_video_audio(
-                        file_path, str(temp_audio), str(output_video)
-                    )
-
-                    self.status_var.set("[√] 视频处理成功")
-                    self.input_path_var.set(str(output_video))
-
-                except Exception as e:
-                    messagebox.showerror("错误", f"处理视频失败: {str(e)}")
+                if self.worker is not None and self.worker.is_alive():
+                    messagebox.showinfo("提示", "正在处理中，请稍候或先取消当前任务")
                     return
 
+                # 创建输出目录
+                output_dir = ROOT_DIR / "media" / "output"
+                os.makedirs(output_dir, exist_ok=True)
+                output_video = output_dir / f"modified_video_{int(time.time())}.mp4"
+
+                self.start_worker(
+                    self.run_video, (file_path, output_video), "[...] 正在处理视频..."
+                )
+
         self.input_path_var.set(file_path)
 
     def process_audio(self):
+        """在后台线程中启动处理流程，界面保持响应"""
+        input_path = self.input_path_var.get()
+        if not input_path:
+            messagebox.showerror("错误", "请选择输入文件")
+            return
+
+        if self.worker is not None and self.worker.is_alive():
+            messagebox.showinfo("提示", "正在处理中，请稍候或先取消当前任务")
+            return
+
+        # 创建输出目录
+        output_dir = ROOT_DIR / "media" / "output"
+        os.makedirs(output_dir, exist_ok=True)
+
+        # 生成输出文件路径
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        output_path = output_dir / f"modified_audio_{timestamp}.wav"
+
+        # Tk 控件只能在主线程读取，先取出参数再交给工作线程
+        params = {
+            "noise_level": self.noise_level.get(),
+            "volume_gain": self.volume_gain.get(),
+            "tier": TIER_CHOICES[self.tier_var.get()],
+        }
+
+        # 清空上一次的结果
+        self.original_text.delete(1.0, tk.END)
+        self.modified_text.delete(1.0, tk.END)
+        self.comparison_text.delete(1.0, tk.END)
+        self.progress_bar["value"] = 0
+
+        self.start_worker(
+            self.run_pipeline,
+            (input_path, output_path, params),
+            f"[...] {PIPELINE_STAGES[0]}...",
+        )
+
+    def preview_audio(self):
+        """以预览档位在后台快速生成修改后的音频，用于试听当前参数的效果"""
+        input_path = self.input_path_var.get()
+        if not input_path:
+            messagebox.showerror("错误", "请选择输入文件")
+            return
+
+        if self.worker is not None and self.worker.is_alive():
+            messagebox.showinfo("提示", "正在处理中，请稍候或先取消当前任务")
+            return
+
+        output_dir = ROOT_DIR / "media" / "output"
+        os.makedirs(output_dir, exist_ok=True)
+        output_path = output_dir / f"preview_{time.strftime('%Y%m%d_%H%M%S')}.wav"
+
+        params = {
+            "noise_level": self.noise_level.get(),
+            "volume_gain": self.volume_gain.get(),
+            "tier": "preview",
+        }
+
+        self.start_worker(
+            self.run_preview, (input_path, output_path, params), "[...] 正在生成预览..."
+        )
+
+    def start_worker(self, target, args, status):
+        """在后台线程中启动任务，并开始轮询进度"""
+        # 上一个任务线程（包括已取消的）结束后才开始新任务，不会与新任务争用模型或写入同一任务
+        if self.worker is not None:
+            self.worker.join()
+
+        self.cancel_event.clear()
+        self.process_button.configure(state=tk.DISABLED)
+        self.preview_button.configure(state=tk.DISABLED)
+        self.cancel_button.configure(state=tk.NORMAL)
+        self.status_var.set(status)
+
+        self.worker = threading.Thread(target=target, args=args, daemon=True)
+        self.worker.start()
+        self.root.after(POLL_INTERVAL_MS, self.poll_progress)
+
+    def cancel_processing(self):
+        """请求取消当前任务（转录在当前批次结束后停止，工作线程结束后才可开始新任务）"""
+        self.cancel_event.set()
+        self.cancel_button.configure(state=tk.DISABLED)
+        self.status_var.set("[...] 正在取消...")
+
+    def report(self, kind, *payload):
+        """工作线程向主线程发送消息"""
+        self.progress_queue.put((kind, payload))
+
+    def check_cancelled(self):
+        if self.cancel_event.is_set():
+            raise JobCancelled()
+
+    def load_source(self, input_path):
+        """解码输入文件；文件未变化时复用上一次的解码结果（只在工作线程中调用）"""
+        key = (input_path, os.path.getmtime(input_path))
+        if self.source_cache is not None and self.source_cache[0] == key:
+            return self.source_cache[1]
+
+        source = AudioBuffer.load(input_path)
+        self.source_cache = (key, source)
+        return source
+
+    def run_preview(self, input_path, output_path, params):
+        """后台线程：只解码和修改音频，不做识别"""
         try:
-            input_path = self.input_path_var.get()
-            if not input_path:
-                messagebox.showerror("错误", "请选择输入文件")
-                return
+            start = time.perf_counter()
+            source = self.load_source(input_path)
+            self.check_cancelled()
+
+            preview = WX_ASR.modify_buffer(source, **params)
+            self.check_cancelled()
+
+            preview.write(str(output_path))
+            self.report("preview", str(output_path), time.perf_counter() - start)
+        except JobCancelled:
+            self.report("cancelled")
+        except Exception as e:
+            self.report("error", str(e))
 
-            # 创建输出目录
-            output_dir = ROOT_DIR / "media" / "output"
-            os.makedirs(output_dir, exist_ok=True)
+    def run_video(self, input_path, output_video):
+        """后台线程：修改视频音轨并重新封装为新的视频文件"""
+        try:
+            # 直接解码视频音轨（只解码一次，不再落盘临时音频）
+            source = self.load_source(input_path)
+            self.check_cancelled()
+
+            # 修改音频
+            modified = WX_ASR.modify_buffer(source, noise_level=0.02, volume_gain=0.8)
+            self.check_cancelled()
+
+            # 替换视频音频
+            WX_ASR.modify_video_audio(input_path, modified, str(output_video))
+            self.report("video", str(output_video))
+        except JobCancelled:
+            self.report("cancelled")
+        except Exception as e:
+            self.report("error", f"处理视频失败: {str(e)}")
+
+    def run_pipeline(self, input_path, output_path, params):
+        """后台线程：解码、修改、转录、比较，不直接操作任何 Tk 控件"""
+        job_id, status = None, "failed"
+        try:
+            # 每次处理登记为独立任务，转录与比较结果互不覆盖，之后也可以查询
+            job_id = self.wxasr.store.create_job("pipeline", input_path, params)
 
-            # 生成输出文件路径
-            timestamp = time.strftime("%Y%m%d_%H%M%S")
-            output_path = output_dir / f"modified_audio_{timestamp}.wav"
+            # 解码一次，后续修改和两次识别共用内存中的音频
+            source = self.load_source(input_path)
+            self.report("stage", 1)
+            self.check_cancelled()
 
             # 处理音频
-            modified_audio, sr = WX_ASR.modify_audio(
-                input_path,
-                str(output_path),
-                noise_level=self.noise_level.get(),
-                volume_gain=self.volume_gain.get(),
-            )
-
-            if modified_audio is not None and modified_audio.size > 0:
-                self.status_var.set(f"[√] 音频处理成功，采样率: {sr}Hz")
-
-                # 进行语音识别
-                original = self.wxasr.ASR_Tester(file_path=input_path)
-                modified = self.wxasr.ASR_Tester(file_path=str(output_path))
-
-                # 显示识别结果
-                self.original_text.delete(1.0, tk.END)
-                self.original_text.insert(tk.END, original or "识别失败")
-
-                self.modified_text.delete(1.0, tk.END)
-                self.modified_text.insert(tk.END, modified or "识别失败")
-
-                # 比较转录结果
-                transcription_file = (
-                    ROOT_DIR / "media" / "transcribe" / "transcription.txt"
+            modified_audio = WX_ASR.modify_buffer(source, **params)
+            modified_audio.write(str(output_path))
+            # 输出文件是原子写出的新文件，产物直接硬链接，不再复制一份
+            self.wxasr.store.put_file(job_id, "modified.wav", output_path, link=True)
+            self.report("stage", 2, f"音频处理成功，采样率: {modified_audio.sr}Hz")
+            self.check_cancelled()
+
+            if modified_audio.samples.size == 0:
+                raise ValueError("处理后的音频为空")
+
+            # 两次识别共用同一个模型（推理本就按模型串行），在本线程中依次进行；
+            # 按静音切分的窗口分批解码，每批之间检查取消标记，取消后不再写入任务产物
+            for done, (name, audio) in enumerate(
+                (("original", source), ("modified", modified_audio)), start=3
+            ):
+                text = self.wxasr.ASR_Tester(
+                    audio,
+                    mode="vad",
+                    job_id=job_id,
+                    name=name,
+                    cancel_event=self.cancel_event,
                 )
-                if transcription_file.exists():
-                    comparison = self.wxasr.compare_transcriptions(
-                        str(transcription_file)
-                    )
-                    self.comparison_text.delete(1.0, tk.END)
-                    self.format_comparison_result(comparison)
-
+                self.report("text", name, text)
+                self.report("stage", done)
+                self.check_cancelled()
+
+            # 比较本任务中原始音频与修改后音频的转录结果
+            comparison = self.wxasr.compare_job(job_id)
+            status = "done"
+            self.report("stage", len(PIPELINE_STAGES))
+            self.report("done", comparison)
+
+        except (JobCancelled, TranscriptionCancelled):
+            status = "cancelled"
+            self.report("cancelled")
         except Exception as e:
-            self.status_var.set(f"[x] 错误: {str(e)}")
-            messagebox.showerror("错误", str(e))
+            self.report("error", str(e))
+        finally:
+            if job_id is not None:
+                self.wxasr.store.finish_job(job_id, status)
+
+    def poll_progress(self):
+        """主线程定时读取后台任务的进度消息并更新界面"""
+        finished = False
+        while True:
+            try:
+                kind, payload = self.progress_queue.get_nowait()
+            except queue.Empty:
+                break
+
+            if kind == "stage":
+                completed = payload[0]
+                self.progress_bar["value"] = completed
+                if len(payload) > 1:
+                    self.status_var.set(f"[√] {payload[1]}")
+                elif completed < len(PIPELINE_STAGES):
+                    self.status_var.set(f"[...] {PIPELINE_STAGES[completed]}...")
+            elif kind == "text":
+                name, text = payload
+                widget = (
+                    self.original_text if name == "original" else self.modified_text
+                )
+                widget.delete(1.0, tk.END)
+                widget.insert(tk.END, text or "识别失败")
+            elif kind == "done":
+                self.comparison_text.delete(1.0, tk.END)
+                self.format_comparison_result(payload[0])
+                self.status_var.set("[√] 处理完成")
+                finished = True
+            elif kind == "video":
+                self.status_var.set(f"[√] 视频处理成功: {payload[0]}")
+                finished = True
+            elif kind == "preview":
+                path, seconds = payload
+                self.status_var.set(f"[√] 预览已生成（{seconds:.2f} 秒）: {path}")
+                finished = True
+            elif kind == "cancelled":
+                self.status_var.set("[x] 任务已取消")
+                finished = True
+            elif kind == "error":
+                self.status_var.set(f"[x] 错误: {payload[0]}")
+                messagebox.showerror("错误", payload[0])
+                finished = True
+
+        if finished:
+            self.process_button.configure(state=tk.NORMAL)
+            self.preview_button.configure(state=tk.NORMAL)
+            self.cancel_button.configure(state=tk.DISABLED)
+        else:
+            self.root.after(POLL_INTERVAL_MS, self.poll_progress)
 
     def format_comparison_result(self, result):
         if "错误" in result:
@@ -319,6 +551,16 @@ class AudioProcessorGUI:
             tk.END, f"└─ 总字符数: {comparison['相似度分析']['总字符数']}\n\n"
         )
 
+        # 错误率分析
+        error_rates = comparison["错误率分析"]
+        self.comparison_text.insert(tk.END, "【错误率分析】\n")
+        self.comparison_text.insert(
+            tk.END, f"├─ 字错误率 (CER): {error_rates['字错误率']}\n"
+        )
+        self.comparison_text.insert(
+            tk.END, f"└─ 词错误率 (WER): {error_rates['词错误率']}\n\n"
+        )
+
         # 文本统计
         self.comparison_text.insert(tk.END, "【文本统计】\n")
         self.comparison_text.insert(
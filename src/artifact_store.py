@@ -0,0 +1,434 @@
+import os
+import sys
+import json
+import time
+import uuid
+import shutil
+import sqlite3
+import hashlib
+import argparse
+import tempfile
+import threading
+import numpy as np
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+# 直接运行本文件时也能以 src 包的形式导入同级模块
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.audio_buffer import AudioBuffer
+
+# 默认存储目录：index.sqlite 为索引，blobs/ 下按内容哈希保存文件
+DEFAULT_STORE_DIR = Path(__file__).parent.parent / "media" / "artifacts"
+
+# 多进程同时写入时等待数据库锁的时间（秒）
+BUSY_TIMEOUT: float = 30.0
+
+# 计算文件哈希时每次读取的字节数
+HASH_CHUNK: int = 1024 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    source_path TEXT,
+    source_hash TEXT,
+    params TEXT NOT NULL,
+    created REAL NOT NULL,
+    finished REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_source ON jobs (source_hash, kind);
+CREATE TABLE IF NOT EXISTS artifacts (
+    job_id TEXT NOT NULL REFERENCES jobs (id),
+    name TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    PRIMARY KEY (job_id, name)
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    job_id TEXT NOT NULL REFERENCES jobs (id),
+    name TEXT NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (job_id, name)
+);
+"""
+
+
+def link_or_copy(source: Union[str, Path], target: Union[str, Path]) -> Path:
+    """
+    为同一内容创建第二个路径：优先硬链接（不占额外空间、不复制数据），
+    跨文件系统或不支持硬链接时退回复制
+    """
+    target = Path(target)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = target.with_name(f".{target.name}.{uuid.uuid4().hex[:8]}.tmp")
+    try:
+        os.link(source, temp_path)
+    except OSError:
+        shutil.copyfile(source, temp_path)
+    os.replace(temp_path, target)
+    return target
+
+
+def file_digest(path: Union[str, Path]) -> str:
+    """
+    分块计算文件内容哈希
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def source_digest(source: Union[str, Path, AudioBuffer]) -> str:
+    """
+    输入的内容哈希：文件按字节计算，内存音频按采样数据与采样率计算
+    """
+    if isinstance(source, AudioBuffer):
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(np.ascontiguousarray(source.samples).tobytes())
+        digest.update(str(source.sr).encode("utf-8"))
+        return digest.hexdigest()
+    return file_digest(source)
+
+
+class ArtifactStore:
+    """
+    按任务组织的产物存储
+
+    每个任务（一次处理流程）在 SQLite 索引中记录输入哈希与参数，
+    任务产出的音频、转录文本、分段与比较结果作为内容寻址的文件保存在 blobs/ 下，
+    数值指标单独成表便于查询。文件先写入临时文件再原子替换，
+    索引使用 WAL 模式，多线程、多进程同时写入互不干扰。
+    """
+
+    def __init__(self, root: Union[str, Path] = DEFAULT_STORE_DIR) -> None:
+        self.root = Path(root)
+        self.blob_dir = self.root / "blobs"
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        每个线程使用独立的连接
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self.root / "index.sqlite", timeout=BUSY_TIMEOUT, isolation_level=None
+            )
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # ---- 任务 ----
+
+    def create_job(
+        self,
+        kind: str,
+        source: Union[str, Path, AudioBuffer, None] = None,
+        params: Optional[dict] = None,
+        job_id: Optional[str] = None,
+    ) -> str:
+        """
+        登记一个新任务
+
+        参数:
+            kind (str): 任务类型，例如 "pipeline"、"transcribe"、"batch"
+            source: 输入文件路径或内存音频，用于记录内容哈希
+            params (dict): 处理参数
+            job_id (str): 指定任务编号，默认随机生成
+
+        返回:
+            str: 任务编号
+        """
+        job_id = job_id or uuid.uuid4().hex[:16]
+        source_path = (
+            None
+            if source is None or isinstance(source, AudioBuffer)
+            else str(Path(source).resolve())
+        )
+        source_hash = source_digest(source) if source is not None else None
+
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, kind, status, source_path, source_hash, params, created)"
+                " VALUES (?, ?, 'running', ?, ?, ?, ?)",
+                (
+                    job_id,
+                    kind,
+                    source_path,
+                    source_hash,
+                    json.dumps(params or {}, ensure_ascii=False, sort_keys=True),
+                    time.time(),
+                ),
+            )
+        return job_id
+
+    def finish_job(self, job_id: str, status: str = "done") -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, finished = ? WHERE id = ?",
+                (status, time.time(), job_id),
+            )
+
+    def get_job(self, job_id: str) -> Optional[dict]:
+        """
+        任务信息，附带产物列表与指标
+        """
+        conn = self._connect()
+        row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+
+        job = self._job_dict(row)
+        job["artifacts"] = {
+            r["name"]: {"digest": r["digest"], "size": r["size"]}
+            for r in conn.execute(
+                "SELECT name, digest, size FROM artifacts WHERE job_id = ? ORDER BY created",
+                (job_id,),
+            )
+        }
+        job["metrics"] = self.get_metrics(job_id)
+        return job
+
+    def find_jobs(
+        self,
+        kind: Optional[str] = None,
+        source: Union[str, Path, AudioBuffer, None] = None,
+        source_hash: Optional[str] = None,
+        params: Optional[dict] = None,
+        status: Optional[str] = "done",
+        limit: int = 50,
+    ) -> List[dict]:
+        """
+        查询历史任务（最新的在前），可按类型、输入内容和参数筛选，
+        找到相同输入与参数的已完成任务时可以直接复用其产物
+        """
+        if source is not None:
+            source_hash = source_digest(source)
+
+        clauses, values = [], []
+        for column, value in (
+            ("kind", kind),
+            ("source_hash", source_hash),
+            ("status", status),
+        ):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                values.append(value)
+        if params is not None:
+            clauses.append("params = ?")
+            values.append(json.dumps(params, ensure_ascii=False, sort_keys=True))
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._connect().execute(
+            f"SELECT * FROM jobs {where} ORDER BY created DESC LIMIT ?",
+            (*values, limit),
+        )
+        return [self._job_dict(row) for row in rows]
+
+    @staticmethod
+    def _job_dict(row: sqlite3.Row) -> dict:
+        job = dict(row)
+        job["params"] = json.loads(job["params"])
+        return job
+
+    # ---- 产物 ----
+
+    def blob_path(self, digest: str) -> Path:
+        return self.blob_dir / digest[:2] / digest
+
+    def _commit_blob(self, temp_path: str, digest: str) -> Path:
+        """
+        将临时文件移动到内容寻址的位置（内容相同的文件只保存一份）
+        """
+        target = self.blob_path(digest)
+        if target.exists():
+            os.remove(temp_path)
+        else:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(temp_path, target)
+        return target
+
+    def _record(self, job_id: str, name: str, digest: str, size: int) -> str:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO artifacts (job_id, name, digest, size, created)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (job_id, name, digest, size, time.time()),
+            )
+        return digest
+
+    def put_bytes(self, job_id: str, name: str, data: bytes) -> str:
+        """
+        保存产物内容
+
+        返回:
+            str: 内容哈希
+        """
+        digest = hashlib.blake2b(data, digest_size=20).hexdigest()
+        fd, temp_path = tempfile.mkstemp(suffix=".tmp", dir=self.blob_dir)
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        self._commit_blob(temp_path, digest)
+        return self._record(job_id, name, digest, len(data))
+
+    def put_text(self, job_id: str, name: str, text: str) -> str:
+        return self.put_bytes(job_id, name, text.encode("utf-8"))
+
+    def put_json(self, job_id: str, name: str, value) -> str:
+        data = json.dumps(value, ensure_ascii=False, indent=2, default=str)
+        return self.put_bytes(job_id, name, data.encode("utf-8"))
+
+    def put_file(
+        self, job_id: str, name: str, path: Union[str, Path], link: bool = False
+    ) -> str:
+        """
+        保存已有文件作为产物（边复制边计算哈希）
+
+        参数:
+            link (bool): 以硬链接代替复制。只用于之后不会被原地修改的文件
+                         （例如原子替换写出的输出文件），否则产物内容会随之改变
+        """
+        if link:
+            digest = file_digest(path)
+            target = self.blob_path(digest)
+            if not target.exists():
+                link_or_copy(path, target)
+            return self._record(job_id, name, digest, os.path.getsize(path))
+
+        digest = hashlib.blake2b(digest_size=20)
+        fd, temp_path = tempfile.mkstemp(suffix=".tmp", dir=self.blob_dir)
+        size = 0
+        with open(path, "rb") as src, os.fdopen(fd, "wb") as dst:
+            for chunk in iter(lambda: src.read(HASH_CHUNK), b""):
+                digest.update(chunk)
+                dst.write(chunk)
+                size += len(chunk)
+        self._commit_blob(temp_path, digest.hexdigest())
+        return self._record(job_id, name, digest.hexdigest(), size)
+
+    def put_audio(self, job_id: str, name: str, buffer: AudioBuffer) -> str:
+        """
+        保存内存中的音频（写为 WAV 后入库）
+        """
+        fd, temp_path = tempfile.mkstemp(suffix=".wav", dir=self.blob_dir)
+        os.close(fd)
+        try:
+            buffer.write(temp_path)
+            return self.put_file(job_id, name, temp_path)
+        finally:
+            os.remove(temp_path)
+
+    def artifact_path(self, job_id: str, name: str) -> Path:
+        row = (
+            self._connect()
+            .execute(
+                "SELECT digest FROM artifacts WHERE job_id = ? AND name = ?",
+                (job_id, name),
+            )
+            .fetchone()
+        )
+        if row is None:
+            raise KeyError(f"[x] 任务 {job_id} 中没有产物：{name}")
+        return self.blob_path(row["digest"])
+
+    def get_bytes(self, job_id: str, name: str) -> bytes:
+        return self.artifact_path(job_id, name).read_bytes()
+
+    def get_text(self, job_id: str, name: str) -> str:
+        return self.get_bytes(job_id, name).decode("utf-8")
+
+    def get_json(self, job_id: str, name: str):
+        return json.loads(self.get_bytes(job_id, name))
+
+    def export(self, job_id: str, name: str, target: Union[str, Path]) -> Path:
+        """
+        将产物复制到指定位置
+        """
+        target = Path(target)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(self.artifact_path(job_id, name), target)
+        return target
+
+    # ---- 指标 ----
+
+    def put_metrics(self, job_id: str, values: Dict[str, float]) -> None:
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO metrics (job_id, name, value) VALUES (?, ?, ?)",
+                [(job_id, name, float(value)) for name, value in values.items()],
+            )
+
+    def get_metrics(self, job_id: str) -> Dict[str, float]:
+        rows = self._connect().execute(
+            "SELECT name, value FROM metrics WHERE job_id = ?", (job_id,)
+        )
+        return {row["name"]: row["value"] for row in rows}
+
+
+# 进程内共享的默认存储
+_default_store: Optional[ArtifactStore] = None
+_default_lock = threading.Lock()
+
+
+def default_store() -> ArtifactStore:
+    global _default_store
+    with _default_lock:
+        if _default_store is None:
+            _default_store = ArtifactStore()
+        return _default_store
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="查询任务产物")
+    parser.add_argument("--root", default=str(DEFAULT_STORE_DIR), help="存储目录")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    listing = commands.add_parser("list", help="列出历史任务")
+    listing.add_argument("--kind", help="任务类型")
+    listing.add_argument("--source", help="只列出该输入文件（按内容匹配）的任务")
+    listing.add_argument("--status", default=None, help="任务状态，例如 done")
+    listing.add_argument("-n", "--limit", type=int, default=20)
+
+    show = commands.add_parser("show", help="显示任务详情")
+    show.add_argument("job_id")
+
+    export = commands.add_parser("export", help="导出任务产物")
+    export.add_argument("job_id")
+    export.add_argument("name", help="产物名称，例如 modified.txt")
+    export.add_argument("target", help="导出路径")
+    args = parser.parse_args()
+
+    store = ArtifactStore(args.root)
+    if args.command == "list":
+        for job in store.find_jobs(
+            kind=args.kind, source=args.source, status=args.status, limit=args.limit
+        ):
+            created = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(job["created"]))
+            print(
+                f"{job['id']}  {created}  {job['kind']:<10} {job['status']:<8} "
+                f"{job['source_path'] or '-'}"
+            )
+    elif args.command == "show":
+        job = store.get_job(args.job_id)
+        if job is None:
+            print(f"[x] 未找到任务：{args.job_id}")
+            return
+        print(json.dumps(job, ensure_ascii=False, indent=2))
+    else:
+        target = store.export(args.job_id, args.name, args.target)
+        print(f"[√] 已导出至: {target}")
+
+
+if __name__ == "__main__":
+    main()
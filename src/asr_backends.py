@@ -0,0 +1,195 @@
+import abc
+import numpy as np
+from typing import Dict, List, Optional, Type
+
+from src import model_registry, segment_asr
+from src.audio_buffer import WHISPER_SAMPLE_RATE
+
+
+class ASRBackend(abc.ABC):
+    """
+    语音识别引擎接口
+
+    所有引擎接收 16kHz 单声道 float32 采样（AudioBuffer.for_whisper() 的结果），
+    因此同一段音频只需解码一次即可交给多个引擎识别。
+    可以用 with 语句管理模型的加载与释放。
+    """
+
+    # 引擎名称，用于缓存键和比较报告
+    name: str = "backend"
+
+    @abc.abstractmethod
+    def load(self) -> None:
+        """
+        加载模型（重复调用时不重复加载）
+        """
+
+    @abc.abstractmethod
+    def transcribe(self, audio: np.ndarray) -> str:
+        """
+        识别一段音频，返回文本
+        """
+
+    def transcribe_batch(self, audios: List[np.ndarray]) -> List[str]:
+        """
+        批量识别多段音频（默认逐段识别，支持批处理的引擎可以覆盖）
+        """
+        return [self.transcribe(audio) for audio in audios]
+
+    def close(self) -> None:
+        """
+        释放模型占用的内存
+        """
+
+    def __enter__(self) -> "ASRBackend":
+        self.load()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class WhisperBackend(ASRBackend):
+    """
+    Whisper 引擎，模型来自进程内共享的模型表
+    """
+
+    def __init__(
+        self,
+        model_name: str = model_registry.DEFAULT_MODEL,
+        device: Optional[str] = None,
+        dtype: str = model_registry.DEFAULT_DTYPE,
+        language: str = "zh",
+    ) -> None:
+        self.model_name = model_name
+        self.device = device
+        self.dtype = dtype
+        self.language = language
+        self.name = f"whisper:{model_name}:{dtype}"
+        self._model = None
+
+    @property
+    def model(self):
+        self.load()
+        return self._model
+
+    def load(self) -> None:
+        if self._model is None:
+            self._model = model_registry.get_model(
+                self.model_name, self.device, self.dtype
+            )
+
+    def transcribe(self, audio: np.ndarray) -> str:
+        with model_registry.inference_lock(self.model_name, self.device, self.dtype):
+            return self.model.transcribe(audio, language=self.language)["text"]
+
+    def transcribe_batch(self, audios: List[np.ndarray]) -> List[str]:
+        """
+        不超过 30 秒的片段拼成批次一次解码，超长片段逐段识别
+        """
+        max_len = int(segment_asr.MAX_WINDOW_SECONDS * WHISPER_SAMPLE_RATE)
+        if any(len(audio) > max_len for audio in audios):
+            return super().transcribe_batch(audios)
+
+        offsets = np.cumsum([0] + [len(audio) for audio in audios])
+        windows = [(int(offsets[i]), int(offsets[i + 1])) for i in range(len(audios))]
+        with model_registry.inference_lock(self.model_name, self.device, self.dtype):
+            segments = segment_asr.transcribe_windows(
+                self.model, np.concatenate(audios), windows, self.language
+            )
+
+        # 识别结果为空的窗口不会出现在分段中，按窗口下标对应回原片段
+        texts = [""] * len(audios)
+        for segment in segments:
+            texts[segment["window"]] = segment["text"]
+        return texts
+
+    def close(self) -> None:
+        # 模型表中的模型可能被同进程的其他引擎或 WX_ASR 共享，只释放本实例的引用
+        self._model = None
+
+
+class FunASRBackend(ASRBackend):
+    """
+    FunASR 离线引擎（默认 Paraformer 中文模型）
+    """
+
+    def __init__(
+        self, model_name: str = "paraformer-zh", revision: str = "v1.2.4"
+    ) -> None:
+        self.model_name = model_name
+        self.revision = revision
+        self.name = f"funasr:{model_name}"
+        self._model = None
+
+    def load(self) -> None:
+        if self._model is None:
+            from funasr import AutoModel
+
+            self._model = AutoModel(
+                model=self.model_name, model_revision=self.revision, disable_update=True
+            )
+
+    def transcribe(self, audio: np.ndarray) -> str:
+        return self.transcribe_batch([audio])[0]
+
+    def transcribe_batch(self, audios: List[np.ndarray]) -> List[str]:
+        self.load()
+        results = self._model.generate(input=list(audios), batch_size=len(audios))
+        return [result.get("text", "") for result in results]
+
+    def close(self) -> None:
+        self._model = None
+
+
+class SphinxBackend(ASRBackend):
+    """
+    CMU PocketSphinx 离线引擎（通过 SpeechRecognition 调用，需要对应语言的模型包）
+    """
+
+    def __init__(self, language: str = "zh-CN") -> None:
+        self.language = language
+        self.name = f"sphinx:{language}"
+        self._recognizer = None
+
+    def load(self) -> None:
+        if self._recognizer is None:
+            import speech_recognition as sr
+
+            self._recognizer = sr.Recognizer()
+
+    def transcribe(self, audio: np.ndarray) -> str:
+        import speech_recognition as sr
+
+        self.load()
+        pcm = (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16).tobytes()
+        data = sr.AudioData(pcm, WHISPER_SAMPLE_RATE, 2)
+        try:
+            return self._recognizer.recognize_sphinx(data, language=self.language)
+        except sr.UnknownValueError:
+            return ""
+
+    def close(self) -> None:
+        self._recognizer = None
+
+
+# 可用的引擎类型
+BACKENDS: Dict[str, Type[ASRBackend]] = {
+    "whisper": WhisperBackend,
+    "funasr": FunASRBackend,
+    "sphinx": SphinxBackend,
+}
+
+
+def create_backend(spec: str) -> ASRBackend:
+    """
+    根据描述字符串创建引擎，格式为 "类型[:参数...]"，例如：
+        "whisper:small"、"whisper:base:int8"、"funasr:paraformer-zh"、"sphinx:zh-CN"
+    """
+    kind, *args = spec.split(":")
+    if kind not in BACKENDS:
+        raise ValueError(f"[x] 不支持的识别引擎：{kind}")
+
+    if kind == "whisper" and len(args) > 1:
+        return WhisperBackend(model_name=args[0], dtype=args[1])
+    return BACKENDS[kind](*args)
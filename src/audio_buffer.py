@@ -0,0 +1,213 @@
+import os
+import json
+import tempfile
+import numpy as np
+from pathlib import Path
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from src import lazy_import
+
+librosa = lazy_import.lazy("librosa")
+sf = lazy_import.lazy("soundfile")
+
+# Whisper 模型要求的采样率
+WHISPER_SAMPLE_RATE: int = 16000
+
+# 输出编码：名称 -> (文件格式, 采样格式)
+ENCODINGS: Dict[str, Tuple[str, str]] = {
+    "pcm16": ("WAV", "PCM_16"),
+    "float32": ("WAV", "FLOAT"),
+    "flac": ("FLAC", "PCM_16"),
+}
+DEFAULT_ENCODING: str = "pcm16"
+
+# 分块编码写出时每块的采样数，避免一次性转换整段音频
+WRITE_BLOCK: int = 65536
+
+# 中间文件（.npy）旁的元数据文件后缀，记录采样率、来源与处理记录
+INTERMEDIATE_META_SUFFIX: str = ".json"
+
+
+def output_format(
+    output_path: str, encoding: Optional[str] = None
+) -> Tuple[Optional[str], Optional[str]]:
+    """
+    根据输出编码与文件后缀确定 soundfile 的文件格式与采样格式
+
+    参数:
+        output_path (str): 输出路径
+        encoding (str): "pcm16"、"float32" 或 "flac"；
+                        未指定时 .flac 后缀使用 FLAC，.wav 使用 PCM16，其他后缀由 soundfile 决定
+
+    返回:
+        tuple: (format, subtype)，均为 None 时表示使用 soundfile 的默认值
+    """
+    suffix = Path(output_path).suffix.lower()
+    if encoding is None and suffix not in (".wav", ".flac"):
+        return None, None
+
+    encoding = encoding or ("flac" if suffix == ".flac" else DEFAULT_ENCODING)
+    if encoding not in ENCODINGS:
+        raise ValueError(f"[x] 不支持的输出编码：{encoding}")
+    file_format, subtype = ENCODINGS[encoding]
+    if (file_format == "FLAC") != (suffix == ".flac"):
+        raise ValueError(f"[x] 输出编码 {encoding} 与文件后缀 {suffix} 不一致")
+    return file_format, subtype
+
+
+@dataclass
+class AudioBuffer:
+    """
+    只解码一次的内存音频
+
+    samples 为单声道 float32 采样，sr 为原始采样率，
+    source 与 history 记录来源文件和经过的处理步骤。
+    送入 Whisper 的 16kHz 版本在首次使用时重采样并缓存。
+    """
+
+    samples: np.ndarray
+    sr: int
+    source: Optional[str] = None
+    history: List[str] = field(default_factory=list)
+    _whisper_samples: Optional[np.ndarray] = field(default=None, repr=False)
+
+    @classmethod
+    def load(cls, file_path: str) -> "AudioBuffer":
+        """
+        解码音频或视频文件的音轨（保留原始采样率），.npy 中间文件直接内存映射
+        """
+        if Path(file_path).suffix.lower() == ".npy":
+            return cls.open_intermediate(file_path)
+
+        samples, sr = librosa.load(str(file_path), sr=None)
+        return cls(samples=samples, sr=sr, source=str(file_path), history=["decode"])
+
+    @classmethod
+    def open_intermediate(cls, file_path: str) -> "AudioBuffer":
+        """
+        以写时复制方式内存映射 save_intermediate 保存的 .npy 文件（不解码、不整体读入）
+        """
+        samples = np.load(str(file_path), mmap_mode="c")
+        with open(
+            str(file_path) + INTERMEDIATE_META_SUFFIX, "r", encoding="utf-8"
+        ) as f:
+            meta = json.load(f)
+
+        buffer = cls(
+            samples=samples,
+            sr=meta["sr"],
+            source=meta.get("source"),
+            history=meta.get("history", []) + ["mmap"],
+        )
+        if buffer.sr == WHISPER_SAMPLE_RATE:
+            buffer._whisper_samples = samples
+        return buffer
+
+    def derive(
+        self, samples: np.ndarray, step: str, sr: Optional[int] = None
+    ) -> "AudioBuffer":
+        """
+        由当前音频生成处理后的新音频，沿用来源（和采样率，除非另行指定）并追加处理记录
+        """
+        return AudioBuffer(
+            samples=samples,
+            sr=sr or self.sr,
+            source=self.source,
+            history=self.history + [step],
+        )
+
+    @property
+    def duration(self) -> float:
+        """
+        音频时长（秒）
+        """
+        return len(self.samples) / self.sr
+
+    def for_whisper(self) -> np.ndarray:
+        """
+        返回 16kHz float32 采样，可直接传给 model.transcribe
+        """
+        if self._whisper_samples is None:
+            if self.sr == WHISPER_SAMPLE_RATE:
+                resampled = self.samples
+            else:
+                resampled = librosa.resample(
+                    self.samples, orig_sr=self.sr, target_sr=WHISPER_SAMPLE_RATE
+                )
+            self._whisper_samples = np.ascontiguousarray(resampled, dtype=np.float32)
+
+        return self._whisper_samples
+
+    def write(self, output_path: str, encoding: Optional[str] = None) -> None:
+        """
+        保存为音频文件：分块编码写入同目录的临时文件，完成后原子替换
+
+        参数:
+            output_path (str): 输出路径，.npy 保存为中间文件（见 save_intermediate）
+            encoding (str): "pcm16"、"float32" 或 "flac"（见 output_format）
+        """
+        path = Path(output_path)
+        if path.suffix.lower() == ".npy":
+            self.save_intermediate(str(path))
+            return
+
+        file_format, subtype = output_format(str(path), encoding)
+        channels = 1 if self.samples.ndim == 1 else self.samples.shape[1]
+        fd, temp_path = tempfile.mkstemp(
+            prefix=f".{path.stem}-", suffix=path.suffix, dir=path.parent
+        )
+        os.close(fd)
+        try:
+            with sf.SoundFile(
+                temp_path,
+                "w",
+                samplerate=self.sr,
+                channels=channels,
+                subtype=subtype,
+                format=file_format,
+            ) as f:
+                for start in range(0, len(self.samples), WRITE_BLOCK):
+                    f.write(self.samples[start : start + WRITE_BLOCK])
+            os.replace(temp_path, path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def save_intermediate(self, output_path: str, for_whisper: bool = False) -> str:
+        """
+        保存为流水线内部使用的中间文件：float32 .npy（可内存映射）加元数据文件
+
+        参数:
+            output_path (str): .npy 文件路径
+            for_whisper (bool): 保存 16kHz 版本，下游转录无需再重采样
+
+        返回:
+            str: .npy 文件路径
+        """
+        if for_whisper:
+            samples, sr = self.for_whisper(), WHISPER_SAMPLE_RATE
+        else:
+            samples, sr = np.ascontiguousarray(self.samples, dtype=np.float32), self.sr
+
+        path = Path(output_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        meta = {"sr": sr, "source": self.source, "history": self.history}
+
+        # 先写元数据，再原子替换数据文件，读取方看到 .npy 时元数据一定存在
+        with open(str(path) + INTERMEDIATE_META_SUFFIX, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+        fd, temp_path = tempfile.mkstemp(suffix=".tmp", dir=path.parent)
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, samples)
+        os.replace(temp_path, path)
+        return str(path)
+
+    @staticmethod
+    def remove_intermediate(file_path: str) -> None:
+        """
+        删除中间文件及其元数据
+        """
+        for path in (str(file_path), str(file_path) + INTERMEDIATE_META_SUFFIX):
+            if os.path.exists(path):
+                os.remove(path)
@@ -0,0 +1,200 @@
+import sys
+import csv
+import json
+import time
+import argparse
+import numpy as np
+from pathlib import Path
+from multiprocessing import shared_memory
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# 直接运行本文件时也能以 src 包的形式导入同级模块
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src import metrics
+from src import similarity as similarity_engine
+from src.asr_backends import create_backend
+from src.audio_buffer import WHISPER_SAMPLE_RATE, AudioBuffer
+
+ROOT_DIR = Path(__file__).parent.parent
+
+# 默认参与对比的识别引擎
+DEFAULT_BACKENDS: Sequence[str] = ("whisper:base", "funasr:paraformer-zh")
+
+
+def _run_backend(spec: str, shm_name: str, length: int) -> dict:
+    """
+    工作进程：直接读取共享内存中的 16kHz 采样（不复制、不重新解码），用一个引擎识别
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    audio = backend = None
+    try:
+        audio = np.ndarray((length,), dtype=np.float32, buffer=shm.buf)
+        backend = create_backend(spec)
+
+        start = time.perf_counter()
+        backend.load()
+        load_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        text = backend.transcribe(audio)
+        seconds = time.perf_counter() - start
+
+        return {
+            "backend": spec,
+            "text": text,
+            "load_seconds": round(load_seconds, 3),
+            "asr_seconds": round(seconds, 3),
+        }
+    except Exception as e:
+        return {"backend": spec, "text": "", "error": str(e)}
+    finally:
+        if backend is not None:
+            backend.close()
+        # 共享内存的视图（包括异常回溯中引用的）必须先释放，否则 close 会抛出 BufferError
+        audio = backend = None
+        shm.close()
+
+
+def score_matrix(texts: Dict[str, str]) -> Tuple[List[List[float]], List[List[float]]]:
+    """
+    两两比较各引擎的识别结果
+
+    返回:
+        tuple: (字错误率矩阵, 句子相似度矩阵)，第 i 行以第 i 个引擎的结果为参考
+    """
+    names = list(texts)
+    cer_matrix = [
+        [round(metrics.cer(texts[ref], texts[hyp])["错误率"], 4) for hyp in names]
+        for ref in names
+    ]
+    similarity_matrix = [
+        [
+            round(similarity_engine.sentence_similarity(texts[ref], texts[hyp]), 4)
+            for hyp in names
+        ]
+        for ref in names
+    ]
+    return cer_matrix, similarity_matrix
+
+
+def run_matrix(
+    input_path: str,
+    backends: Sequence[str] = DEFAULT_BACKENDS,
+    reference_file: Optional[str] = None,
+    workers: Optional[int] = None,
+    output_file: Optional[str] = None,
+) -> dict:
+    """
+    同一段音频只解码一次，由多个识别引擎在独立进程中并行识别，并生成对比矩阵
+
+    参数:
+        input_path (str): 音频或视频文件
+        backends (list): 引擎描述（见 asr_backends.create_backend）
+        reference_file (str): 人工校对的参考文本，提供时额外计算各引擎的字错误率
+        workers (int): 并行进程数，默认每个引擎一个进程
+        output_file (str): 报告路径，默认 media/output/backend_matrix.json（同名 CSV 为矩阵）
+
+    返回:
+        dict: 各引擎的识别结果、耗时与对比矩阵
+    """
+    output = (
+        Path(output_file)
+        if output_file
+        else ROOT_DIR / "media" / "output" / "backend_matrix.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+
+    print(f"[...] 解码音频：{input_path}")
+    audio = np.ascontiguousarray(AudioBuffer.load(input_path).for_whisper(), np.float32)
+
+    # 采样只放一份在共享内存中，所有引擎进程直接映射读取
+    shm = shared_memory.SharedMemory(create=True, size=max(audio.nbytes, 1))
+    try:
+        np.ndarray(audio.shape, dtype=np.float32, buffer=shm.buf)[:] = audio
+        with ProcessPoolExecutor(max_workers=workers or len(backends)) as pool:
+            futures = [
+                pool.submit(_run_backend, spec, shm.name, len(audio))
+                for spec in backends
+            ]
+            runs = []
+            for spec, future in zip(backends, futures):
+                try:
+                    runs.append(future.result())
+                except Exception as e:
+                    # 工作进程异常退出等情况，只记录该引擎失败，不影响其他引擎
+                    runs.append({"backend": spec, "text": "", "error": str(e)})
+    finally:
+        shm.close()
+        shm.unlink()
+
+    for run in runs:
+        if "error" in run:
+            print(f"[x] {run['backend']} 识别失败：{run['error']}")
+        else:
+            print(f"[√] {run['backend']}：{run['asr_seconds']:.2f}s")
+
+    texts = {run["backend"]: run["text"] for run in runs if "error" not in run}
+    cer_matrix, similarity_matrix = score_matrix(texts)
+
+    if reference_file:
+        with open(reference_file, "r", encoding="utf-8") as f:
+            reference = f.read()
+        for run in runs:
+            if "error" not in run:
+                run["cer_vs_reference"] = round(
+                    metrics.cer(reference, run["text"])["错误率"], 4
+                )
+
+    report = {
+        "input": input_path,
+        "audio_seconds": round(len(audio) / WHISPER_SAMPLE_RATE, 2),
+        "backends": list(texts),
+        "runs": runs,
+        "cer_matrix": cer_matrix,
+        "similarity_matrix": similarity_matrix,
+    }
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    # CSV 便于在表格软件中查看：行为参考引擎，列为对比引擎
+    with open(output.with_suffix(".csv"), "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["字错误率（行=参考）", *texts])
+        for name, row in zip(texts, cer_matrix):
+            writer.writerow([name, *row])
+
+    print("\n=== 引擎对比（字错误率，行=参考） ===")
+    for name, row in zip(texts, cer_matrix):
+        print(f"{name:>24}: " + "  ".join(f"{value:6.2%}" for value in row))
+    print(f"[√] 报告已保存至: {output}")
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="多个识别引擎并行识别同一音频并对比")
+    parser.add_argument("input", help="音频或视频文件")
+    parser.add_argument(
+        "-b",
+        "--backends",
+        nargs="+",
+        default=list(DEFAULT_BACKENDS),
+        help="识别引擎，例如 whisper:small whisper:base:int8 funasr:paraformer-zh sphinx:zh-CN",
+    )
+    parser.add_argument("-r", "--reference", help="参考文本文件")
+    parser.add_argument("-w", "--workers", type=int, help="并行进程数")
+    parser.add_argument("-o", "--output", help="报告路径（JSON）")
+    args = parser.parse_args()
+
+    run_matrix(
+        str(Path(args.input).resolve()),
+        backends=args.backends,
+        reference_file=args.reference,
+        workers=args.workers,
+        output_file=args.output,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,437 @@
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+from pathlib import Path
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Dict, List, Optional, Set
+
+import numpy as np
+
+# 直接运行本文件时也能以 src 包的形式导入同级模块
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src import metrics, model_registry, stft_engine
+from src.audio_buffer import ENCODINGS, AudioBuffer
+from src.logic_component import WX_ASR
+
+ROOT_DIR = Path(__file__).parent.parent
+
+# 支持批量处理的媒体格式（与 GUI 文件选择框一致）
+MEDIA_EXTENSIONS = (
+    ".wav",
+    ".mp3",
+    ".m4a",
+    ".aac",
+    ".ogg",
+    ".flac",
+    ".wma",
+    ".aiff",
+    ".mp4",
+    ".avi",
+    ".mkv",
+    ".mov",
+)
+
+# 断点续跑使用的进度文件名
+PROGRESS_FILE = "progress.jsonl"
+
+# 每个转录进程对应的同时在处理的文件数（修改中或等待转录），
+# 限制 16kHz 中间文件的数量，修改比转录快时不会在磁盘上无限堆积
+IN_FLIGHT_PER_ASR_WORKER: int = 2
+
+# 转录工作进程内的 WX_ASR 实例，每个进程只加载一次模型
+_worker_asr: Optional[WX_ASR] = None
+
+
+def collect_inputs(source: str) -> List[Path]:
+    """
+    收集待处理文件：目录则递归查找支持的媒体文件，否则按清单文件逐行读取
+    """
+    path = Path(source)
+    if path.is_dir():
+        return sorted(
+            p.resolve()
+            for p in path.rglob("*")
+            if p.is_file() and p.suffix.lower() in MEDIA_EXTENSIONS
+        )
+
+    if not path.exists():
+        raise FileNotFoundError(f"[x] 未找到输入目录或清单：{source}")
+
+    with open(path, "r", encoding="utf-8") as f:
+        lines = [line.strip() for line in f]
+
+    # 清单中的相对路径以清单所在目录为基准，# 开头为注释
+    return [
+        (path.parent / line).resolve()
+        for line in lines
+        if line and not line.startswith("#")
+    ]
+
+
+def load_finished(output_dir: Path) -> Set[str]:
+    """
+    读取进度文件，返回已完成的输入文件路径集合
+    """
+    progress_file = output_dir / PROGRESS_FILE
+    if not progress_file.exists():
+        return set()
+
+    finished = set()
+    with open(progress_file, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # 崩溃时可能留下半行记录，直接忽略
+                continue
+            if record.get("status") == "done":
+                finished.add(record["input"])
+
+    return finished
+
+
+def append_record(output_dir: Path, record: dict) -> None:
+    """
+    追加一条进度记录并立即落盘，保证崩溃后可以续跑
+    """
+    with open(output_dir / PROGRESS_FILE, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def modify_job(
+    input_path: str,
+    output_path: str,
+    encoding: Optional[str] = None,
+    intermediate_dir: Optional[str] = None,
+    tier: str = stft_engine.DEFAULT_TIER,
+) -> dict:
+    """
+    音频修改任务（CPU 密集，在进程池中执行）
+
+    指定 intermediate_dir 时，把原始与修改后音频的 16kHz 采样保存为 .npy 中间文件，
+    转录进程直接内存映射读取，不再重新解码输入和输出文件。
+    """
+    start = time.perf_counter()
+    buffer = AudioBuffer.load(input_path)
+    samples, sr = WX_ASR.modify_audio(buffer, output_path, encoding=encoding, tier=tier)
+
+    result = {
+        "input": input_path,
+        "output": output_path,
+        "duration": buffer.duration,
+        "modify_seconds": time.perf_counter() - start,
+    }
+
+    if intermediate_dir:
+        stem = Path(output_path).stem
+        result["intermediates"] = [
+            source.save_intermediate(
+                str(Path(intermediate_dir) / f"{stem}.{name}.npy"), for_whisper=True
+            )
+            for name, source in (
+                ("original", buffer),
+                ("modified", buffer.derive(samples, "modify", sr)),
+            )
+        ]
+    return result
+
+
+def _init_modify_worker() -> None:
+    """
+    修改进程初始化：各进程使用独立的随机种子
+
+    进程池中的进程复制自父进程（fork）或重新导入模块，随机状态都相同，
+    不重新播种时不同进程处理的文件会得到完全相同的拉伸、音高与噪声序列。
+    """
+    stft_engine.seed(int(np.random.SeedSequence().generate_state(1)[0]))
+
+
+def _init_asr_worker(
+    model_name: str = model_registry.DEFAULT_MODEL,
+    dtype: str = model_registry.DEFAULT_DTYPE,
+    threads: Optional[int] = None,
+) -> None:
+    """
+    转录进程初始化：每个进程只加载一次 Whisper 模型
+    """
+    global _worker_asr
+    _worker_asr = WX_ASR(model_name=model_name, dtype=dtype, threads=threads)
+
+    # 提前加载模型，避免第一个任务承担加载耗时
+    _worker_asr.model
+
+
+def transcribe_job(
+    input_path: str, output_path: str, intermediates: Optional[List[str]] = None
+) -> dict:
+    """
+    转录任务：分别转录原始音频和修改后的音频，结果保存在独立的任务产物中
+
+    有中间文件时直接内存映射 16kHz 采样，转录完成后删除中间文件。
+    转录失败时直接抛出异常，由 run_batch 记录为 failed，下次运行时重试。
+    """
+    start = time.perf_counter()
+    store = _worker_asr.store
+    job_id = store.create_job("batch", input_path, {"output": output_path})
+
+    sources = [input_path, output_path]
+    if intermediates:
+        sources = [AudioBuffer.open_intermediate(path) for path in intermediates]
+    try:
+        texts = []
+        for name, source in zip(("original", "modified"), sources):
+            result = _worker_asr.transcribe(source)
+            store.put_text(job_id, f"{name}.txt", result["text"])
+            store.put_json(job_id, f"{name}.segments.json", result["segments"])
+            texts.append(result["text"])
+    except Exception:
+        store.finish_job(job_id, "failed")
+        raise
+    finally:
+        for path in intermediates or []:
+            AudioBuffer.remove_intermediate(path)
+    original, modified = texts
+    error_rates = {
+        "cer": round(metrics.cer(original, modified)["错误率"], 4),
+        "wer": round(metrics.wer(original, modified)["错误率"], 4),
+    }
+    store.put_metrics(job_id, error_rates)
+    store.finish_job(job_id)
+
+    return {
+        "job_id": job_id,
+        "original_text": original,
+        "modified_text": modified,
+        **error_rates,
+        "asr_seconds": time.perf_counter() - start,
+    }
+
+
+def run_batch(
+    source: str,
+    output_dir: Optional[str] = None,
+    workers: Optional[int] = None,
+    asr_workers: int = 1,
+    transcribe: bool = True,
+    model_name: str = model_registry.DEFAULT_MODEL,
+    dtype: str = model_registry.DEFAULT_DTYPE,
+    threads: Optional[int] = None,
+    encoding: Optional[str] = None,
+    tier: str = stft_engine.DEFAULT_TIER,
+) -> dict:
+    """
+    批量处理目录或清单中的所有媒体文件
+
+    音频修改分发到与 CPU 核数相同的进程池中；转录在独立的进程池中进行，
+    每个转录进程只加载一次模型。同时在处理的文件不超过
+    IN_FLIGHT_PER_ASR_WORKER × asr_workers 个（不转录时为修改进程数的两倍），
+    每转录完成一个文件（并删除其中间文件）才提交下一个。
+    每完成一个文件就写入进度记录，重新运行时会跳过已完成的文件。
+
+    参数:
+        source (str): 输入目录或清单文件（每行一个路径）
+        output_dir (str): 输出目录，默认 media/output/batch
+        workers (int): 音频修改进程数，默认为 CPU 核数减去转录进程数
+        asr_workers (int): 转录进程数（每个进程占用一份模型内存）
+        transcribe (bool): 是否进行语音识别
+        model_name (str): 转录使用的 Whisper 模型
+        dtype (str): 模型精度，CPU 服务器上可用 "int8" 动态量化
+        threads (int): 每个转录进程的 CPU 线程数
+        encoding (str): 输出编码 "pcm16"（默认）、"float32" 或 "flac"
+        tier (str): 处理档位 "preview"、"standard"（默认）或 "final"
+
+    返回:
+        dict: 吞吐统计
+    """
+    out_dir = (
+        Path(output_dir) if output_dir else ROOT_DIR / "media" / "output" / "batch"
+    )
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    # 修改与转录之间传递的 16kHz 中间文件
+    intermediate_dir = out_dir / ".intermediate"
+
+    inputs = collect_inputs(source)
+    finished = load_finished(out_dir)
+    pending = [p for p in inputs if str(p) not in finished]
+
+    print(
+        f"[...] 共 {len(inputs)} 个文件，"
+        f"已完成 {len(inputs) - len(pending)} 个，待处理 {len(pending)} 个"
+    )
+
+    # 修改与转录进程同时运行，默认不超过 CPU 核数
+    cpu_count = os.cpu_count() or 1
+    workers = workers or max(1, cpu_count - (asr_workers if transcribe else 0))
+    start = time.perf_counter()
+    done_files = 0
+    audio_seconds = 0.0
+
+    modify_pool = ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_modify_worker
+    )
+    asr_pool = (
+        ProcessPoolExecutor(
+            max_workers=asr_workers,
+            initializer=_init_asr_worker,
+            initargs=(model_name, dtype, threads),
+        )
+        if transcribe
+        else None
+    )
+
+    # 修改完成到转录结束之间，每个文件保留一对中间文件
+    max_in_flight = (
+        IN_FLIGHT_PER_ASR_WORKER * asr_workers if transcribe else 2 * workers
+    )
+    queue = iter(pending)
+
+    try:
+        running: Dict[Future, dict] = {}
+
+        def submit_next() -> None:
+            while len(running) < max_in_flight:
+                path = next(queue, None)
+                if path is None:
+                    return
+
+                # 文件名附加路径哈希，避免不同子目录下的同名文件互相覆盖
+                digest = hashlib.md5(str(path).encode("utf-8")).hexdigest()[:8]
+                suffix = ".flac" if encoding == "flac" else ".wav"
+                output_path = out_dir / f"{path.stem}_{digest}_modified{suffix}"
+                future = modify_pool.submit(
+                    modify_job,
+                    str(path),
+                    str(output_path),
+                    encoding,
+                    str(intermediate_dir) if transcribe else None,
+                    tier,
+                )
+                running[future] = {"stage": "modify", "input": str(path)}
+
+        submit_next()
+        while running:
+            completed, _ = wait(running, return_when=FIRST_COMPLETED)
+
+            for future in completed:
+                job = running.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    print(f"[x] 处理失败: {job['input']}: {e}")
+                    append_record(
+                        out_dir,
+                        {"input": job["input"], "status": "failed", "error": str(e)},
+                    )
+                    submit_next()
+                    continue
+
+                if job["stage"] == "modify" and asr_pool is not None:
+                    # 修改完成后交给转录进程池
+                    asr_future = asr_pool.submit(
+                        transcribe_job,
+                        result["input"],
+                        result["output"],
+                        result.pop("intermediates", None),
+                    )
+                    running[asr_future] = {
+                        "stage": "transcribe",
+                        "input": job["input"],
+                        "record": result,
+                    }
+                    continue
+
+                record = {**job.get("record", {}), **result, "status": "done"}
+                append_record(out_dir, record)
+
+                done_files += 1
+                audio_seconds += record["duration"]
+                print(f"[√] {done_files}/{len(pending)} 已完成: {record['input']}")
+                submit_next()
+    finally:
+        modify_pool.shutdown(cancel_futures=True)
+        if asr_pool is not None:
+            asr_pool.shutdown(cancel_futures=True)
+
+    elapsed = time.perf_counter() - start
+    stats = {
+        "文件数": done_files,
+        "耗时(秒)": round(elapsed, 2),
+        "文件/分钟": round(done_files / elapsed * 60, 2) if elapsed > 0 else 0,
+        "音频秒/秒": round(audio_seconds / elapsed, 2) if elapsed > 0 else 0,
+    }
+
+    print("\n=== 批量处理统计 ===")
+    for key, value in stats.items():
+        print(f"├─ {key}: {value}")
+    print("===================\n")
+
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="批量音频修改与语音识别")
+    parser.add_argument("source", help="输入目录或清单文件（每行一个路径）")
+    parser.add_argument("-o", "--output", help="输出目录，默认 media/output/batch")
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        help="音频修改进程数，默认为 CPU 核数减去转录进程数",
+    )
+    parser.add_argument("--asr-workers", type=int, default=1, help="转录进程数")
+    parser.add_argument(
+        "--no-asr", action="store_true", help="只修改音频，不做语音识别"
+    )
+    parser.add_argument(
+        "--model", default=model_registry.DEFAULT_MODEL, help="Whisper 模型名称"
+    )
+    parser.add_argument(
+        "--dtype",
+        choices=model_registry.DTYPES,
+        default=model_registry.DEFAULT_DTYPE,
+        help="模型精度（int8 为 CPU 动态量化）",
+    )
+    parser.add_argument("--threads", type=int, help="每个转录进程的 CPU 线程数")
+    parser.add_argument(
+        "--encoding",
+        choices=list(ENCODINGS),
+        help="输出编码（默认 pcm16 WAV，flac 输出 .flac 文件）",
+    )
+    parser.add_argument(
+        "--tier",
+        choices=list(stft_engine.TIERS),
+        default=stft_engine.DEFAULT_TIER,
+        help="处理档位（preview 快速预览 / standard / final 最终导出）",
+    )
+    args = parser.parse_args()
+
+    # 精度与设备不匹配时（例如在 CPU 上使用 fp16）启动前直接报错
+    if not args.no_asr:
+        try:
+            model_registry.check_dtype(args.dtype)
+        except ValueError as e:
+            parser.error(str(e))
+
+    run_batch(
+        args.source,
+        output_dir=args.output,
+        workers=args.workers,
+        asr_workers=args.asr_workers,
+        transcribe=not args.no_asr,
+        model_name=args.model,
+        dtype=args.dtype,
+        threads=args.threads,
+        encoding=args.encoding,
+        tier=args.tier,
+    )
+
+
+if __name__ == "__main__":
+    main()
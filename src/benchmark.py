@@ -0,0 +1,683 @@
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import tempfile
+import threading
+import subprocess
+import numpy as np
+import soundfile as sf
+from pathlib import Path
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# 直接运行本文件时也能以 src 包的形式导入同级模块
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src import lazy_import, stft_engine, tokenizer
+from src.audio_buffer import AudioBuffer
+from src.logic_component import WX_ASR
+
+librosa = lazy_import.lazy("librosa")
+
+ROOT_DIR = Path(__file__).parent.parent
+
+# 默认测试时长（秒）：10 秒、1 分钟、10 分钟、1 小时
+DEFAULT_LENGTHS: Sequence[float] = (10, 60, 600, 3600)
+
+# 合成音频的采样率与生成时的块长度
+SAMPLE_RATE: int = 44100
+SYNTH_BLOCK_SECONDS: float = 10.0
+
+# 合成音频缓存目录（同一时长与种子只生成一次）
+SYNTH_CACHE_DIR = ROOT_DIR / "media" / "cache" / "benchmark"
+
+# 基准测试默认使用的小模型
+DEFAULT_MODEL: str = "tiny"
+
+# 中文语速（字/秒），用于生成与音频时长相称的转录文本
+CHARS_PER_SECOND: float = 4.0
+
+# 与基准报告比较时，超过该比例的变慢视为回归
+REGRESSION_THRESHOLD: float = 0.2
+
+# 耗时低于该值（秒）的阶段不参与回归判断，避免计时抖动造成误报
+MIN_COMPARE_SECONDS: float = 0.05
+
+# 内存采样间隔（秒）
+MEMORY_SAMPLE_INTERVAL: float = 0.01
+
+# 处理档位质量对比：各档位使用相同的种子和分段参数，在 16kHz 上按帧比较。
+# 幅度谱只保留 QUALITY_MAX_HZ 以下的频率（语音谐波所在范围），帧移 20ms，
+# 按块计算避免长音频的频谱占用过多内存
+QUALITY_SAMPLE_RATE: int = 16000
+QUALITY_N_FFT: int = 1024
+QUALITY_HOP_LENGTH: int = 320
+QUALITY_MAX_HZ: float = 4000.0
+QUALITY_BLOCK_SECONDS: float = 60.0
+
+# 帧对齐：每 ALIGN_WINDOW_FRAMES 帧（1 秒）估计一次能量包络的时间偏移，
+# 相邻窗口的偏移变化不超过 ALIGN_MAX_STEP_FRAMES 帧（逐窗口跟踪，避免锁定到相邻音节）
+ALIGN_WINDOW_FRAMES: int = 50
+ALIGN_MAX_STEP_FRAMES: int = 3
+
+# 音高估计：YIN 的搜索范围，能量低于峰值 PITCH_VOICED_DB 的帧视为静音
+PITCH_FMIN: float = 60.0
+PITCH_FMAX: float = 500.0
+PITCH_VOICED_DB: float = 30.0
+
+_VOCAB = (
+    "我们 今天 讨论 编程 设计 的 基本 原则 这个 函数 性能 需要 优化 "
+    "字幕 重复率 是 一个 重要 指标 请 大家 注意 听讲 数据 结构 算法 "
+    "接口 测试 代码 模块 系统 用户 问题 方法 结果 时间 处理 音频"
+).split()
+
+
+def _rss_bytes() -> Optional[int]:
+    """
+    当前进程的常驻内存（仅 Linux 可用，其他平台返回 None）
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class PeakMemory:
+    """
+    在后台线程中定期采样常驻内存，记录代码块执行期间的峰值
+    """
+
+    def __init__(self, interval: float = MEMORY_SAMPLE_INTERVAL) -> None:
+        self.interval = interval
+        self.baseline: Optional[int] = None
+        self.peak: Optional[int] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, _rss_bytes() or 0)
+
+    def __enter__(self) -> "PeakMemory":
+        self.baseline = _rss_bytes()
+        if self.baseline is not None:
+            self.peak = self.baseline
+            self._thread = threading.Thread(target=self._sample, daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self.peak = max(self.peak, _rss_bytes() or 0)
+
+    def report(self) -> dict:
+        if self.baseline is None:
+            return {"peak_rss_mb": None, "delta_rss_mb": None}
+        return {
+            "peak_rss_mb": round(self.peak / 2**20, 1),
+            "delta_rss_mb": round((self.peak - self.baseline) / 2**20, 1),
+        }
+
+
+def synthesize_audio(seconds: float, sr: int = SAMPLE_RATE, seed: int = 0) -> Path:
+    """
+    生成确定性的类语音测试音频（带谐波的音节与停顿），按块写入 WAV 并缓存
+
+    返回:
+        Path: 合成音频文件路径
+    """
+    path = SYNTH_CACHE_DIR / f"synthetic_{seconds:g}s_{sr}_{seed}.wav"
+    if path.exists():
+        return path
+
+    SYNTH_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    syllable = int(0.2 * sr)
+    n_total = int(seconds * sr)
+    block = int(SYNTH_BLOCK_SECONDS * sr) // syllable * syllable
+    envelope = np.hanning(syllable).astype(np.float32)
+    t = np.arange(syllable, dtype=np.float32) / sr
+
+    fd, temp_path = tempfile.mkstemp(suffix=".wav", dir=SYNTH_CACHE_DIR)
+    os.close(fd)
+    with sf.SoundFile(temp_path, "w", samplerate=sr, channels=1, subtype="PCM_16") as f:
+        written = 0
+        while written < n_total:
+            n_syllables = block // syllable
+            f0 = rng.uniform(100, 220, n_syllables).astype(np.float32)[:, None]
+            voiced = rng.random(n_syllables) > 0.15
+
+            # 每个音节 5 个衰减的谐波，约 15% 的音节为停顿
+            phase = 2 * np.pi * f0 * t[None, :]
+            tone = sum(np.sin(k * phase) / k for k in range(1, 6))
+            tone *= envelope * voiced[:, None] * 0.3
+            tone += rng.normal(0, 0.003, tone.shape)
+
+            samples = tone.reshape(-1)[: n_total - written].astype(np.float32)
+            f.write(samples)
+            written += len(samples)
+
+    os.replace(temp_path, path)
+    return path
+
+
+def synthesize_text(seconds: float, seed: int = 0) -> tuple:
+    """
+    生成与音频时长相称的确定性转录文本，以及约 10% 字符被改动的对比文本
+    """
+    rng = np.random.default_rng(seed)
+    n_chars = int(seconds * CHARS_PER_SECOND)
+
+    sentences: List[str] = []
+    length = 0
+    while length < n_chars:
+        sentence = "".join(rng.choice(_VOCAB, rng.integers(4, 12))) + "。"
+        sentences.append(sentence)
+        length += len(sentence)
+    original = "".join(sentences)
+
+    chars = list(original)
+    for index in sorted(rng.choice(len(chars), len(chars) // 10, replace=False))[::-1]:
+        action = rng.integers(3)
+        if action == 0:
+            chars[index] = rng.choice(list("的了在是不我有他这中"))
+        elif action == 1:
+            del chars[index]
+        else:
+            chars.insert(index, rng.choice(list("的了在是不我有他这中")))
+
+    return original, "".join(chars)
+
+
+def _timed(func: Callable, *args, **kwargs) -> tuple:
+    """
+    执行一个阶段并记录耗时与峰值内存，失败时记录错误而不中断整个基准测试
+    """
+    with PeakMemory() as memory:
+        start = time.perf_counter()
+        try:
+            value, error = func(*args, **kwargs), None
+        except Exception as e:
+            value, error = None, str(e)
+        seconds = time.perf_counter() - start
+
+    stage = {"seconds": round(seconds, 4), **memory.report()}
+    if error is not None:
+        stage["error"] = error
+    return value, stage
+
+
+def _quality_audio(audio: np.ndarray, sr: int) -> np.ndarray:
+    """
+    重采样到 16kHz，不同采样率的档位输出在同一时间轴上比较
+    """
+    if sr != QUALITY_SAMPLE_RATE:
+        audio = librosa.resample(audio, orig_sr=sr, target_sr=QUALITY_SAMPLE_RATE)
+    return audio
+
+
+def analyze_frames(audio: np.ndarray) -> dict:
+    """
+    按帧分析 16kHz 音频，块之间的帧位置连续（帧 k 从 k * QUALITY_HOP_LENGTH 开始）
+
+    返回:
+        dict: {"spectrum": 幅度谱 (频率, 帧), "energy": 每帧幅度之和,
+               "f0": YIN 基频 (Hz), "voiced": 是否为有声帧}
+    """
+    block = int(QUALITY_BLOCK_SECONDS * QUALITY_SAMPLE_RATE)
+    n_bins = int(QUALITY_MAX_HZ * QUALITY_N_FFT / QUALITY_SAMPLE_RATE) + 1
+    spectra, f0 = [], []
+    for start in range(0, len(audio) - QUALITY_N_FFT + 1, block):
+        chunk = audio[start : start + block + QUALITY_N_FFT - QUALITY_HOP_LENGTH]
+        spectra.append(
+            np.abs(
+                librosa.stft(
+                    chunk,
+                    n_fft=QUALITY_N_FFT,
+                    hop_length=QUALITY_HOP_LENGTH,
+                    center=False,
+                )[:n_bins]
+            ).astype(np.float32)
+        )
+        f0.append(
+            librosa.yin(
+                chunk,
+                fmin=PITCH_FMIN,
+                fmax=PITCH_FMAX,
+                sr=QUALITY_SAMPLE_RATE,
+                frame_length=QUALITY_N_FFT,
+                hop_length=QUALITY_HOP_LENGTH,
+                center=False,
+            )
+        )
+    if not spectra:
+        raise ValueError("[x] 音频过短，无法比较处理质量")
+
+    spectrum = np.concatenate(spectra, axis=1)
+    energy = spectrum.sum(axis=0)
+    level = 20 * np.log10(np.maximum(energy, 1e-10))
+    return {
+        "spectrum": spectrum,
+        "energy": energy,
+        "f0": np.concatenate(f0),
+        "voiced": level > level.max() - PITCH_VOICED_DB,
+    }
+
+
+def ideal_frames(
+    source_bounds: np.ndarray, stretch: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    按每段的拉伸系数计算理想输出时间轴上每一帧对应的源帧
+
+    返回:
+        Tuple[np.ndarray, np.ndarray]: (对应的源帧序号, 所属段序号)
+    """
+    positions, segments = [], []
+    for i in range(len(stretch)):
+        start = source_bounds[i] / QUALITY_HOP_LENGTH
+        length = (source_bounds[i + 1] - source_bounds[i]) / QUALITY_HOP_LENGTH
+        n_frames = int(round(length / stretch[i]))
+        positions.append(start + np.arange(n_frames) * stretch[i])
+        segments.append(np.full(n_frames, i))
+    return (
+        np.round(np.concatenate(positions)).astype(np.int64),
+        np.concatenate(segments),
+    )
+
+
+def track_lags(envelope: np.ndarray, target: np.ndarray) -> np.ndarray:
+    """
+    逐窗口跟踪 envelope 相对 target 的时间偏移（帧）：envelope[c + lag] 对应 target[c]
+
+    返回:
+        np.ndarray: 每帧的偏移（窗口中心之间线性插值）
+    """
+    window, step = ALIGN_WINDOW_FRAMES, ALIGN_MAX_STEP_FRAMES
+    centers, lags, previous = [], [], 0
+    for start in range(0, len(target) - window + 1, window):
+        segment = target[start : start + window] - np.mean(
+            target[start : start + window]
+        )
+        best, best_score = previous, -np.inf
+        for lag in range(previous - step, previous + step + 1):
+            if start + lag < 0 or start + lag + window > len(envelope):
+                continue
+            score = float(np.dot(segment, envelope[start + lag : start + lag + window]))
+            if score > best_score:
+                best, best_score = lag, score
+        centers.append(start + window / 2)
+        lags.append(best)
+        previous = best
+
+    if not lags:
+        return np.zeros(len(target), dtype=np.int64)
+    return np.round(np.interp(np.arange(len(target)), centers, lags)).astype(np.int64)
+
+
+def aligned_snr(spectrum: np.ndarray, reference: np.ndarray) -> float:
+    """
+    两个已按帧对齐的幅度谱之间的信噪比（dB，越大越接近参照）
+
+    两者各自归一化到单位能量，音量差异不计入误差。
+    """
+    spectrum = spectrum / max(float(np.linalg.norm(spectrum)), 1e-12)
+    reference = reference / max(float(np.linalg.norm(reference)), 1e-12)
+    noise = float(np.sum(np.square(spectrum - reference)))
+    return 10.0 * float(np.log10(1.0 / max(noise, 1e-12)))
+
+
+def benchmark_tiers(
+    buffer: AudioBuffer,
+    seed: int = 0,
+    tiers: Sequence[str] = tuple(stft_engine.TIERS),
+) -> Dict[str, dict]:
+    """
+    以相同的种子和分段参数分别用各处理档位运行 modify_buffer，记录耗时、相对 final 的加速比与质量
+
+    关闭加噪，质量差只来自变速变调本身。先按抽取的拉伸系数得到理想的输出时间轴，
+    再把每个档位的输出逐帧对齐到该时间轴上比较：
+        duration_error_ms: 输出相对理想时间轴的平均偏移（毫秒，越小越准确）
+        pitch_error_cents: 对齐帧上实测音高偏移与抽取参数之差的中位数（音分，越小越准确）
+        snr_db: 与 final 输出对齐后的幅度谱信噪比（dB，越大越接近）
+    最慢的 final 档位先运行并作为参照。
+    """
+    reference_tier = "final" if "final" in tiers else tiers[-1]
+    order = [reference_tier] + [t for t in tiers if t != reference_tier]
+    results: Dict[str, dict] = {}
+    reference = None
+
+    # modify_buffer 在同一种子下抽取的分段参数
+    stft_engine.seed(seed)
+    stretch, pitch = stft_engine.draw_segment_factors()
+    source_audio = _quality_audio(buffer.samples, buffer.sr)
+    source = analyze_frames(source_audio)
+    positions, segments = ideal_frames(
+        stft_engine.segment_bounds(len(source_audio), len(stretch)), stretch
+    )
+    positions = np.minimum(positions, len(source["energy"]) - 1)
+    expected_cents = 100 * np.asarray(pitch)[segments]
+    del source_audio
+
+    for tier in order:
+        stft_engine.seed(seed)
+        modified, stage = _timed(
+            WX_ASR.modify_buffer, buffer, noise_level=0.0, tier=tier
+        )
+        if modified is not None:
+            stage["sample_rate"] = modified.sr
+            output = analyze_frames(_quality_audio(modified.samples, modified.sr))
+            del modified
+
+            # 理想时间轴上的第 j 帧对应输出的第 j + lag 帧
+            lags = track_lags(output["energy"], source["energy"][positions])
+            frames = np.arange(len(positions)) + lags
+            valid = (frames >= 0) & (frames < len(output["energy"]))
+            frames = np.where(valid, frames, 0)
+            stage["duration_error_ms"] = round(
+                float(np.mean(np.abs(lags)))
+                * QUALITY_HOP_LENGTH
+                * 1000
+                / QUALITY_SAMPLE_RATE,
+                1,
+            )
+
+            voiced = valid & output["voiced"][frames] & source["voiced"][positions]
+            cents = 1200 * np.log2(output["f0"][frames] / source["f0"][positions])
+            errors = np.abs(cents - expected_cents)[voiced]
+            stage["pitch_error_cents"] = (
+                round(float(np.median(errors)), 1) if len(errors) else None
+            )
+
+            if tier == reference_tier:
+                reference = (output["spectrum"], frames, valid)
+                reference_seconds = stage["seconds"]
+            elif reference is not None:
+                both = valid & reference[2]
+                stage["snr_db"] = round(
+                    aligned_snr(
+                        output["spectrum"][:, frames[both]],
+                        reference[0][:, reference[1][both]],
+                    ),
+                    2,
+                )
+            if reference is not None:
+                stage["speedup"] = round(
+                    reference_seconds / max(stage["seconds"], 1e-9), 2
+                )
+            del output
+        results[tier] = stage
+
+    return {tier: results[tier] for tier in tiers}
+
+
+def benchmark_length(
+    wx_asr: WX_ASR,
+    seconds: float,
+    output_dir: Path,
+    seed: int = 0,
+    transcribe: bool = True,
+    tiers: Sequence[str] = tuple(stft_engine.TIERS),
+) -> dict:
+    """
+    对一种时长依次测量各阶段：解码、修改、识别、文本比较、重复率，以及各处理档位的修改耗时
+    """
+    audio_path = synthesize_audio(seconds, seed=seed)
+    original_text, test_text = synthesize_text(seconds, seed=seed)
+    stages: Dict[str, dict] = {}
+
+    buffer, stages["decode"] = _timed(AudioBuffer.load, str(audio_path))
+    tier_results: Dict[str, dict] = {}
+
+    if buffer is not None:
+        # 固定随机种子，使每次运行的处理结果一致
+        stft_engine.seed(seed)
+        _, stages["modify_audio"] = _timed(
+            WX_ASR.modify_audio, buffer, str(output_dir / f"modified_{seconds:g}s.wav")
+        )
+
+        if transcribe:
+            # 直接计时 transcribe：失败时记录 error，不把错误当作转录结果，也不写入任务产物存储
+            _, stages["transcribe"] = _timed(wx_asr.transcribe, buffer, use_cache=False)
+
+        if tiers:
+            tier_results = benchmark_tiers(buffer, seed, tiers)
+
+    # 文本比较使用与时长相称的合成转录（合成音频的识别结果没有意义）
+    _, stages["compare_transcriptions"] = _timed(
+        wx_asr.compare_texts, original_text, test_text
+    )
+    _, stages["calculate_repetition_rate"] = _timed(
+        wx_asr.calculate_repetition_rate, original_text
+    )
+
+    total = sum(stage["seconds"] for stage in stages.values())
+    return {
+        "audio_seconds": seconds,
+        "text_chars": len(original_text),
+        "stages": stages,
+        "tiers": tier_results,
+        "total_seconds": round(total, 4),
+        "realtime_factor": round(total / seconds, 4),
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return (
+            subprocess.run(
+                ["git", "rev-parse", "--short", "HEAD"],
+                cwd=ROOT_DIR,
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout.strip()
+            or None
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare_reports(
+    current: dict, baseline: dict, threshold: float = REGRESSION_THRESHOLD
+) -> List[str]:
+    """
+    对比两份报告中相同时长、相同阶段的耗时，返回变慢超过阈值的条目
+    """
+
+    def timed_entries(result: dict) -> Dict[str, dict]:
+        # 处理档位的耗时与各阶段一起比较
+        tiers = {f"tier:{k}": v for k, v in result.get("tiers", {}).items()}
+        return {**result["stages"], **tiers}
+
+    previous = {
+        r["audio_seconds"]: timed_entries(r) for r in baseline.get("results", [])
+    }
+    regressions: List[str] = []
+    for result in current["results"]:
+        old_stages = previous.get(result["audio_seconds"], {})
+        for name, stage in timed_entries(result).items():
+            old_stage = old_stages.get(name, {})
+            old = old_stage.get("seconds")
+            if not old or "error" in stage or "error" in old_stage:
+                continue
+            if max(old, stage["seconds"]) < MIN_COMPARE_SECONDS:
+                continue
+            ratio = stage["seconds"] / old
+            if ratio > 1 + threshold:
+                regressions.append(
+                    f"{result['audio_seconds']:g}s {name}: "
+                    f"{old:.3f}s -> {stage['seconds']:.3f}s（{ratio:.2f}x）"
+                )
+
+    # 启动导入耗时（-X importtime）
+    old = baseline.get("startup", {}).get("total_seconds")
+    new = current.get("startup", {}).get("total_seconds")
+    if old and new and max(old, new) >= MIN_COMPARE_SECONDS:
+        ratio = new / old
+        if ratio > 1 + threshold:
+            regressions.append(
+                f"startup import: {old:.3f}s -> {new:.3f}s（{ratio:.2f}x）"
+            )
+    return regressions
+
+
+def run_benchmark(
+    lengths: Sequence[float] = DEFAULT_LENGTHS,
+    model_name: Optional[str] = DEFAULT_MODEL,
+    output_file: Optional[str] = None,
+    seed: int = 0,
+    tiers: Sequence[str] = tuple(stft_engine.TIERS),
+) -> dict:
+    """
+    运行完整的基准测试并写出 JSON 报告
+
+    参数:
+        lengths (list): 测试音频时长（秒）
+        model_name (str): 识别所用的 Whisper 模型，None 表示跳过识别阶段
+        output_file (str): 报告路径，默认 media/output/benchmark.json
+        seed (int): 合成音频、文本和处理参数的随机种子
+        tiers (list): 需要对比的处理档位，为空时跳过档位对比
+
+    返回:
+        dict: 报告内容
+    """
+    output = (
+        Path(output_file)
+        if output_file
+        else ROOT_DIR / "media" / "output" / "benchmark.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+
+    report = {
+        "commit": _git_commit(),
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "model": model_name,
+        "seed": seed,
+        "results": [],
+    }
+
+    # 在新的解释器中测量导入核心模块的耗时，重量级依赖应在首次使用时才导入
+    try:
+        report["startup"] = lazy_import.measure_startup(top=10)
+        print(f"[√] 启动导入耗时: {report['startup']['total_seconds']:.3f}s")
+    except ValueError as e:
+        report["startup"] = {"error": str(e)}
+
+    # 解码器、jieba 词典和模型的加载是一次性开销，单独计时，不计入各阶段
+    wx_asr = WX_ASR(model_name=model_name or DEFAULT_MODEL)
+    _, report["load_decoder"] = _timed(
+        AudioBuffer.load, str(synthesize_audio(1, seed=seed))
+    )
+    _, report["load_tokenizer"] = _timed(tokenizer.warm_up, background=False)
+    if model_name:
+        _, report["load_model"] = _timed(lambda: wx_asr.model)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for seconds in lengths:
+            print(f"[...] 基准测试：{seconds:g} 秒音频")
+            result = benchmark_length(
+                wx_asr,
+                seconds,
+                Path(temp_dir),
+                seed,
+                transcribe=bool(model_name),
+                tiers=tiers,
+            )
+            report["results"].append(result)
+            for name, stage in result["stages"].items():
+                status = f"[x] {stage['error']}" if "error" in stage else ""
+                print(
+                    f"    ├─ {name}: {stage['seconds']:.3f}s"
+                    f"（峰值内存 {stage['peak_rss_mb']} MB）{status}"
+                )
+            for name, stage in result["tiers"].items():
+                if "error" in stage:
+                    print(f"    ├─ 档位 {name}: [x] {stage['error']}")
+                    continue
+                print(
+                    f"    ├─ 档位 {name}: {stage['seconds']:.3f}s"
+                    f"（{stage.get('speedup')}x，"
+                    f"SNR {stage.get('snr_db')} dB，"
+                    f"时长误差 {stage.get('duration_error_ms')} ms，"
+                    f"音高误差 {stage.get('pitch_error_cents')} 音分）"
+                )
+
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"[√] 基准测试报告已保存至: {output}")
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="音频修改 → 识别 → 比较 流程的基准测试"
+    )
+    parser.add_argument(
+        "--lengths",
+        type=float,
+        nargs="+",
+        default=list(DEFAULT_LENGTHS),
+        help="测试音频时长（秒）",
+    )
+    parser.add_argument("--model", default=DEFAULT_MODEL, help="Whisper 模型名称")
+    parser.add_argument("--no-asr", action="store_true", help="跳过语音识别阶段")
+    parser.add_argument(
+        "--tiers",
+        nargs="*",
+        choices=list(stft_engine.TIERS),
+        default=list(stft_engine.TIERS),
+        help="对比的处理档位（不带参数时跳过档位对比）",
+    )
+    parser.add_argument(
+        "-o", "--output", help="报告路径，默认 media/output/benchmark.json"
+    )
+    parser.add_argument("--baseline", help="用于对比的历史报告，变慢超过阈值时返回非零")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    report = run_benchmark(
+        args.lengths,
+        model_name=None if args.no_asr else args.model,
+        output_file=args.output,
+        seed=args.seed,
+        tiers=args.tiers,
+    )
+
+    # 有阶段失败的报告不能作为有效结果（也不应作为之后的对比基准）
+    failed = [
+        f"{result['audio_seconds']:g}s {name}: {stage['error']}"
+        for result in report["results"]
+        for name, stage in {**result["stages"], **result["tiers"]}.items()
+        if "error" in stage
+    ]
+    if "error" in report.get("load_model", {}):
+        failed.insert(0, f"load_model: {report['load_model']['error']}")
+    for line in failed:
+        print(f"[x] 阶段失败: {line}")
+    if failed:
+        sys.exit(1)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_reports(report, baseline, args.threshold)
+        for line in regressions:
+            print(f"[x] 性能回归: {line}")
+        if regressions:
+            sys.exit(1)
+        print("[√] 未发现性能回归")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+import os
+import json
+import hashlib
+import tempfile
+import numpy as np
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from src import stft_engine
+from src.audio_buffer import AudioBuffer
+from src.transcription_cache import evict_lru
+
+# 分段处理结果的缓存目录与容量上限
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent / "media" / "cache" / "segments"
+DEFAULT_MAX_BYTES: int = 2 * 1024 * 1024 * 1024
+
+# 分段边界在等分点附近搜索静音的范围（秒）与能量帧长（秒）
+SILENCE_SEARCH_SECONDS: float = 1.0
+SILENCE_FRAME_SECONDS: float = 0.02
+
+# 转录窗口的最大原始时长（秒），为变速留出余量，不超过 Whisper 的 30 秒窗口
+WINDOW_SECONDS: float = 25.0
+
+
+def source_hash(buffer: AudioBuffer) -> str:
+    """
+    计算已解码音频的内容哈希（包含采样率）
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(str(buffer.sr).encode("utf-8"))
+    digest.update(np.ascontiguousarray(buffer.samples).tobytes())
+    return digest.hexdigest()
+
+
+def silence_bounds(
+    samples: np.ndarray,
+    sr: int,
+    n_segments: int = stft_engine.N_SEGMENTS,
+    search_seconds: float = SILENCE_SEARCH_SECONDS,
+) -> np.ndarray:
+    """
+    把等分边界移动到附近能量最低的帧，避免分段切断词语
+
+    边界只取决于原始音频，同一音频每次得到相同的分段。
+
+    返回:
+        np.ndarray: 长度为 n_segments + 1 的采样点边界数组
+    """
+    bounds = stft_engine.segment_bounds(len(samples), n_segments)
+    frame = max(1, int(SILENCE_FRAME_SECONDS * sr))
+    n_frames = len(samples) // frame
+    if n_frames == 0:
+        return bounds
+
+    energy = np.square(samples[: n_frames * frame].reshape(n_frames, frame)).mean(
+        axis=1
+    )
+    radius = min(int(search_seconds * sr), len(samples) // (2 * n_segments)) // frame
+
+    for i in range(1, n_segments):
+        center = int(bounds[i]) // frame
+        low = max(0, center - radius)
+        high = min(n_frames, center + radius + 1)
+        cut = (low + int(np.argmin(energy[low:high]))) * frame + frame // 2
+        # 保持边界单调，且不越过下一个等分点
+        bounds[i] = min(max(cut, bounds[i - 1]), bounds[i + 1])
+
+    return bounds
+
+
+def transcription_windows(
+    bounds: Sequence[int], sr: int, window_seconds: float = WINDOW_SECONDS
+) -> List[List[int]]:
+    """
+    按原始时长把相邻的段合并为转录窗口（单段超长时独占一个窗口）
+
+    分组只取决于原始分段，某一段变化时只有它所在的窗口需要重新识别。
+
+    返回:
+        List[List[int]]: 每个窗口包含的段序号（跳过空段）
+    """
+    max_len = int(window_seconds * sr)
+    windows: List[List[int]] = []
+    window_start = 0
+    for index in range(len(bounds) - 1):
+        start, end = int(bounds[index]), int(bounds[index + 1])
+        if end <= start:
+            continue
+        if windows and end - window_start <= max_len:
+            windows[-1].append(index)
+        else:
+            windows.append([index])
+            window_start = start
+    return windows
+
+
+class IncrementalProcessor:
+    """
+    按段缓存的可复现音频处理流程
+
+    分段边界落在静音处，每段使用独立的随机数生成器（由全局种子和段序号派生）。
+    耗时的变速变调结果以 (音频哈希, 段序号, 种子, 拉伸/音高范围) 作为缓存键保存，
+    增益与加噪很便宜，每次重新计算，因此只改增益或噪声时所有段都命中缓存；
+    单独重抽某一段时只有该段会被重新计算。
+    转录按不超过 WINDOW_SECONDS 的窗口进行并走 WX_ASR 的内容缓存，
+    未变化的窗口不会重新识别。
+    """
+
+    def __init__(
+        self,
+        wx_asr=None,
+        cache_dir: Union[str, Path] = DEFAULT_CACHE_DIR,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        n_segments: int = stft_engine.N_SEGMENTS,
+    ) -> None:
+        self.wx_asr = wx_asr
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.n_segments = n_segments
+
+    def _segment_key(self, source: str, index: int, seed: int, params: dict) -> str:
+        payload = json.dumps(
+            {"source": source, "index": index, "seed": seed, "params": params},
+            sort_keys=True,
+        )
+        return hashlib.blake2b(payload.encode("utf-8"), digest_size=20).hexdigest()
+
+    def _load(self, key: str) -> Optional[np.ndarray]:
+        path = self.cache_dir / f"{key}.npy"
+        try:
+            samples = np.load(path)
+            os.utime(path)
+            return samples
+        except (OSError, ValueError):
+            return None
+
+    def _save(self, key: str, samples: np.ndarray) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(suffix=".tmp", dir=self.cache_dir)
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, samples)
+        os.replace(temp_path, self.cache_dir / f"{key}.npy")
+
+    @staticmethod
+    def _modify_segment(
+        segment: np.ndarray, sr: int, seed: int, index: int, params: dict
+    ) -> np.ndarray:
+        """
+        用段专属的随机数生成器对单段变速、变调
+        """
+        rng = np.random.default_rng([seed, index])
+        stretch = np.array([rng.uniform(*params["stretch_range"])])
+        pitch = np.array([rng.uniform(*params["pitch_range"])])
+        return stft_engine.batched_modify(segment, sr, stretch, pitch)
+
+    @staticmethod
+    def _finish_segment(
+        samples: np.ndarray, seed: int, index: int, gain: float, noise: float
+    ) -> np.ndarray:
+        """
+        对单段施加增益与白噪声（不做标准化），噪声由 (种子, 段序号) 决定
+        """
+        rng = np.random.default_rng([seed, index, 1])
+        out = samples * gain
+        out += rng.normal(0, noise, len(out)).astype(out.dtype)
+        np.clip(out, -1.0, 1.0, out=out)
+        return out
+
+    def process(
+        self,
+        buffer: AudioBuffer,
+        seed: int = 0,
+        gain: float = stft_engine.DEFAULT_VOLUME_GAIN,
+        noise: float = stft_engine.DEFAULT_NOISE_LEVEL,
+        segment_seeds: Optional[Dict[int, int]] = None,
+        transcribe: bool = True,
+        stretch_range: Tuple[float, float] = stft_engine.STRETCH_RANGE,
+        pitch_range: Tuple[float, float] = stft_engine.PITCH_RANGE,
+    ) -> dict:
+        """
+        处理整段音频，只重新计算缓存未命中的段
+
+        参数:
+            buffer (AudioBuffer): 已解码的原始音频
+            seed (int): 全局种子
+            gain (float): 音量增益
+            noise (float): 白噪声标准差
+            segment_seeds (dict): 针对个别段的种子覆盖，用于单独重抽某一段
+            transcribe (bool): 是否按窗口转录（需要构造时传入 WX_ASR 实例）
+            stretch_range (tuple): 每段拉伸倍率的取值范围
+            pitch_range (tuple): 每段音高偏移（半音）的取值范围
+
+        返回:
+            dict: {"audio": 处理后的 AudioBuffer, "recomputed": 重新计算的段序号,
+                   "segments": 每个转录窗口的段序号、起止时间与文本, "text": 拼接后的文本}
+        """
+        segment_seeds = segment_seeds or {}
+        params = {
+            "n_segments": self.n_segments,
+            "stretch_range": [float(v) for v in stretch_range],
+            "pitch_range": [float(v) for v in pitch_range],
+        }
+        source = source_hash(buffer)
+        bounds = silence_bounds(buffer.samples, buffer.sr, self.n_segments)
+
+        outputs: Dict[int, np.ndarray] = {}
+        recomputed: List[int] = []
+        for index in range(self.n_segments):
+            start, end = int(bounds[index]), int(bounds[index + 1])
+            if end <= start:
+                continue
+
+            segment_seed = segment_seeds.get(index, seed)
+            key = self._segment_key(source, index, segment_seed, params)
+            samples = self._load(key)
+            if samples is None:
+                samples = self._modify_segment(
+                    buffer.samples[start:end], buffer.sr, segment_seed, index, params
+                )
+                self._save(key, samples)
+                recomputed.append(index)
+            outputs[index] = self._finish_segment(
+                samples, segment_seed, index, gain, noise
+            )
+
+        evict_lru(self.cache_dir, "*.npy", self.max_bytes)
+
+        # 重新拼接并按全局峰值标准化（标准化很便宜，每次都重新计算）
+        audio = np.concatenate(list(outputs.values()))
+        peak = np.max(np.abs(audio))
+        if peak > 0:
+            audio = audio / peak
+        result = {
+            "audio": buffer.derive(audio, f"incremental:seed={seed}"),
+            "recomputed": recomputed,
+        }
+
+        if transcribe and self.wx_asr is not None:
+            # 转录未标准化的窗口音频，其内容只取决于窗口内各段，
+            # 未变化的窗口会命中转录缓存
+            offsets, offset = {}, 0
+            for index, samples in outputs.items():
+                offsets[index] = offset
+                offset += len(samples)
+
+            segments = []
+            for ids in transcription_windows(bounds, buffer.sr):
+                samples = np.concatenate([outputs[index] for index in ids])
+                text = self.wx_asr.transcribe(buffer.derive(samples, "window"))["text"]
+                start = offsets[ids[0]]
+                segments.append(
+                    {
+                        "ids": ids,
+                        "start": round(start / buffer.sr, 3),
+                        "end": round((start + len(samples)) / buffer.sr, 3),
+                        "text": text,
+                    }
+                )
+
+            result["segments"] = segments
+            result["text"] = "".join(seg["text"] for seg in segments)
+
+        return result
@@ -0,0 +1,289 @@
+import os
+import json
+import time
+import threading
+import multiprocessing
+from pathlib import Path
+from contextlib import contextmanager, nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterator, List, Optional
+
+# 环境变量：逗号分隔的输出目标，例如 "log,jsonl:media/output/metrics.jsonl,prometheus:9108"
+ENV_SINKS: str = "WXASR_METRICS"
+
+# 环境变量：对顶层阶段进行采样分析，取值 "cprofile" 或 "pyinstrument"
+ENV_PROFILE: str = "WXASR_PROFILE"
+
+# 性能分析结果的默认保存目录
+DEFAULT_PROFILE_DIR = Path(__file__).parent.parent / "media" / "output" / "profiles"
+
+PROFILERS = ("cprofile", "pyinstrument")
+
+# 未启用时所有计时都返回同一个空上下文，开销只有一次函数调用
+_DISABLED = nullcontext()
+
+_enabled: bool = False
+_sinks: List[Callable[[dict], None]] = []
+_profiler: Optional[str] = None
+_profile_dir: Path = DEFAULT_PROFILE_DIR
+_lock = threading.Lock()
+_local = threading.local()
+
+# 进程内累计的统计：阶段 -> {"calls", "seconds", "max_seconds"}，计数器 -> 数值
+_stages: Dict[str, Dict[str, float]] = {}
+_counters: Dict[str, float] = {}
+
+
+def log_sink(event: dict) -> None:
+    """
+    输出到控制台的日志行
+    """
+    if event["type"] == "stage":
+        print(f"[...] 阶段 {event['name']}: {event['seconds']:.3f}s")
+    else:
+        print(f"[...] 计数 {event['name']}: +{event['value']:g}")
+
+
+def jsonl_sink(file_path: str) -> Callable[[dict], None]:
+    """
+    追加写入 JSON lines 文件，每个事件一行
+    """
+    path = Path(file_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    file_lock = threading.Lock()
+
+    def write(event: dict) -> None:
+        line = json.dumps(event, ensure_ascii=False)
+        with file_lock, open(path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+    return write
+
+
+def prometheus_text() -> str:
+    """
+    以 Prometheus 文本格式导出累计统计
+    """
+    with _lock:
+        stages = sorted((name, dict(stats)) for name, stats in _stages.items())
+        counters = sorted(_counters.items())
+
+    # 同一指标的所有样本必须连续出现
+    lines: List[str] = []
+    for metric, field, kind, spec in (
+        ("wxasr_stage_calls_total", "calls", "counter", "g"),
+        ("wxasr_stage_seconds_total", "seconds", "counter", ".6f"),
+        ("wxasr_stage_seconds_max", "max_seconds", "gauge", ".6f"),
+    ):
+        lines.append(f"# TYPE {metric} {kind}")
+        for name, stats in stages:
+            lines.append(f'{metric}{{stage="{name}"}} {stats[field]:{spec}}')
+
+    lines.append("# TYPE wxasr_counter_total counter")
+    for name, value in counters:
+        lines.append(f'wxasr_counter_total{{name="{name}"}} {value:g}')
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        if self.path.rstrip("/") not in ("", "/metrics"):
+            self.send_error(404)
+            return
+        body = prometheus_text().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+def serve_prometheus(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """
+    在后台线程中提供 /metrics 接口（Prometheus 文本格式）
+
+    返回:
+        ThreadingHTTPServer: 服务器对象，可调用 shutdown() 停止
+    """
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"[√] 指标接口已启动: http://{host}:{server.server_port}/metrics")
+    return server
+
+
+def enable(
+    sinks: Optional[List[Callable[[dict], None]]] = None,
+    profiler: Optional[str] = None,
+    profile_dir: Optional[str] = None,
+) -> None:
+    """
+    启用计时与计数
+
+    参数:
+        sinks (list): 事件输出函数（log_sink、jsonl_sink(...) 或自定义函数）
+        profiler (str): 对顶层阶段进行性能分析，"cprofile" 或 "pyinstrument"
+        profile_dir (str): 性能分析结果保存目录
+    """
+    global _enabled, _sinks, _profiler, _profile_dir
+    if profiler is not None and profiler not in PROFILERS:
+        raise ValueError(f"[x] 不支持的性能分析工具：{profiler}")
+
+    _sinks = list(sinks or [])
+    _profiler = profiler
+    _profile_dir = Path(profile_dir) if profile_dir else DEFAULT_PROFILE_DIR
+    _enabled = True
+
+
+def disable() -> None:
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def snapshot() -> dict:
+    """
+    返回当前累计的阶段统计与计数器
+    """
+    with _lock:
+        return {
+            "stages": {name: dict(stats) for name, stats in _stages.items()},
+            "counters": dict(_counters),
+        }
+
+
+def reset() -> None:
+    with _lock:
+        _stages.clear()
+        _counters.clear()
+
+
+def _emit(event: dict) -> None:
+    for sink in _sinks:
+        try:
+            sink(event)
+        except Exception as e:
+            print(f"[x] 指标输出失败: {e}")
+
+
+@contextmanager
+def _profiled(name: str) -> Iterator[None]:
+    """
+    对顶层阶段运行性能分析，结果保存为 .prof（cProfile）或 .html（pyinstrument）
+    """
+    _profile_dir.mkdir(parents=True, exist_ok=True)
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+
+    if _profiler == "pyinstrument":
+        from pyinstrument import Profiler
+
+        profiler = Profiler()
+        profiler.start()
+        try:
+            yield
+        finally:
+            profiler.stop()
+            output = _profile_dir / f"{name}_{stamp}.html"
+            output.write_text(profiler.output_html(), encoding="utf-8")
+    else:
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            profiler.dump_stats(str(_profile_dir / f"{name}_{stamp}.prof"))
+
+
+@contextmanager
+def _timed_stage(name: str) -> Iterator[None]:
+    depth = getattr(_local, "depth", 0)
+    _local.depth = depth + 1
+    profile = _profiled(name) if _profiler and depth == 0 else nullcontext()
+    start = time.perf_counter()
+    try:
+        with profile:
+            yield
+    finally:
+        seconds = time.perf_counter() - start
+        _local.depth = depth
+        with _lock:
+            stats = _stages.setdefault(
+                name, {"calls": 0, "seconds": 0.0, "max_seconds": 0.0}
+            )
+            stats["calls"] += 1
+            stats["seconds"] += seconds
+            stats["max_seconds"] = max(stats["max_seconds"], seconds)
+        _emit(
+            {
+                "type": "stage",
+                "name": name,
+                "seconds": round(seconds, 6),
+                "depth": depth,
+                "time": round(time.time(), 3),
+            }
+        )
+
+
+def stage(name: str):
+    """
+    计时上下文：with instrument.stage("modify_audio.decode"): ...
+
+    未启用时返回共享的空上下文，几乎没有开销。
+    """
+    if not _enabled:
+        return _DISABLED
+    return _timed_stage(name)
+
+
+def count(name: str, value: float = 1) -> None:
+    """
+    计数器累加（未启用时直接返回）
+    """
+    if not _enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+    _emit({"type": "counter", "name": name, "value": value, "time": time.time()})
+
+
+def enable_from_env() -> bool:
+    """
+    根据环境变量启用指标，例如：
+        WXASR_METRICS=log,jsonl:media/output/metrics.jsonl,prometheus:9108
+        WXASR_PROFILE=cprofile
+
+    返回:
+        bool: 是否已启用
+    """
+    spec = os.environ.get(ENV_SINKS, "").strip()
+    profiler = os.environ.get(ENV_PROFILE, "").strip() or None
+    if not spec and not profiler:
+        return False
+
+    sinks: List[Callable[[dict], None]] = []
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        kind, _, argument = item.partition(":")
+        if kind == "log":
+            sinks.append(log_sink)
+        elif kind == "jsonl":
+            sinks.append(jsonl_sink(argument or "media/output/metrics.jsonl"))
+        elif kind == "prometheus":
+            # 进程池的工作进程（spawn 时会重新导入本模块）不再绑定同一端口，只由主进程提供
+            if multiprocessing.parent_process() is None:
+                serve_prometheus(int(argument or 9108))
+        else:
+            raise ValueError(f"[x] 不支持的指标输出：{item}")
+
+    enable(sinks, profiler=profiler)
+    return True
+
+
+enable_from_env()
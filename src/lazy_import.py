@@ -0,0 +1,181 @@
+import sys
+import time
+import argparse
+import importlib
+import threading
+import subprocess
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# 需要较长导入时间的依赖（torch / whisper 数秒，librosa 首次使用时加载 numba 等）
+HEAVY_MODULES: Tuple[str, ...] = (
+    "torch",
+    "whisper",
+    "librosa",
+    "soundfile",
+    "scipy.sparse",
+    "jieba",
+)
+
+# 启动耗时报告默认检查的模块
+DEFAULT_TARGET: str = "src.logic_component"
+
+# 各模块首次真正导入的耗时（秒）
+_import_seconds: Dict[str, float] = {}
+_lock = threading.Lock()
+
+
+class LazyModule:
+    """
+    模块代理：首次访问属性时才真正导入
+
+    导入由 importlib 的模块锁保护，多个线程同时首次访问也只会导入一次。
+    """
+
+    def __init__(self, name: str) -> None:
+        self.__dict__["_name"] = name
+        self.__dict__["_module"] = None
+
+    def _load(self):
+        module = self.__dict__["_module"]
+        if module is None:
+            name = self.__dict__["_name"]
+            loaded = name in sys.modules
+            start = time.perf_counter()
+            module = importlib.import_module(name)
+            if not loaded:
+                with _lock:
+                    _import_seconds.setdefault(name, time.perf_counter() - start)
+            self.__dict__["_module"] = module
+        return module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __dir__(self) -> List[str]:
+        return dir(self._load())
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.__dict__["_module"] is not None else "not loaded"
+        return f"<lazy module '{self.__dict__['_name']}' ({state})>"
+
+
+def lazy(name: str) -> LazyModule:
+    """
+    返回模块代理，用于替换模块顶部的 import 语句：
+        whisper = lazy_import.lazy("whisper")
+    """
+    return LazyModule(name)
+
+
+def is_loaded(name: str) -> bool:
+    return name in sys.modules
+
+
+def import_times() -> Dict[str, float]:
+    """
+    通过代理首次导入的模块及其耗时（秒）
+    """
+    with _lock:
+        return dict(_import_seconds)
+
+
+def warm_up(
+    modules: Iterable[str] = HEAVY_MODULES, background: bool = True
+) -> Optional[threading.Thread]:
+    """
+    预先导入重量级依赖，后台进行时界面或服务可以先启动，首次处理时无需等待
+
+    参数:
+        modules (list): 需要预先导入的模块
+        background (bool): 在后台线程中导入（默认）；为 False 时同步导入
+
+    返回:
+        threading.Thread: 后台线程（同步导入时为 None）
+    """
+    names = list(modules)
+
+    def run() -> None:
+        for name in names:
+            try:
+                lazy(name)._load()
+            except Exception as e:
+                print(f"[x] 预加载 {name} 失败: {e}")
+
+    if not background:
+        run()
+        return None
+
+    thread = threading.Thread(target=run, name="wxasr-import-warm-up", daemon=True)
+    thread.start()
+    return thread
+
+
+def measure_startup(target: str = DEFAULT_TARGET, top: int = 15) -> dict:
+    """
+    在新的解释器中以 -X importtime 导入 target，统计导入耗时
+
+    参数:
+        target (str): 要导入的模块，例如 "src.logic_component" 或 "main"
+        top (int): 返回累计耗时最长的模块数
+
+    返回:
+        dict: {"target", "total_seconds", "wall_seconds", "modules": [{"module", "self_ms", "cumulative_ms"}]}
+    """
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=str(Path(__file__).parent.parent),
+        capture_output=True,
+        text=True,
+    )
+    wall = time.perf_counter() - start
+    if result.returncode != 0:
+        raise ValueError(f"[x] 导入 {target} 失败：{result.stderr.strip()[-500:]}")
+
+    # 每行格式：import time: self [us] | cumulative | imported package
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+
+    total = next((c for name, _, c in rows if name == target), 0)
+    rows.sort(key=lambda row: row[2], reverse=True)
+    return {
+        "target": target,
+        "total_seconds": round(total / 1e6, 4),
+        "wall_seconds": round(wall, 4),
+        "modules": [
+            {
+                "module": name,
+                "self_ms": round(self_us / 1e3, 2),
+                "cumulative_ms": round(cumulative_us / 1e3, 2),
+            }
+            for name, self_us, cumulative_us in rows[:top]
+        ],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="启动导入耗时报告（基于 -X importtime）"
+    )
+    parser.add_argument(
+        "target", nargs="?", default=DEFAULT_TARGET, help="要导入的模块，例如 main"
+    )
+    parser.add_argument("--top", type=int, default=15, help="显示耗时最长的模块数")
+    args = parser.parse_args()
+
+    report = measure_startup(args.target, args.top)
+    print(f"\n=== 导入耗时: {report['target']} ===")
+    print(f"├─ 导入总耗时: {report['total_seconds'] * 1000:.1f} ms")
+    print(f"└─ 含解释器启动: {report['wall_seconds'] * 1000:.1f} ms\n")
+    print(f"{'累计(ms)':>10} {'自身(ms)':>10}  模块")
+    for row in report["modules"]:
+        print(f"{row['cumulative_ms']:>10.1f} {row['self_ms']:>10.1f}  {row['module']}")
+
+
+if __name__ == "__main__":
+    main()
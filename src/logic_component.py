@@ -1,18 +1,32 @@
 import os
+import sys
 import time
 import random
-import whisper
-import librosa
+import threading
+import warnings
 import numpy as np
-import soundfile as sf
-import jieba
 from pathlib import Path
-import speech_recognition as sr
 from typing import Optional, Union, Tuple
-from deprecated import deprecated
+
+# 直接运行本文件时也能以 src 包的形式导入同级模块
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src import metrics, model_registry, segment_asr, stft_engine, stream_engine
+from src import instrument, lazy_import, remux, repetition, tokenizer
+from src import similarity as similarity_engine
+from src.artifact_store import ArtifactStore, default_store, link_or_copy
+from src.asr_backends import ASRBackend, FunASRBackend
+from src.audio_buffer import WHISPER_SAMPLE_RATE, AudioBuffer
+from src.transcription_cache import TranscriptionCache
+
+# 重量级依赖在首次使用时才导入（见 src/lazy_import.py）
+whisper = lazy_import.lazy("whisper")
 
 isTesting: bool = True
 
+# 转录模式：整段转录 / 静音切分后批量解码
+TRANSCRIBE_MODES: Tuple[str, ...] = ("full", "vad")
+
 
 class WX_ASR:
     # 版本信息
@@ -20,10 +34,56 @@ class WX_ASR:
     DEVELOPER = "钟智强"
     DEVELOPER_EMAIL = "johnmelodymel@qq.com"
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        model_name: str = model_registry.DEFAULT_MODEL,
+        device: Optional[str] = None,
+        dtype: str = model_registry.DEFAULT_DTYPE,
+        threads: Optional[int] = None,
+        backend: Optional[ASRBackend] = None,
+        warm_up: bool = False,
+    ) -> None:
         self.language: str = "zh"
-        self.recognizer: sr.Recognizer = sr.Recognizer()
-        self.model: whisper.Whisper = whisper.load_model("base")
+
+        # 其他识别引擎（例如 FunASR），未指定时使用 Whisper
+        self.backend: Optional[ASRBackend] = backend
+
+        # 模型不在构造时加载，首次转录时从进程内共享的模型表获取
+        self.model_name: str = model_name
+        self.device: Optional[str] = device
+        self.dtype: str = dtype
+
+        # CPU 推理线程数（进程级设置）
+        model_registry.set_num_threads(threads)
+
+        # 转录结果缓存（按音频内容 + 模型 + 解码参数）
+        self.cache: TranscriptionCache = TranscriptionCache()
+
+        # 可选：后台导入 torch / whisper / librosa 等重量级依赖并预加载 jieba 词典，
+        # 首次处理和第一次文本比较无需等待；不预热时创建实例不导入任何重量级依赖
+        if warm_up:
+            lazy_import.warm_up()
+            tokenizer.warm_up()
+
+    @property
+    def store(self) -> ArtifactStore:
+        """
+        进程内共享的任务产物存储（转录文本、分段、比较结果）
+        """
+        return default_store()
+
+    @property
+    def model(self) -> "whisper.Whisper":
+        """
+        懒加载的 Whisper 模型，相同配置的实例共享同一份权重
+        """
+        return model_registry.get_model(self.model_name, self.device, self.dtype)
+
+    def release_model(self) -> int:
+        """
+        从共享模型表中释放当前配置的模型（其他实例下次使用时会重新加载）
+        """
+        return model_registry.evict(self.model_name, self.device, self.dtype)
 
     @staticmethod
     def get_info() -> dict:
@@ -38,127 +98,363 @@ class WX_ASR:
             "功能": ["音频处理与变声", "语音识别转写", "文本相似度分析", "重复率计算"],
         }
 
-    def __init__(self) -> None:
-        self.language: str = "zh"
-        self.recognizer: sr.Recognizer = sr.Recognizer()
-        self.model: whisper.Whisper = whisper.load_model("base")
-
     @staticmethod
     def modify_video_audio(
-        input_video: str, modified_audio: str, output_video: str
+        input_video: str,
+        modified_audio: Union[str, AudioBuffer],
+        output_video: str,
     ) -> None:
         """
         将修改后的音频替换视频中的原始音频
+
+        modified_audio 可以是音频文件路径，也可以是内存中的 AudioBuffer（无需再次解码）。
+        视频流原样复制，只编码新的音轨（ffmpeg 重新封装），耗时接近音频编码时间。
         """
         try:
-            import moviepy.editor as mp
-
-            # 加载视频和修改后的音频
-            video = mp.VideoFileClip(input_video)
-            new_audio = mp.AudioFileClip(modified_audio)
-
-            # 替换音频
-            final_video = video.set_audio(new_audio)
-
-            # 保存新视频（保持原视频编码设置）
-            final_video.write_videofile(
-                output_video,
-                codec="libx264",
-                audio_codec="aac",
-                temp_audiofile="temp-audio.m4a",
-                remove_temp=True,
-            )
-
-            # 清理资源
-            video.close()
-            new_audio.close()
-            final_video.close()
-
+            with instrument.stage("modify_video_audio"):
+                remux.replace_audio(input_video, modified_audio, output_video)
         except Exception as e:
             raise ValueError(f"[x] 替换视频音频时出错：{str(e)}")
 
+    @staticmethod
+    def modify_buffer(
+        buffer: AudioBuffer,
+        noise_level: float = stft_engine.DEFAULT_NOISE_LEVEL,
+        volume_gain: float = stft_engine.DEFAULT_VOLUME_GAIN,
+        engine: str = "batched",
+        stretch_range: Tuple[float, float] = stft_engine.STRETCH_RANGE,
+        pitch_range: Tuple[float, float] = stft_engine.PITCH_RANGE,
+        tier: str = stft_engine.DEFAULT_TIER,
+    ) -> AudioBuffer:
+        """
+        对已解码的音频进行分段变速、变调并添加噪声（不读写磁盘）
+
+        参数:
+            buffer (AudioBuffer): 已解码的音频
+            noise_level (float): 白噪声标准差
+            volume_gain (float): 加噪前的音量增益
+            engine (str): "batched" 整段只做一次 STFT（默认）；
+                          "reference" 保留原有逐段调用 librosa 的实现
+            stretch_range (tuple): 每段时间拉伸系数的随机范围
+            pitch_range (tuple): 每段音高偏移（半音）的随机范围
+            tier (str): 批量引擎的处理档位 "preview"（快速预览，输出 22.05kHz）、
+                        "standard"（默认）或 "final"（最终导出）；
+                        "reference" 引擎保留 librosa 默认参数，不受档位影响
+
+        返回:
+            AudioBuffer: 处理后的音频
+        """
+        if engine not in stft_engine.ENGINES:
+            raise ValueError(f"[x] 不支持的处理引擎：{engine}")
+        if tier not in stft_engine.TIERS:
+            raise ValueError(f"[x] 不支持的处理档位：{tier}")
+
+        audio, sr = buffer.samples, buffer.sr
+
+        # 时域变换处理（分段参数抽取顺序在两种引擎下一致）
+        stretch, pitch = stft_engine.draw_segment_factors(
+            stft_engine.N_SEGMENTS, stretch_range, pitch_range
+        )
+
+        with instrument.stage("modify_buffer.stretch_pitch"):
+            if engine == "batched":
+                audio, sr = stft_engine.tiered_modify(audio, sr, stretch, pitch, tier)
+                step = f"modify:{engine}:{tier}"
+            else:
+                audio = stft_engine.reference_modify(audio, sr, stretch, pitch)
+                step = f"modify:{engine}"
+
+        with instrument.stage("modify_buffer.postprocess"):
+            # 音量调整、添加白噪声并标准化（变速变调的结果是新数组，float32 原地分块处理）
+            modified_audio = stft_engine.postprocess(
+                audio, volume_gain, noise_level, inplace=True
+            )
+
+        return buffer.derive(modified_audio, step, sr)
+
+    @staticmethod
     def modify_audio(
-        file_path: str,
+        file_path: Union[str, AudioBuffer],
         output_path: str,
-        noise_level: float = 0.05,
-        volume_gain: float = 0.5,
+        noise_level: float = stft_engine.DEFAULT_NOISE_LEVEL,
+        volume_gain: float = stft_engine.DEFAULT_VOLUME_GAIN,
+        engine: str = "batched",
+        encoding: Optional[str] = None,
+        tier: str = stft_engine.DEFAULT_TIER,
+        stretch_range: Tuple[float, float] = stft_engine.STRETCH_RANGE,
+        pitch_range: Tuple[float, float] = stft_engine.PITCH_RANGE,
     ) -> Tuple[np.ndarray, int]:
-        try:
-            if not os.path.exists(file_path):
-                raise FileNotFoundError(f"[x] 未找到音频文件：{file_path}")
-
-            # 加载音频文件
-            audio, sr = librosa.load(file_path, sr=None)
+        """
+        对音频文件进行分段变速、变调并添加噪声，结果保存到 output_path
 
-            # 时域变换处理
-            segments = np.array_split(audio, 40)  # 分段处理
-            modified_segments = []
+        参数:
+            file_path: 音频文件路径，或已解码的 AudioBuffer（跳过解码）
+            engine (str): "batched" 整段只做一次 STFT（默认）；
+                          "reference" 保留原有逐段调用 librosa 的实现
+            encoding (str): 输出编码 "pcm16"（默认）、"float32" 或 "flac"；
+                            output_path 为 .npy 时保存为可内存映射的中间文件
+            tier (str): 处理档位 "preview"、"standard"（默认）或 "final"
+            stretch_range (tuple): 每段时间拉伸系数的随机范围（参数扫描的 stretch_spread）
+            pitch_range (tuple): 每段音高偏移（半音）的随机范围（参数扫描的 pitch_spread）
+        """
+        try:
+            with instrument.stage("modify_audio"):
+                if isinstance(file_path, AudioBuffer):
+                    buffer = file_path
+                else:
+                    if not os.path.exists(file_path):
+                        raise FileNotFoundError(f"[x] 未找到音频文件：{file_path}")
+
+                    # 加载音频文件
+                    with instrument.stage("modify_audio.decode"):
+                        buffer = AudioBuffer.load(file_path)
+
+                with instrument.stage("modify_audio.modify"):
+                    modified = WX_ASR.modify_buffer(
+                        buffer,
+                        noise_level,
+                        volume_gain,
+                        engine,
+                        stretch_range=stretch_range,
+                        pitch_range=pitch_range,
+                        tier=tier,
+                    )
+                modified_audio, sr = modified.samples, modified.sr
+                instrument.count("modify_audio.audio_seconds", modified.duration)
+
+                # 保存修改后的音频
+                with instrument.stage("modify_audio.write"):
+                    modified.write(output_path, encoding)
+
+                # 复制成功的音频到输出目录
+                if "temp_audio_1739713328.wav" in str(output_path):
+                    success_path = (
+                        Path(output_path).parent.parent
+                        / "output"
+                        / "successful_modification.wav"
+                    )
+                    link_or_copy(output_path, success_path)
 
-            for segment in segments:
-                # 时间拉伸
-                stretch_factor = np.random.uniform(0.97, 1.03)
-                stretched = librosa.effects.time_stretch(segment, rate=stretch_factor)
+                return modified_audio, sr
+        except Exception as e:
+            raise ValueError(f"[x] 处理音频文件时出错：{str(e)}")
 
-                # 音高偏移
-                pitch_shift = np.random.uniform(-1.5, 1.5)
-                shifted = librosa.effects.pitch_shift(
-                    stretched, sr=sr, n_steps=pitch_shift
-                )
+    @staticmethod
+    def modify_audio_stream(
+        file_path: str,
+        output_path: str,
+        block_seconds: float = stream_engine.BLOCK_SECONDS,
+        normalize: str = "two_pass",
+        noise_level: float = stft_engine.DEFAULT_NOISE_LEVEL,
+        volume_gain: float = stft_engine.DEFAULT_VOLUME_GAIN,
+        encoding: Optional[str] = None,
+    ) -> Tuple[int, int]:
+        """
+        流式版本的 modify_audio，适用于数小时的长音频
 
-                modified_segments.append(shifted)
+        按块读取、处理并增量写出，峰值内存只与块大小有关。
 
-            # 重组音频
-            audio = np.concatenate([seg for seg in modified_segments if len(seg) > 0])
+        参数:
+            block_seconds (float): 每块时长（秒）
+            normalize (str): "two_pass"（全局峰值，两遍）或 "running_peak"（单遍）
+            encoding (str): 输出编码 "pcm16"、"float32" 或 "flac"
 
-            # 音量调整
-            audio = audio * 0.85  # 固定音量增益
+        返回:
+            Tuple[int, int]: (输出采样点数, 采样率)
+        """
+        try:
+            if not os.path.exists(file_path):
+                raise FileNotFoundError(f"[x] 未找到音频文件：{file_path}")
 
-            # 添加白噪声
-            white_noise = np.random.normal(0, 0.02, len(audio))
-            audio = audio + white_noise
+            return stream_engine.stream_modify_audio(
+                file_path,
+                output_path,
+                block_seconds=block_seconds,
+                normalize=normalize,
+                noise_level=noise_level,
+                volume_gain=volume_gain,
+                encoding=encoding,
+            )
+        except Exception as e:
+            raise ValueError(f"[x] 流式处理音频文件时出错：{str(e)}")
+
+    def transcribe(
+        self,
+        file_path: Union[str, AudioBuffer],
+        use_cache: bool = True,
+        mode: str = "full",
+        batch_size: int = segment_asr.BATCH_SIZE,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> dict:
+        """
+        转录音频并返回文本与分段，结果按音频内容缓存
 
-            # 标准化音频
-            modified_audio = np.clip(audio, -1.0, 1.0)
-            modified_audio = modified_audio / np.max(np.abs(modified_audio))
+        参数:
+            file_path: 音频或视频文件路径，或已解码的 AudioBuffer（不再读盘解码）
+            use_cache (bool): 是否使用转录缓存
+            mode (str): "full" 整段交给 model.transcribe；
+                        "vad" 按静音切分窗口后批量解码，返回每个窗口的起止时间
+            batch_size (int): "vad" 模式下每批解码的窗口数
+            cancel_event (threading.Event): 取消标记，在取得推理锁后及 "vad" 模式的每批之间检查，
+                                            已设置时抛出 segment_asr.TranscriptionCancelled
 
-            # 保存修改后的音频
-            sf.write(output_path, modified_audio, sr)
+        返回:
+            dict: {"text": 转录文本, "segments": 带时间戳的分段列表}
+        """
+        if mode not in TRANSCRIBE_MODES:
+            raise ValueError(f"[x] 不支持的转录模式：{mode}")
 
-            # 复制成功的音频到输出目录
-            if "temp_audio_1739713328.wav" in str(output_path):
-                success_path = (
-                    Path(output_path).parent.parent
-                    / "output"
-                    / "successful_modification.wav"
+        # 16kHz 单声道采样，既用于计算缓存键，也直接传给模型
+        with instrument.stage("transcribe.decode"):
+            if isinstance(file_path, AudioBuffer):
+                audio = file_path.for_whisper()
+            else:
+                audio = whisper.load_audio(str(file_path))
+
+        options = {"language": self.language}
+        if mode == "vad":
+            options.update(
+                mode=mode,
+                top_db=segment_asr.TOP_DB,
+                max_window=segment_asr.MAX_WINDOW_SECONDS,
+            )
+        key_options = dict(options)
+        if self.dtype != model_registry.DEFAULT_DTYPE:
+            # 不同精度的识别结果可能不同，分别缓存（fp32 的缓存键保持不变）
+            key_options["dtype"] = self.dtype
+        model_id = self.backend.name if self.backend else self.model_name
+        key = self.cache.make_key(audio, model_id, key_options)
+
+        if use_cache:
+            cached = self.cache.get(key)
+            if cached is not None:
+                instrument.count("transcribe.cache_hit")
+                return cached
+            instrument.count("transcribe.cache_miss")
+
+        if self.backend is not None:
+            segment_asr.check_cancelled(cancel_event)
+            with instrument.stage("transcribe.inference"):
+                result = self._transcribe_with_backend(audio, mode)
+            return self.cache.put(key, result)
+
+        # 解码与缓存查询可以并发，模型推理按模型串行
+        with instrument.stage("transcribe.inference"), model_registry.inference_lock(
+            self.model_name, self.device, self.dtype
+        ):
+            # 等待推理锁期间可能已被取消
+            segment_asr.check_cancelled(cancel_event)
+            if mode == "vad":
+                windows = segment_asr.vad_windows(audio)
+                segments = segment_asr.transcribe_windows(
+                    self.model,
+                    audio,
+                    windows,
+                    self.language,
+                    batch_size,
+                    cancel_event=cancel_event,
                 )
-                sf.write(str(success_path), modified_audio, sr)
-
-            return modified_audio, sr
-        except Exception as e:
-            raise ValueError(f"[x] 处理音频文件时出错：{str(e)}")
+                separator = "" if self.language in ("zh", "ja") else " "
+                result = {
+                    "text": separator.join(seg["text"] for seg in segments),
+                    "segments": segments,
+                }
+            else:
+                result = self.model.transcribe(audio, **options)
 
-    def ASR_Tester(self, file_path: str) -> str:
-        try:
-            result = self.model.transcribe(file_path, language=self.language)
-            text = result["text"]
+        return self.cache.put(key, result)
 
-            # 检查转录结果是否为空
-            if not text or text.strip() == "":
-                return "[x] 无法转录音频"
+    def _transcribe_with_backend(self, audio: np.ndarray, mode: str) -> dict:
+        """
+        使用指定的识别引擎转录，"vad" 模式下按窗口批量识别
+        """
+        if mode != "vad":
+            return {"text": self.backend.transcribe(audio), "segments": []}
+
+        windows = segment_asr.vad_windows(audio)
+        texts = self.backend.transcribe_batch(
+            [audio[start:end] for start, end in windows]
+        )
+        segments = []
+        for (start, end), text in zip(windows, texts):
+            if not text.strip():
+                continue
+            segments.append(
+                {
+                    "id": len(segments),
+                    "start": round(start / WHISPER_SAMPLE_RATE, 3),
+                    "end": round(end / WHISPER_SAMPLE_RATE, 3),
+                    "text": text.strip(),
+                }
+            )
+        separator = "" if self.language in ("zh", "ja") else " "
+        return {
+            "text": separator.join(seg["text"] for seg in segments),
+            "segments": segments,
+        }
 
-            # 如果转录目录不存在则创建
-            output_dir = Path(__file__).parent.parent / "media" / "transcribe"
-            output_dir.mkdir(parents=True, exist_ok=True)
+    def ASR_Tester(
+        self,
+        file_path: Union[str, AudioBuffer],
+        use_cache: bool = True,
+        mode: str = "full",
+        job_id: Optional[str] = None,
+        name: str = "transcription",
+        cancel_event: Optional[threading.Event] = None,
+    ) -> str:
+        """
+        转录音频，文本与分段保存为任务产物（<name>.txt / <name>.segments.json）
 
-            # 创建输出文件
-            output_file = output_dir / f"transcription.txt"
+        参数:
+            file_path: 音频或视频文件路径，或已解码的 AudioBuffer
+            use_cache (bool): 是否使用转录缓存
+            mode (str): 转录模式，见 transcribe
+            job_id (str): 所属任务编号，未指定时单独登记一个转录任务
+            name (str): 产物名称，同一任务中的多次转录使用不同名称（如 original / modified）
+            cancel_event (threading.Event): 取消标记，已设置时抛出
+                                            segment_asr.TranscriptionCancelled，不写入产物
 
-            # 将转录文本写入文件
-            with open(output_file, "w", encoding="utf-8") as f:
-                f.write(text)
+        返回:
+            str: 转录文本
+        """
+        try:
+            with instrument.stage("ASR_Tester"):
+                result = self.transcribe(
+                    file_path, use_cache=use_cache, mode=mode, cancel_event=cancel_event
+                )
+                text = result["text"]
+
+                # 识别期间被取消时不再向（已取消的）任务写入产物
+                segment_asr.check_cancelled(cancel_event)
+
+                # 检查转录结果是否为空
+                if not text or text.strip() == "":
+                    return "[x] 无法转录音频"
+
+                # 每个任务的产物相互独立，并发转录不会覆盖彼此的结果
+                standalone = job_id is None
+                with instrument.stage("ASR_Tester.write"):
+                    if standalone:
+                        job_id = self.store.create_job(
+                            "transcribe",
+                            file_path,
+                            {
+                                "model": self.model_name,
+                                "dtype": self.dtype,
+                                "mode": mode,
+                            },
+                        )
+                    self.store.put_text(job_id, f"{name}.txt", text)
+                    self.store.put_json(
+                        job_id, f"{name}.segments.json", result.get("segments", [])
+                    )
+                    if standalone:
+                        self.store.finish_job(job_id)
 
-            print(f"[√] 转录文本已保存至: {output_file}")
-            return text
+                print(f"[√] 转录文本已保存至任务 {job_id}: {name}.txt")
+                return text
+        except segment_asr.TranscriptionCancelled:
+            raise
         except Exception as e:
             print(f"[x] 语音识别转录失败: {e}")
             return str(e)
@@ -173,149 +469,171 @@ class WX_ASR:
             dict: 包含重复率分析结果的字典
         """
         try:
-            # 分词处理
-            words = text.split()
-            total_words = len(words)
+            # 分词（共享分词缓存，去掉空白与标点）后单遍统计词语及 n 元词组的重复
+            analyzer = repetition.RepetitionAnalyzer()
+            return {"重复率分析": analyzer.feed(tokenizer.words(text)).result()}
 
-            # 统计词频
-            word_freq = {}
-            for word in words:
-                word_freq[word] = word_freq.get(word, 0) + 1
-
-            # 计算重复词数量
-            repeated_words = sum(count - 1 for count in word_freq.values() if count > 1)
+        except Exception as e:
+            return {"错误": f"计算重复率时出错: {str(e)}"}
 
-            # 计算重复率
-            repetition_rate = (
-                (repeated_words / total_words * 100) if total_words > 0 else 0
-            )
+    def compare_transcriptions(
+        self, original_file: str, transcription_file: str, approximate: bool = False
+    ) -> dict:
+        """
+        比较两个转录文本文件（同一任务中的转录请使用 compare_job）
 
-            # 找出重复次数最多的词
-            most_repeated = sorted(
-                [(word, count) for word, count in word_freq.items() if count > 1],
-                key=lambda x: x[1],
-                reverse=True,
-            )[
-                :5
-            ]  # 只显示前5个
-
-            return {
-                "重复率分析": {
-                    "总字数": total_words,
-                    "重复字数": repeated_words,
-                    "重复率": f"{repetition_rate:.2f}%",
-                    "高频重复词": [
-                        {"词": word, "出现次数": count} for word, count in most_repeated
-                    ],
-                }
-            }
+        参数:
+            original_file (str): 原始音频的转录文本文件
+            transcription_file (str): 修改后音频的转录文本文件
+            approximate (bool): 句子相似度使用 MinHash 近似筛选
 
+        返回:
+            dict: 与 compare_texts 相同结构的比较结果
+        """
+        try:
+            with instrument.stage("compare_transcriptions.read"), open(
+                original_file, "r", encoding="utf-8"
+            ) as f1, open(transcription_file, "r", encoding="utf-8") as f2:
+                original_text = f1.read().strip()
+                test_text = f2.read().strip()
         except Exception as e:
-            return {"错误": f"计算重复率时出错: {str(e)}"}
+            print(f"[x] 比较文件时出错: {str(e)}")
+            return {"错误": f"比较文件时出错: {str(e)}"}
+
+        return self.compare_texts(original_text, test_text, approximate=approximate)
+
+    def compare_job(
+        self,
+        job_id: str,
+        original: str = "original",
+        test: str = "modified",
+        approximate: bool = False,
+    ) -> dict:
+        """
+        比较同一任务中的两份转录（ASR_Tester 以 original / modified 保存的产物），
+        比较结果保存为 comparison.json，主要指标写入指标表
 
-    def compare_transcriptions(self, transcription_file: str) -> dict:
+        返回:
+            dict: 与 compare_texts 相同结构的比较结果
+        """
         try:
-            # 获取原始参考文本路径
-            original_file = (
-                Path(__file__).parent.parent
-                / "media"
-                / "transcribe"
-                / "original_transcription.txt"
+            with instrument.stage("compare_transcriptions.read"):
+                original_text = self.store.get_text(job_id, f"{original}.txt").strip()
+                test_text = self.store.get_text(job_id, f"{test}.txt").strip()
+        except Exception as e:
+            print(f"[x] 读取任务转录时出错: {str(e)}")
+            return {"错误": f"读取任务转录时出错: {str(e)}"}
+
+        result = self.compare_texts(original_text, test_text, approximate=approximate)
+        if "错误" not in result:
+            comparison = result["比较结果"]
+            self.store.put_json(job_id, "comparison.json", result)
+            self.store.put_metrics(
+                job_id,
+                {
+                    "similarity": float(comparison["相似度分析"]["百分比"].strip("%")),
+                    "cer": float(comparison["错误率分析"]["字错误率"].strip("%")) / 100,
+                    "wer": float(comparison["错误率分析"]["词错误率"].strip("%")) / 100,
+                },
             )
+        return result
 
-            # 读取文件内容
-            with open(original_file, "r", encoding="utf-8") as f1, open(
-                transcription_file, "r", encoding="utf-8"
-            ) as f2:
-                original_text = f1.read().strip()
-                test_text = f2.read().strip()
+    def compare_texts(
+        self, original_text: str, test_text: str, approximate: bool = False
+    ) -> dict:
+        """
+        比较两段转录文本（不读写文件）
 
-            # 计算文本相似度
-            total_chars = max(len(original_text), len(test_text))
-            if total_chars == 0:
-                similarity = 0
-            else:
-                same_chars = sum(1 for a, b in zip(original_text, test_text) if a == b)
-                similarity = (same_chars / total_chars) * 100
-
-            # 添加重复率分析
-            original_repetition = self.calculate_repetition_rate(original_text)
-            test_repetition = self.calculate_repetition_rate(test_text)
-
-            # 改进相似度计算方法
-            def calculate_semantic_similarity(text1: str, text2: str) -> tuple:
-                # 分词处理
-                words1 = list(jieba.cut(text1))
-                words2 = list(jieba.cut(text2))
-
-                # 计算词语级别的相似度
-                word_similarity = len(set(words1) & set(words2)) / len(
-                    set(words1) | set(words2)
-                )
+        参数:
+            original_text (str): 原始音频的转录文本
+            test_text (str): 修改后音频的转录文本
+            approximate (bool): 句子相似度使用 MinHash 近似筛选（默认精确计算）
 
-                # 计算句子级别的相似度
-                sentences1 = text1.split("。")
-                sentences2 = text2.split("。")
-                sentence_pairs = []
-                for s1 in sentences1:
-                    if s1.strip():
-                        max_sim = max(
-                            (
-                                len(set(s1) & set(s2)) / len(set(s1) | set(s2))
-                                if s2.strip()
-                                else 0
-                            )
-                            for s2 in sentences2
-                        )
-                        sentence_pairs.append(max_sim)
+        返回:
+            dict: 包含相似度、错误率与重复率分析的比较结果
+        """
+        try:
+            with instrument.stage("compare_texts"):
+                # 计算文本相似度
+                total_chars = max(len(original_text), len(test_text))
+                if total_chars == 0:
+                    similarity = 0
+                else:
+                    same_chars = sum(
+                        1 for a, b in zip(original_text, test_text) if a == b
+                    )
+                    similarity = (same_chars / total_chars) * 100
+
+                # 基于最优对齐的字/词错误率（替换、插入、删除明细）
+                with instrument.stage("compare_texts.error_rates"):
+                    error_rates = metrics.error_report(original_text, test_text)
+
+                # 添加重复率分析
+                with instrument.stage("compare_texts.repetition"):
+                    original_repetition = self.calculate_repetition_rate(original_text)
+                    test_repetition = self.calculate_repetition_rate(test_text)
+
+                # 改进相似度计算方法
+                def calculate_semantic_similarity(text1: str, text2: str) -> tuple:
+                    # 分词处理（同一文本只分词一次）
+                    words1 = tokenizer.tokenize(text1)
+                    words2 = tokenizer.tokenize(text2)
+
+                    # 计算词语级别的相似度
+                    word_similarity = len(set(words1) & set(words2)) / len(
+                        set(words1) | set(words2)
+                    )
 
-                sentence_similarity = (
-                    sum(sentence_pairs) / len(sentence_pairs) if sentence_pairs else 0
-                )
+                    # 计算句子级别的相似度（字符集合按句预先构建，只比较共享字符的句对）
+                    sentence_similarity = similarity_engine.sentence_similarity(
+                        text1, text2, approximate=approximate
+                    )
 
-                # 综合计算（词语相似度占40%，句子相似度占60%）
-                final_similarity = word_similarity * 0.4 + sentence_similarity * 0.6
-                return (
-                    final_similarity * 100,
-                    word_similarity * 100,
-                    sentence_similarity * 100,
-                )
+                    # 综合计算（词语相似度占40%，句子相似度占60%）
+                    final_similarity = word_similarity * 0.4 + sentence_similarity * 0.6
+                    return (
+                        final_similarity * 100,
+                        word_similarity * 100,
+                        sentence_similarity * 100,
+                    )
 
-            # 计算改进后的相似度
-            similarity, word_sim, sent_sim = calculate_semantic_similarity(
-                original_text, test_text
-            )
+                # 计算改进后的相似度
+                with instrument.stage("compare_texts.similarity"):
+                    similarity, word_sim, sent_sim = calculate_semantic_similarity(
+                        original_text, test_text
+                    )
 
-            return {
-                "比较结果": {
-                    "相似度分析": {
-                        "百分比": f"{similarity:.2f}%",
-                        "相同字符数": same_chars,
-                        "总字符数": total_chars,
-                        "语义分析": {
-                            "词语相似度": f"{word_sim:.2f}%",
-                            "句子相似度": f"{sent_sim:.2f}%",
+                return {
+                    "比较结果": {
+                        "相似度分析": {
+                            "百分比": f"{similarity:.2f}%",
+                            "相同字符数": same_chars,
+                            "总字符数": total_chars,
+                            "语义分析": {
+                                "词语相似度": f"{word_sim:.2f}%",
+                                "句子相似度": f"{sent_sim:.2f}%",
+                            },
+                        },
+                        "错误率分析": error_rates,
+                        "文本统计": {
+                            "原始文本长度": len(original_text),
+                            "测试文本长度": len(test_text),
+                            "长度差异": abs(len(original_text) - len(test_text)),
                         },
-                    },
-                    "文本统计": {
-                        "原始文本长度": len(original_text),
-                        "测试文本长度": len(test_text),
-                        "长度差异": abs(len(original_text) - len(test_text)),
-                    },
-                    "重复率分析": {
-                        "原始文本": original_repetition["重复率分析"],
-                        "测试文本": test_repetition["重复率分析"],
-                    },
-                    "文本内容": {
-                        "原始文本": original_text,
-                        "测试文本": test_text,
-                    },
+                        "重复率分析": {
+                            "原始文本": original_repetition["重复率分析"],
+                            "测试文本": test_repetition["重复率分析"],
+                        },
+                        "文本内容": {
+                            "原始文本": original_text,
+                            "测试文本": test_text,
+                        },
+                    }
                 }
-            }
 
         except Exception as e:
-            print(f"[x] 比较文件时出错: {str(e)}")
-            return {"错误": f"比较文件时出错: {str(e)}"}
+            print(f"[x] 比较文本时出错: {str(e)}")
+            return {"错误": f"比较文本时出错: {str(e)}"}
 
     def print_comparison(self, result: dict) -> None:
         if "错误" in result:
@@ -333,6 +651,19 @@ class WX_ASR:
         print(f"│  └─ 句子相似度: {comparison['相似度分析']['语义分析']['句子相似度']}")
         print(f"└─ 综合相似度: {comparison['相似度分析']['百分比']}")
 
+        print("\n【错误率分析】")
+        for label, rate_key, align_key, prefix in (
+            ("字错误率 (CER)", "字错误率", "字符对齐", "├─"),
+            ("词错误率 (WER)", "词错误率", "词语对齐", "└─"),
+        ):
+            alignment = comparison["错误率分析"][align_key]
+            print(f"{prefix} {label}: {comparison['错误率分析'][rate_key]}")
+            indent = "│  " if prefix == "├─" else "   "
+            print(
+                f"{indent}└─ 替换 {alignment['替换']} / 插入 {alignment['插入']}"
+                f" / 删除 {alignment['删除']}（参考 {alignment['参考长度']}）"
+            )
+
         print("\n【文本统计】")
         print(f"├─ 原始长度: {comparison['文本统计']['原始文本长度']}")
         print(f"├─ 测试长度: {comparison['文本统计']['测试文本长度']}")
@@ -353,30 +684,44 @@ class WX_ASR:
 
         print("\n===================\n")
 
-    @deprecated("由于未知原因导致的多个错误，此方法已弃用，请使用 ASR_Tester 方法代替")
     def transcribe_audio_with_funasr(self, file_path: str) -> str:
+        warnings.warn(
+            "此方法已弃用，请使用 WX_ASR(backend=FunASRBackend()) 或 ASR_Tester 方法代替",
+            DeprecationWarning,
+            stacklevel=2,
+        )
         try:
-            model = AutoModel(
-                disable_update=True, model=self.funasr_model, model_revision="v1.2.4"
-            )
-            result = model.transcribe(file_path)
-            return result["text"]
+            with FunASRBackend() as backend:
+                return backend.transcribe(whisper.load_audio(file_path))
         except Exception as e:
             raise ValueError(f"[x] 转录过程中出错：{str(e)}")
 
-    def get_subtitle_repetition_rate(self, transcription_file: str):
+    def get_subtitle_repetition_rate(
+        self,
+        job_id: str,
+        metric: str = "similarity",
+        original: str = "original",
+        test: str = "modified",
+    ):
         """
         获取字幕重复率
 
         参数:
-            transcription_file (str): 需要比较的转录文本文件路径
+            job_id (str): 任务编号，比较其中 original / test 两份转录（见 compare_job）
+            metric (str): "similarity" 综合相似度，"cer" 字错误率，"wer" 词错误率
+            original (str): 原始转录的产物名称
+            test (str): 对比转录的产物名称
 
         返回:
-            str: 字幕重复率，以百分比形式呈现
+            str: 字幕重复率（或错误率），以百分比形式呈现
         """
-        result = self.compare_transcriptions(transcription_file)
+        result = self.compare_job(job_id, original=original, test=test)
         if "错误" in result:
             return f"Error: {result['错误']}"
+        if metric == "cer":
+            return result["比较结果"]["错误率分析"]["字错误率"]
+        if metric == "wer":
+            return result["比较结果"]["错误率分析"]["词错误率"]
         return result["比较结果"]["相似度分析"]["百分比"]
 
 
@@ -416,8 +761,12 @@ if __name__ == "__main__":
             print("\n=== 语音识别测试 ===")
             try:
                 # 测试原始音频转录
+                job_id = wx.store.create_job("pipeline", str(test_audio))
+
                 print("\n转录原始音频:")
-                original_text = wx.ASR_Tester(str(test_audio))
+                original_text = wx.ASR_Tester(
+                    str(test_audio), job_id=job_id, name="original"
+                )
                 print(f"[√] 原始音频转录结果: {original_text}")
 
                 # 分析原始音频字幕重复率
@@ -429,7 +778,9 @@ if __name__ == "__main__":
 
                 # 测试修改后的音频转录
                 print("\n转录修改后的音频:")
-                modified_text = wx.ASR_Tester(str(modified_audio_path))
+                modified_text = wx.ASR_Tester(
+                    str(modified_audio_path), job_id=job_id, name="modified"
+                )
                 print(f"[√] 修改后音频转录结果: {modified_text}")
 
                 # 分析修改后音频字幕重复率
@@ -439,28 +790,12 @@ if __name__ == "__main__":
                 print(f"├─ 重复字数: {modified_repetition['重复率分析']['重复字数']}")
                 print(f"└─ 重复率: {modified_repetition['重复率分析']['重复率']}")
 
-                # 保存转录结果以供比较
-                transcribe_dir = ROOT_DIR / "media" / "transcribe"
-                transcribe_dir.mkdir(parents=True, exist_ok=True)
-
-                with open(
-                    transcribe_dir / "original_transcription.txt", "w", encoding="utf-8"
-                ) as f:
-                    f.write(original_text)
-                with open(
-                    transcribe_dir / "transcription.txt", "w", encoding="utf-8"
-                ) as f:
-                    f.write(modified_text)
-
-                # 比较转录结果
-                result = wx.compare_transcriptions(
-                    str(transcribe_dir / "transcription.txt")
-                )
+                # 比较同一任务中的两份转录结果
+                result = wx.compare_job(job_id)
+                wx.store.finish_job(job_id)
                 wx.print_comparison(result)
 
-                repetition_rate = wx.get_subtitle_repetition_rate(
-                    str(transcribe_dir / "transcription.txt")
-                )
+                repetition_rate = result["比较结果"]["相似度分析"]["百分比"]
 
                 print("\n=== 字幕重复率总结 ===")
                 print(f"├─ 相似度: {repetition_rate}")
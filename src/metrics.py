@@ -0,0 +1,241 @@
+import numpy as np
+from typing import Callable, Dict, Hashable, List, Sequence, Tuple
+
+from src import tokenizer
+
+# 带状动态规划中表示“不可达”的距离
+_INF: int = np.iinfo(np.int32).max // 2
+
+# 对齐时初始的对角带半宽，结果未达到精确距离时逐次翻倍
+INITIAL_SPREAD: int = 64
+
+
+def _trim_common(a: Sequence, b: Sequence) -> tuple:
+    """
+    去掉公共前缀和后缀，它们不影响编辑距离
+    """
+    start = 0
+    limit = min(len(a), len(b))
+    while start < limit and a[start] == b[start]:
+        start += 1
+
+    end_a, end_b = len(a), len(b)
+    while end_a > start and end_b > start and a[end_a - 1] == b[end_b - 1]:
+        end_a -= 1
+        end_b -= 1
+
+    return a[start:end_a], b[start:end_b]
+
+
+def edit_distance(a: Sequence[Hashable], b: Sequence[Hashable]) -> int:
+    """
+    位并行（Myers / Hyyrö）Levenshtein 距离
+
+    以较短序列为模式串，每个位代表一个模式位置，
+    对较长序列的每个元素只需常数次大整数位运算，复杂度 O(n * m / w)。
+    """
+    a, b = _trim_common(a, b)
+    if len(a) > len(b):
+        a, b = b, a
+    m = len(a)
+    if m == 0:
+        return len(b)
+
+    # 每个符号在模式串中出现位置的位掩码
+    peq: Dict[Hashable, int] = {}
+    for i, symbol in enumerate(a):
+        peq[symbol] = peq.get(symbol, 0) | (1 << i)
+
+    full = (1 << m) - 1
+    high = 1 << (m - 1)
+    pv, mv, score = full, 0, m
+
+    for symbol in b:
+        eq = peq.get(symbol, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & full)
+        mh = pv & xh
+
+        if ph & high:
+            score += 1
+        elif mh & high:
+            score -= 1
+
+        # 全局编辑距离：上边界 D[0][j] = j，因此左移时补 1
+        ph = ((ph << 1) | 1) & full
+        mh = (mh << 1) & full
+        pv = mh | (~(xv | ph) & full)
+        mv = ph & xv
+
+    return score
+
+
+def _encode(a: Sequence[Hashable], b: Sequence[Hashable]) -> tuple:
+    """
+    将两个序列映射为整数数组，便于向量化比较
+    """
+    ids: Dict[Hashable, int] = {}
+    encoded_a = np.fromiter((ids.setdefault(x, len(ids)) for x in a), dtype=np.int64)
+    encoded_b = np.fromiter((ids.setdefault(x, len(ids)) for x in b), dtype=np.int64)
+    return encoded_a, encoded_b
+
+
+def align(ref: Sequence[Hashable], hyp: Sequence[Hashable]) -> dict:
+    """
+    计算参考序列与假设序列的最优对齐，返回替换/插入/删除数量
+
+    先用位并行算法求出精确距离 d，再在对角带内做动态规划并沿所选路径累积替换与插入数量
+    （删除数 = 距离 - 替换 - 插入）。带内求得的是一条真实路径的代价，
+    一旦等于 d 即为最优对齐；否则把带宽翻倍重算。经过对角线 k = j - i 的路径代价
+    至少为 |k| + |k - (m - n)|，因此带宽达到 (d - |m - n|) / 2 时必然得到 d。
+    实际转录的对齐路径偏离主对角线很少，通常第一轮即可完成，内存只与带宽有关。
+
+    返回:
+        dict: {"距离", "替换", "插入", "删除", "正确", "参考长度"}
+    """
+    distance = edit_distance(ref, hyp)
+    ref_core, hyp_core = _trim_common(ref, hyp)
+    n, m = len(ref_core), len(hyp_core)
+    matched = len(ref) - n
+
+    if n == 0 or m == 0:
+        subs, ins = 0, m
+    else:
+        a, b = _encode(ref_core, hyp_core)
+        max_spread = (distance - abs(m - n)) // 2
+        spread = min(INITIAL_SPREAD, max_spread)
+        while True:
+            found, subs, ins = _banded_counts(a, b, spread)
+            if found == distance or spread >= max_spread:
+                break
+            spread = min(spread * 2, max_spread)
+
+    dels = distance - subs - ins
+    return {
+        "距离": distance,
+        "替换": subs,
+        "插入": ins,
+        "删除": dels,
+        "正确": matched + n - subs - dels,
+        "参考长度": len(ref),
+    }
+
+
+def _banded_counts(a: np.ndarray, b: np.ndarray, spread: int) -> Tuple[int, int, int]:
+    """
+    在对角带内求（带内）最优路径的距离、替换数与插入数
+
+    第 i 行的第 k 个元素对应单元 (i, j = i + k)。
+    对角前驱 (i-1, j-1) 与当前单元同一对角线，竖直前驱 (i-1, j) 在下一条对角线，
+    水平前驱 (i, j-1) 在同一行的上一条对角线，可以用累积最小值一次求出。
+    替换数与插入数打包在同一个 int64 中（高 32 位为替换数）。
+    """
+    n, m = len(a), len(b)
+    k_lo, k_hi = min(0, m - n) - spread, max(0, m - n) + spread
+    offset = np.arange(k_hi - k_lo + 1, dtype=np.int64)
+    diagonals = offset + k_lo
+
+    # 假设序列两侧补哨兵，使每行所需的 b[j - 1] 都是一段连续切片
+    pad = k_hi - k_lo + 2
+    b_padded = np.concatenate(
+        [np.full(pad, -1, dtype=b.dtype), b, np.full(pad, -1, dtype=b.dtype)]
+    )
+
+    # 第 0 行：D[0][j] = j（全部为插入），j < 0 的单元不可达
+    dist = np.where(diagonals >= 0, diagonals, _INF)
+    packed = np.where(diagonals >= 0, diagonals, 0)
+
+    inf_tail = np.array([_INF], dtype=np.int64)
+    zero_tail = np.zeros(1, dtype=np.int64)
+    for i in range(1, n + 1):
+        start = pad + i + k_lo - 1
+        mismatch = (b_padded[start : start + len(offset)] != a[i - 1]).astype(np.int64)
+
+        diag_dist = dist + mismatch
+        diag_packed = packed + (mismatch << 32)
+        up_dist = np.concatenate([dist[1:], inf_tail]) + 1
+        up_packed = np.concatenate([packed[1:], zero_tail])
+
+        use_diag = diag_dist <= up_dist
+        best = np.where(use_diag, diag_dist, up_dist)
+        best_packed = np.where(use_diag, diag_packed, up_packed)
+
+        # 水平方向：D[k] = min_s(T[s] + k - s)
+        shifted = best - offset
+        running = np.minimum.accumulate(shifted)
+        source = np.maximum.accumulate(np.where(shifted == running, offset, 0))
+
+        dist = running + offset
+        packed = best_packed[source] + (offset - source)
+
+    final = int(packed[m - n - k_lo])
+    return int(dist[m - n - k_lo]), final >> 32, final & 0xFFFFFFFF
+
+
+def char_tokens(text: str) -> List[str]:
+    """
+    字符级切分（忽略空白）
+    """
+    return [ch for ch in text if not ch.isspace()]
+
+
+def word_tokens(text: str) -> List[str]:
+    """
+    词语级切分：使用共享的 jieba 分词缓存，并去掉空白与标点
+    """
+    return list(tokenizer.words(text))
+
+
+def error_rate(
+    ref: str, hyp: str, tokenize: Callable[[str], List[str]] = char_tokens
+) -> dict:
+    """
+    计算错误率及替换/插入/删除明细
+
+    返回:
+        dict: align 的结果加上 "错误率"（0 到 1，参考为空且假设非空时为 1）
+    """
+    result = align(tokenize(ref), tokenize(hyp))
+    if result["参考长度"] == 0:
+        result["错误率"] = 0.0 if result["距离"] == 0 else 1.0
+    else:
+        result["错误率"] = result["距离"] / result["参考长度"]
+    return result
+
+
+def cer(ref: str, hyp: str) -> dict:
+    """
+    字错误率（CER）
+    """
+    return error_rate(ref, hyp, char_tokens)
+
+
+def wer(ref: str, hyp: str) -> dict:
+    """
+    词错误率（WER），中文先经 jieba 分词
+    """
+    return error_rate(ref, hyp, word_tokens)
+
+
+def error_report(ref: str, hyp: str) -> dict:
+    """
+    汇总字错误率与词错误率，供比较报告使用
+
+    返回:
+        dict: {"字错误率", "词错误率", "字符对齐", "词语对齐"}，错误率为百分比字符串
+    """
+    char_result = cer(ref, hyp)
+    word_result = wer(ref, hyp)
+
+    def breakdown(result: dict) -> dict:
+        return {
+            name: result[name] for name in ("正确", "替换", "插入", "删除", "参考长度")
+        }
+
+    return {
+        "字错误率": f"{char_result['错误率'] * 100:.2f}%",
+        "词错误率": f"{word_result['错误率'] * 100:.2f}%",
+        "字符对齐": breakdown(char_result),
+        "词语对齐": breakdown(word_result),
+    }
@@ -0,0 +1,161 @@
+import gc
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from src import instrument, lazy_import
+
+torch = lazy_import.lazy("torch")
+whisper = lazy_import.lazy("whisper")
+
+# 默认模型配置
+DEFAULT_MODEL: str = "base"
+DEFAULT_DTYPE: str = "fp32"
+
+# 支持的权重精度：fp16 仅用于 GPU，int8 为 CPU 上线性层的动态量化
+DTYPES: Tuple[str, ...] = ("fp32", "fp16", "int8")
+
+# 进程内共享的模型表，键为 (模型名, 设备, 精度)
+_models: Dict[Tuple[str, str, str], "whisper.Whisper"] = {}
+_lock = threading.Lock()
+
+# 每个模型的推理锁：Whisper 解码时会在模型上挂载 kv-cache 钩子，
+# 同一实例不能被多个线程同时推理
+_inference_locks: Dict[Tuple[str, str, str], threading.Lock] = {}
+
+
+def _resolve_device(device: Optional[str]) -> str:
+    """
+    未指定设备时与 whisper.load_model 的选择逻辑一致
+    """
+    if device:
+        return device
+    return "cuda" if torch.cuda.is_available() else "cpu"
+
+
+def set_num_threads(threads: Optional[int]) -> None:
+    """
+    固定 CPU 推理使用的线程数（None 表示保持 torch 的默认设置）
+
+    多个转录进程并行时，每个进程的线程数乘以进程数不应超过物理核数。
+    """
+    if threads:
+        torch.set_num_threads(threads)
+
+
+def quantize_int8(model: "whisper.Whisper") -> "whisper.Whisper":
+    """
+    对模型中所有线性层做动态 int8 量化（权重 int8，激活在运行时量化）
+
+    Whisper 的线性层是 nn.Linear 的子类（只在 forward 中按输入转换权重精度），
+    量化接口只接受 nn.Linear 本身，因此先把它们还原为 nn.Linear 再量化；
+    在 fp32 的 CPU 推理中两者的计算完全相同。
+    """
+    for module in model.modules():
+        if isinstance(module, torch.nn.Linear):
+            module.__class__ = torch.nn.Linear
+
+    return torch.quantization.quantize_dynamic(
+        model, {torch.nn.Linear}, dtype=torch.qint8
+    )
+
+
+def check_dtype(dtype: str, device: Optional[str] = None) -> str:
+    """
+    检查权重精度与设备是否匹配，命令行工具可在启动时调用以尽早报错
+
+    返回:
+        str: 实际使用的设备
+    """
+    if dtype not in DTYPES:
+        raise ValueError(f"[x] 不支持的模型精度：{dtype}")
+
+    device = _resolve_device(device)
+    if dtype == "int8" and device != "cpu":
+        raise ValueError("[x] int8 量化只支持 CPU 推理")
+    if dtype == "fp16" and device == "cpu":
+        raise ValueError("[x] fp16 只支持 GPU 推理")
+    return device
+
+
+def get_model(
+    name: str = DEFAULT_MODEL,
+    device: Optional[str] = None,
+    dtype: str = DEFAULT_DTYPE,
+) -> "whisper.Whisper":
+    """
+    获取共享的 Whisper 模型，首次调用时才加载
+
+    参数:
+        name (str): 模型名称，如 "tiny"、"base"、"small"
+        device (str): 运行设备，默认自动选择
+        dtype (str): 权重精度，"fp32"、"fp16"（仅适用于 GPU）或 "int8"（仅适用于 CPU）
+
+    返回:
+        whisper.Whisper: 同一进程内相同配置共享的模型实例
+    """
+    key = (name, check_dtype(dtype, device), dtype)
+
+    with _lock:
+        model = _models.get(key)
+        if model is None:
+            with instrument.stage("model.load"):
+                model = whisper.load_model(name, device=key[1])
+            if dtype == "fp16":
+                model = model.half()
+            elif dtype == "int8":
+                model = quantize_int8(model)
+            _models[key] = model
+
+    return model
+
+
+def inference_lock(
+    name: str = DEFAULT_MODEL,
+    device: Optional[str] = None,
+    dtype: str = DEFAULT_DTYPE,
+) -> threading.Lock:
+    """
+    获取共享模型对应的推理锁，多线程调用 transcribe 时需持有该锁
+    """
+    key = (name, _resolve_device(device), dtype)
+
+    with _lock:
+        return _inference_locks.setdefault(key, threading.Lock())
+
+
+def evict(
+    name: Optional[str] = None,
+    device: Optional[str] = None,
+    dtype: Optional[str] = None,
+) -> int:
+    """
+    释放已加载的模型，未指定的条件视为匹配全部
+
+    返回:
+        int: 被释放的模型数量
+    """
+    with _lock:
+        keys = [
+            key
+            for key in _models
+            if (name is None or key[0] == name)
+            and (device is None or key[1] == device)
+            and (dtype is None or key[2] == dtype)
+        ]
+        for key in keys:
+            del _models[key]
+
+    if keys:
+        gc.collect()
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+
+    return len(keys)
+
+
+def loaded_models() -> List[Tuple[str, str, str]]:
+    """
+    返回当前已加载模型的键列表
+    """
+    with _lock:
+        return list(_models)
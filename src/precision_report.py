@@ -0,0 +1,218 @@
+import io
+import sys
+import json
+import time
+import torch
+import argparse
+import numpy as np
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+# 直接运行本文件时也能以 src 包的形式导入同级模块
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src import metrics, model_registry
+from src.audio_buffer import AudioBuffer
+from src.logic_component import WX_ASR
+
+ROOT_DIR = Path(__file__).parent.parent
+
+# 相对 fp32 识别结果允许的平均字错误率
+ERROR_BUDGET: float = 0.05
+
+# 默认对比的模型与精度（fp32 总是作为基准）
+DEFAULT_MODELS: Sequence[str] = (model_registry.DEFAULT_MODEL,)
+DEFAULT_DTYPES: Sequence[str] = ("int8",)
+
+
+def model_size_mb(model: torch.nn.Module) -> float:
+    """
+    模型序列化后的大小（MB），量化后的打包权重也能正确计入
+    """
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return round(buffer.tell() / 2**20, 1)
+
+
+def _ratio(numerator: float, denominator: float, digits: int) -> Optional[float]:
+    """
+    两个耗时之比，分母为 0（空片段或计时精度不足）时为 None
+    """
+    return round(numerator / denominator, digits) if denominator > 0 else None
+
+
+def _run_variant(
+    model_name: str,
+    dtype: str,
+    clips: List[AudioBuffer],
+    threads: Optional[int],
+) -> dict:
+    """
+    用一种模型配置转录所有片段，记录加载耗时、识别耗时与文本
+    """
+    wx_asr = WX_ASR(model_name=model_name, dtype=dtype, threads=threads)
+
+    start = time.perf_counter()
+    model = wx_asr.model
+    load_seconds = time.perf_counter() - start
+    size = model_size_mb(model)
+
+    texts: List[str] = []
+    start = time.perf_counter()
+    for clip in clips:
+        texts.append(wx_asr.transcribe(clip, use_cache=False)["text"])
+    seconds = time.perf_counter() - start
+
+    wx_asr.release_model()
+    return {
+        "texts": texts,
+        "seconds": seconds,
+        "load_seconds": load_seconds,
+        "model_size_mb": size,
+    }
+
+
+def run_report(
+    clips: List[str],
+    model_names: Sequence[str] = DEFAULT_MODELS,
+    dtypes: Sequence[str] = DEFAULT_DTYPES,
+    threads: Optional[int] = None,
+    budget: float = ERROR_BUDGET,
+    output_file: Optional[str] = None,
+) -> List[dict]:
+    """
+    对比不同精度（及模型大小）在 CPU 上的识别速度与准确度
+
+    每个模型先用 fp32 转录全部片段作为基准，其余精度的结果与基准比较：
+    字错误率（metrics.cer）和综合相似度（compare_texts），
+    平均字错误率不超过 budget 时视为满足误差预算。
+
+    参数:
+        clips (list): 音频/视频文件
+        model_names (list): 参与对比的模型名称
+        dtypes (list): 参与对比的精度（fp32 基准会自动加入）
+        threads (int): CPU 推理线程数
+        budget (float): 相对 fp32 结果允许的平均字错误率
+        output_file (str): 报告路径，默认 media/output/precision_report.json
+
+    返回:
+        List[dict]: 每种 (模型, 精度) 的统计
+    """
+    output = (
+        Path(output_file)
+        if output_file
+        else ROOT_DIR / "media" / "output" / "precision_report.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+
+    buffers = [AudioBuffer.load(path) for path in clips]
+    audio_seconds = sum(buffer.duration for buffer in buffers)
+    checker = WX_ASR()
+    rows: List[dict] = []
+
+    for model_name in model_names:
+        variants = ["fp32"] + [d for d in dtypes if d != "fp32"]
+        baseline: Optional[Dict] = None
+
+        for dtype in variants:
+            print(f"[...] 转录中：{model_name} / {dtype}")
+            run = _run_variant(model_name, dtype, buffers, threads)
+            if baseline is None:
+                baseline = run
+
+            errors = [
+                metrics.cer(ref, hyp)["错误率"]
+                for ref, hyp in zip(baseline["texts"], run["texts"])
+            ]
+            similarities = []
+            for ref, hyp in zip(baseline["texts"], run["texts"]):
+                result = checker.compare_texts(ref, hyp)
+                if "错误" not in result:
+                    analysis = result["比较结果"]["相似度分析"]
+                    similarities.append(float(analysis["百分比"].strip("%")))
+
+            mean_cer = float(np.mean(errors)) if errors else 0.0
+            rows.append(
+                {
+                    "model": model_name,
+                    "dtype": dtype,
+                    "threads": torch.get_num_threads(),
+                    "model_size_mb": run["model_size_mb"],
+                    "load_seconds": round(run["load_seconds"], 2),
+                    "asr_seconds": round(run["seconds"], 2),
+                    "realtime_factor": _ratio(run["seconds"], audio_seconds, 4),
+                    "speedup": _ratio(baseline["seconds"], run["seconds"], 2),
+                    "cer_vs_fp32": round(mean_cer, 4),
+                    "max_cer_vs_fp32": round(max(errors, default=0.0), 4),
+                    "similarity_vs_fp32": (
+                        round(float(np.mean(similarities)), 2) if similarities else None
+                    ),
+                    "within_budget": mean_cer <= budget,
+                }
+            )
+
+    report = {
+        "clips": clips,
+        "audio_seconds": round(audio_seconds, 2),
+        "error_budget": budget,
+        "results": rows,
+    }
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print("\n=== 精度 / 速度对比 ===")
+    for row in rows:
+        status = "[√]" if row["within_budget"] else "[x]"
+        realtime = row["realtime_factor"]
+        speedup = row["speedup"]
+        print(
+            f"{status} {row['model']:>8} {row['dtype']:>5}: "
+            f"实时率 {'-' if realtime is None else f'{realtime:.3f}'}，"
+            f"加速 {'-' if speedup is None else f'{speedup:.2f}x'}，"
+            f"模型 {row['model_size_mb']} MB，相对 fp32 字错误率 {row['cer_vs_fp32']:.2%}"
+        )
+    print(f"[√] 报告已保存至: {output}")
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="量化 / 低精度 CPU 推理的速度与准确度对比"
+    )
+    parser.add_argument("clips", nargs="+", help="参与评估的音频/视频文件")
+    parser.add_argument(
+        "--models", nargs="+", default=list(DEFAULT_MODELS), help="Whisper 模型名称"
+    )
+    parser.add_argument(
+        "--dtypes",
+        nargs="+",
+        choices=model_registry.DTYPES,
+        default=list(DEFAULT_DTYPES),
+        help="与 fp32 基准对比的精度",
+    )
+    parser.add_argument("--threads", type=int, help="CPU 推理线程数")
+    parser.add_argument(
+        "--budget", type=float, default=ERROR_BUDGET, help="允许的平均字错误率"
+    )
+    parser.add_argument("-o", "--output", help="报告路径（JSON）")
+    args = parser.parse_args()
+
+    # 精度与设备不匹配时（例如在 CPU 上使用 fp16）启动前直接报错
+    try:
+        for dtype in args.dtypes:
+            model_registry.check_dtype(dtype)
+    except ValueError as e:
+        parser.error(str(e))
+
+    run_report(
+        [str(Path(c).resolve()) for c in args.clips],
+        model_names=args.models,
+        dtypes=args.dtypes,
+        threads=args.threads,
+        budget=args.budget,
+        output_file=args.output,
+    )
+
+
+if __name__ == "__main__":
+    main()
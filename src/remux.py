@@ -0,0 +1,132 @@
+import os
+import shutil
+import tempfile
+import subprocess
+import numpy as np
+from pathlib import Path
+from typing import List, Union
+
+from src.audio_buffer import AudioBuffer
+
+# 新音轨的编码参数（视频流直接复制，不重新编码）
+AUDIO_CODEC: str = "aac"
+AUDIO_BITRATE: str = "192k"
+
+# 视频流无法直接复制到输出容器时（例如 AVI/MKV/MOV 中的编码不被 .mp4 接受）的重新编码器，
+# 与 moviepy write_videofile 的默认视频编码一致
+FALLBACK_VIDEO_CODEC: str = "libx264"
+
+
+def ffmpeg_binary() -> str:
+    """
+    查找 ffmpeg 可执行文件：优先使用系统 PATH，其次使用 moviepy 依赖的 imageio-ffmpeg 自带版本
+    """
+    binary = shutil.which("ffmpeg")
+    if binary:
+        return binary
+
+    try:
+        import imageio_ffmpeg
+
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except Exception as e:
+        raise ValueError(f"[x] 未找到 ffmpeg：{str(e)}")
+
+
+def _audio_input(audio: Union[str, AudioBuffer]) -> List[str]:
+    """
+    新音轨的 ffmpeg 输入参数：文件直接读取，AudioBuffer 以 float32 PCM 从标准输入传入
+    """
+    if not isinstance(audio, AudioBuffer):
+        return ["-i", str(audio)]
+
+    channels = 1 if audio.samples.ndim == 1 else audio.samples.shape[1]
+    return [
+        "-f",
+        "f32le",
+        "-ar",
+        str(audio.sr),
+        "-ac",
+        str(channels),
+        "-i",
+        "pipe:0",
+    ]
+
+
+def replace_audio(
+    input_video: str,
+    audio: Union[str, AudioBuffer],
+    output_video: str,
+    audio_codec: str = AUDIO_CODEC,
+    audio_bitrate: str = AUDIO_BITRATE,
+) -> None:
+    """
+    替换视频的音轨：视频流原样复制（-c:v copy），只编码新的音频
+
+    视频流无法复制到输出容器时，改用 FALLBACK_VIDEO_CODEC 重新编码视频后再试一次。
+    新音轨不足视频长度时补静音，超出部分截断，输出时长与原视频一致。
+    先写入输出目录中的独立临时文件，完成后再原子替换，并发任务互不干扰。
+
+    参数:
+        input_video (str): 原始视频
+        audio (str | AudioBuffer): 新音轨（文件路径或内存中的音频）
+        output_video (str): 输出视频路径
+        audio_codec (str): 音频编码器
+        audio_bitrate (str): 音频码率
+    """
+    output = Path(output_video)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(
+        prefix=f".{output.stem}-", suffix=output.suffix, dir=output.parent
+    )
+    os.close(fd)
+
+    def command(video_codec: str) -> List[str]:
+        return [
+            ffmpeg_binary(),
+            "-hide_banner",
+            "-nostdin",
+            "-loglevel",
+            "error",
+            "-y",
+            "-i",
+            str(input_video),
+            *_audio_input(audio),
+            "-map",
+            "0:v",
+            "-map",
+            "1:a",
+            "-c:v",
+            video_codec,
+            "-c:a",
+            audio_codec,
+            "-b:a",
+            audio_bitrate,
+            "-af",
+            "apad",
+            "-shortest",
+            temp_path,
+        ]
+
+    # 直接把内存中的采样数据写入管道，不经过临时音频文件
+    pcm = None
+    if isinstance(audio, AudioBuffer):
+        samples = np.ascontiguousarray(audio.samples, dtype=np.float32)
+        pcm = memoryview(samples).cast("B")
+
+    try:
+        result = subprocess.run(command("copy"), input=pcm, capture_output=True)
+        if result.returncode != 0:
+            print(
+                f"[...] 视频流无法直接复制，改用 {FALLBACK_VIDEO_CODEC} 重新编码："
+                f"{result.stderr.decode('utf-8', errors='replace').strip()[-200:]}"
+            )
+            result = subprocess.run(
+                command(FALLBACK_VIDEO_CODEC), input=pcm, capture_output=True
+            )
+        if result.returncode != 0:
+            raise ValueError(result.stderr.decode("utf-8", errors="replace").strip())
+        os.replace(temp_path, output)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
@@ -0,0 +1,264 @@
+import sys
+import json
+import heapq
+import hashlib
+import argparse
+from array import array
+from pathlib import Path
+from collections import Counter, deque
+from typing import Dict, Hashable, Iterable, Iterator, List, Optional, Sequence
+
+# 直接运行本文件时也能以 src 包的形式导入同级模块
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src import tokenizer
+
+# 默认统计的 n 元词组阶数（单个词语总是统计）
+NGRAM_ORDERS: Sequence[int] = (2, 3)
+
+# 报告中列出的高频重复项数量
+TOP_K: int = 5
+
+# 近似模式下保留的高频候选项数量（超过两倍时裁剪）
+HEAVY_CAPACITY: int = 1024
+
+# 按块读取文件时每块的字符数
+CHUNK_CHARS: int = 64 * 1024
+
+# 切块时优先在这些字符之后断开，避免把一个词切成两半
+_BREAK_CHARS = set("。！？；，、,.!?;\n\r\t ")
+
+
+class CountMinSketch:
+    """
+    Count-Min Sketch：固定内存的频次估计（只会高估，不会低估）
+
+    使用保守更新（只增加等于当前最小值的计数器），减小高估误差。
+    哈希使用带盐的 blake2b 而不是内置 hash()（后者对字符串按进程随机化），
+    相同种子在不同进程、不同运行之间得到相同的计数器位置和估计值。
+    """
+
+    def __init__(self, width: int, depth: int = 4, seed: int = 0) -> None:
+        self.width = width
+        self.depth = depth
+        self.salt = hashlib.blake2b(str(seed).encode("utf-8"), digest_size=16).digest()
+        self.rows = [array("q", bytes(8 * width)) for _ in range(depth)]
+
+    @staticmethod
+    def _key(item: Hashable) -> bytes:
+        # 词语与 n 元词组（词语元组）按内容编码，其他类型使用 repr
+        if isinstance(item, str):
+            return item.encode("utf-8")
+        if isinstance(item, tuple) and all(isinstance(part, str) for part in item):
+            return "\x1f".join(item).encode("utf-8")
+        return repr(item).encode("utf-8")
+
+    def _indices(self, item: Hashable) -> List[int]:
+        # 双重哈希：由一个 64 位哈希派生各行的位置（Kirsch-Mitzenmacher）
+        h = int.from_bytes(
+            hashlib.blake2b(self._key(item), digest_size=8, salt=self.salt).digest(),
+            "little",
+        )
+        h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1
+        return [(h1 + i * h2) % self.width for i in range(self.depth)]
+
+    def add(self, item: Hashable) -> int:
+        """
+        计数加一，返回加一后的估计值
+        """
+        indices = self._indices(item)
+        estimate = min(row[i] for row, i in zip(self.rows, indices)) + 1
+        for row, i in zip(self.rows, indices):
+            if row[i] < estimate:
+                row[i] = estimate
+        return estimate
+
+    def estimate(self, item: Hashable) -> int:
+        return min(row[i] for row, i in zip(self.rows, self._indices(item)))
+
+
+class _OrderStats:
+    """
+    单一阶数（1 元、2 元……）的频次统计
+    """
+
+    def __init__(self, sketch: Optional[CountMinSketch]) -> None:
+        self.total = 0
+        self.sketch = sketch
+        self.counts: Dict[Hashable, int] = Counter() if sketch is None else {}
+        self.distinct = 0
+
+    def add(self, gram: Hashable) -> None:
+        self.total += 1
+        if self.sketch is None:
+            self.counts[gram] += 1
+            return
+
+        # 估计值为 1 说明（在哈希冲突之外）第一次出现
+        estimate = self.sketch.add(gram)
+        if estimate == 1:
+            self.distinct += 1
+        self.counts[gram] = estimate
+        if len(self.counts) > 2 * HEAVY_CAPACITY:
+            self.counts = dict(
+                heapq.nlargest(HEAVY_CAPACITY, self.counts.items(), key=lambda x: x[1])
+            )
+
+    def summary(self, top_k: int) -> tuple:
+        distinct = len(self.counts) if self.sketch is None else self.distinct
+        repeated = self.total - distinct
+        rate = repeated / self.total * 100 if self.total > 0 else 0
+        top = heapq.nlargest(
+            top_k,
+            ((gram, count) for gram, count in self.counts.items() if count > 1),
+            key=lambda x: x[1],
+        )
+        return repeated, rate, top
+
+
+class RepetitionAnalyzer:
+    """
+    单遍流式重复率分析
+
+    逐个接收词语（来自文件、生成器或实时转录），同时统计单个词语和 n 元词组的重复情况。
+    默认用 Counter 精确计数（内存与不同词语数量成正比）；
+    指定 sketch_width 后改用 Count-Min Sketch 加有限的高频候选表，内存固定，
+    重复数为近似值（略微偏高）。
+    """
+
+    def __init__(
+        self,
+        ngram_orders: Sequence[int] = NGRAM_ORDERS,
+        top_k: int = TOP_K,
+        sketch_width: Optional[int] = None,
+        sketch_depth: int = 4,
+        seed: int = 0,
+    ) -> None:
+        self.top_k = top_k
+        self.approximate = sketch_width is not None
+        self.orders = [1] + sorted(n for n in set(ngram_orders) if n > 1)
+        self.stats = {
+            n: _OrderStats(
+                CountMinSketch(sketch_width, sketch_depth, seed + n)
+                if self.approximate
+                else None
+            )
+            for n in self.orders
+        }
+        self.window: deque = deque(maxlen=self.orders[-1])
+
+    def add(self, word: str) -> None:
+        self.window.append(word)
+        for n in self.orders:
+            if len(self.window) < n:
+                break
+            gram = word if n == 1 else tuple(self.window)[-n:]
+            self.stats[n].add(gram)
+
+    def feed(self, words: Iterable[str]) -> "RepetitionAnalyzer":
+        for word in words:
+            self.add(word)
+        return self
+
+    def result(self) -> dict:
+        """
+        返回:
+            dict: 与 calculate_repetition_rate 的 "重复率分析" 相同的字段，
+                  另含 "n元重复"（各阶数的总数、重复数、重复率、高频重复）和 "近似统计"
+        """
+        unigram = self.stats[1]
+        repeated, rate, top = unigram.summary(self.top_k)
+        result = {
+            "总字数": unigram.total,
+            "重复字数": repeated,
+            "重复率": f"{rate:.2f}%",
+            "高频重复词": [{"词": word, "出现次数": count} for word, count in top],
+            "n元重复": {},
+            "近似统计": self.approximate,
+        }
+
+        for n in self.orders[1:]:
+            repeated, rate, top = self.stats[n].summary(self.top_k)
+            result["n元重复"][f"{n}元"] = {
+                "总数": self.stats[n].total,
+                "重复数": repeated,
+                "重复率": f"{rate:.2f}%",
+                "高频重复": [
+                    {"词组": " ".join(gram), "出现次数": count} for gram, count in top
+                ],
+            }
+
+        return result
+
+
+def iter_file_words(file_path: str, chunk_chars: int = CHUNK_CHARS) -> Iterator[str]:
+    """
+    按块读取文本文件并逐个产出词语，内存占用与文件大小无关
+
+    每块在最后一个标点或空白处断开，剩余部分并入下一块，避免切断词语。
+    """
+    carry = ""
+    with open(file_path, "r", encoding="utf-8") as f:
+        while True:
+            chunk = f.read(chunk_chars)
+            if not chunk:
+                break
+
+            text = carry + chunk
+            cut = len(text)
+            while cut > 0 and text[cut - 1] not in _BREAK_CHARS:
+                cut -= 1
+            if cut == 0:
+                # 整块都没有断点时直接切开
+                cut = len(text)
+
+            carry = text[cut:]
+            yield from tokenizer.iter_words(text[:cut])
+
+    if carry:
+        yield from tokenizer.iter_words(carry)
+
+
+def analyze_file(file_path: str, **kwargs) -> dict:
+    """
+    单遍统计文本文件（如字幕归档）的重复率
+
+    参数:
+        file_path (str): UTF-8 文本文件路径
+        **kwargs: 传给 RepetitionAnalyzer 的参数
+
+    返回:
+        dict: RepetitionAnalyzer.result() 的结果
+    """
+    try:
+        return RepetitionAnalyzer(**kwargs).feed(iter_file_words(file_path)).result()
+    except Exception as e:
+        raise ValueError(f"[x] 统计重复率时出错：{str(e)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="长文本重复率统计（单遍、流式）")
+    parser.add_argument("file", help="UTF-8 文本文件")
+    parser.add_argument(
+        "--ngram", type=int, nargs="*", default=list(NGRAM_ORDERS), help="n 元阶数"
+    )
+    parser.add_argument("--top", type=int, default=TOP_K, help="列出的高频重复项数量")
+    parser.add_argument(
+        "--sketch-width",
+        type=int,
+        default=None,
+        help="使用 Count-Min Sketch（固定内存，近似计数）时每行的计数器数量",
+    )
+    args = parser.parse_args()
+
+    result = analyze_file(
+        args.file,
+        ngram_orders=args.ngram,
+        top_k=args.top,
+        sketch_width=args.sketch_width,
+    )
+    print(json.dumps({"重复率分析": result}, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+import threading
+import numpy as np
+from typing import List, Optional, Tuple
+
+from src import lazy_import
+from src.audio_buffer import WHISPER_SAMPLE_RATE
+
+torch = lazy_import.lazy("torch")
+whisper = lazy_import.lazy("whisper")
+librosa = lazy_import.lazy("librosa")
+
+# 静音检测阈值（低于峰值多少分贝视为静音）
+TOP_DB: float = 35.0
+
+# Whisper 单次解码的最大窗口长度（秒）
+MAX_WINDOW_SECONDS: float = 30.0
+
+# 相邻语音片段间隔小于该值时合并到同一窗口（秒）
+MERGE_GAP_SECONDS: float = 0.5
+
+# 每个窗口两侧保留的上下文（秒）
+PAD_SECONDS: float = 0.1
+
+# 每批送入模型的窗口数量
+BATCH_SIZE: int = 8
+
+
+class TranscriptionCancelled(Exception):
+    """转录过程中收到取消请求（已完成的批次结果被丢弃）"""
+
+
+def check_cancelled(cancel_event: Optional[threading.Event]) -> None:
+    """
+    取消标记已设置时抛出 TranscriptionCancelled
+    """
+    if cancel_event is not None and cancel_event.is_set():
+        raise TranscriptionCancelled()
+
+
+def vad_windows(
+    audio: np.ndarray,
+    sr: int = WHISPER_SAMPLE_RATE,
+    top_db: float = TOP_DB,
+    max_window_seconds: float = MAX_WINDOW_SECONDS,
+    merge_gap_seconds: float = MERGE_GAP_SECONDS,
+) -> List[Tuple[int, int]]:
+    """
+    基于能量的静音切分，把语音片段合并为不超过 max_window_seconds 的窗口
+
+    返回:
+        List[Tuple[int, int]]: 每个窗口的 (起始采样点, 结束采样点)
+    """
+    max_len = int(max_window_seconds * sr)
+    max_gap = int(merge_gap_seconds * sr)
+    pad = int(PAD_SECONDS * sr)
+
+    windows: List[Tuple[int, int]] = []
+    for start, end in librosa.effects.split(audio, top_db=top_db):
+        start = max(0, int(start) - pad)
+        end = min(len(audio), int(end) + pad)
+
+        # 与上一个窗口间隔很小且合并后不超长时合并
+        if (
+            windows
+            and start - windows[-1][1] <= max_gap
+            and end - windows[-1][0] <= max_len
+        ):
+            windows[-1] = (windows[-1][0], end)
+            continue
+
+        # 单个语音片段超过最大窗口时按固定长度切开
+        for chunk_start in range(start, end, max_len):
+            windows.append((chunk_start, min(chunk_start + max_len, end)))
+
+    return windows
+
+
+def transcribe_windows(
+    model: "whisper.Whisper",
+    audio: np.ndarray,
+    windows: List[Tuple[int, int]],
+    language: str,
+    batch_size: int = BATCH_SIZE,
+    sr: int = WHISPER_SAMPLE_RATE,
+    cancel_event: Optional[threading.Event] = None,
+) -> List[dict]:
+    """
+    将多个窗口拼成批次，一次前向解码整批窗口
+
+    每批解码前检查 cancel_event，已设置时抛出 TranscriptionCancelled。
+
+    返回:
+        List[dict]: 每个非空窗口的 {"id", "window", "start", "end", "text"}，
+            时间单位为秒，window 为该窗口在 windows 中的下标
+    """
+    fp16 = next(model.parameters()).dtype == torch.float16
+    options = whisper.DecodingOptions(
+        language=language, without_timestamps=True, fp16=fp16
+    )
+
+    segments: List[dict] = []
+    for batch_start in range(0, len(windows), batch_size):
+        check_cancelled(cancel_event)
+        batch = windows[batch_start : batch_start + batch_size]
+
+        # 每个窗口补齐到 30 秒后计算梅尔频谱，堆叠为一个批次
+        mel = torch.stack(
+            [
+                whisper.log_mel_spectrogram(
+                    whisper.pad_or_trim(audio[start:end]), n_mels=model.dims.n_mels
+                )
+                for start, end in batch
+            ]
+        ).to(model.device)
+
+        results = whisper.decode(model, mel, options)
+        for index, ((start, end), result) in enumerate(zip(batch, results)):
+            text = result.text.strip()
+            if not text:
+                continue
+            segments.append(
+                {
+                    "id": len(segments),
+                    "window": batch_start + index,
+                    "start": round(start / sr, 3),
+                    "end": round(end / sr, 3),
+                    "text": text,
+                }
+            )
+
+    return segments
@@ -0,0 +1,697 @@
+import os
+import sys
+import json
+import time
+import uuid
+import asyncio
+import argparse
+from pathlib import Path
+from http import HTTPStatus
+from collections import OrderedDict
+from urllib.parse import parse_qsl, urlsplit
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Tuple
+
+# 直接运行本文件时也能以 src 包的形式导入同级模块
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src import model_registry, stft_engine, tokenizer
+from src.audio_buffer import AudioBuffer
+from src.logic_component import TRANSCRIBE_MODES, WX_ASR
+
+ROOT_DIR = Path(__file__).parent.parent
+
+# 默认监听地址（只对本机开放）
+DEFAULT_HOST: str = "127.0.0.1"
+DEFAULT_PORT: int = 8765
+
+# 每个进程池等待执行的任务上限，排队数达到上限时新提交直接返回 503，由调用方稍后重试
+QUEUE_SIZE: int = 32
+
+# 内存中保留的任务记录数（超出时丢弃最早完成的任务）
+MAX_JOBS: int = 1000
+
+# 上传文件大小上限与读取块大小
+MAX_UPLOAD_BYTES: int = 2 * 1024**3
+UPLOAD_CHUNK: int = 1024 * 1024
+
+# 读取请求头的超时时间（秒）
+HEADER_TIMEOUT: float = 30.0
+
+# 提前拒绝上传后丢弃未读请求体的最长时间（秒），避免直接关闭连接导致客户端收不到错误响应
+DISCARD_TIMEOUT: float = 1.0
+
+JOB_TYPES = ("transcribe", "modify", "compare")
+VIDEO_EXTENSIONS = (".mp4", ".avi", ".mkv", ".mov")
+FINISHED = ("done", "failed")
+
+# 工作进程内的 WX_ASR 实例（转录进程启动时即加载模型）
+_worker_asr: Optional[WX_ASR] = None
+
+
+def _init_worker(
+    model_name: str, dtype: str, threads: Optional[int], load_model: bool
+) -> None:
+    """
+    工作进程初始化：创建 WX_ASR 并预加载 jieba 词典，转录进程同时加载模型
+    """
+    global _worker_asr
+    _worker_asr = WX_ASR(model_name=model_name, dtype=dtype, threads=threads)
+    tokenizer.warm_up(background=False)
+    if load_model:
+        _worker_asr.model
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def transcribe_task(path: str, mode: str) -> dict:
+    """
+    转录任务（在转录进程池中执行）
+    """
+    start = time.perf_counter()
+    result = _worker_asr.transcribe(path, mode=mode)
+    return {
+        "text": result["text"],
+        "segments": [
+            {key: seg[key] for key in ("id", "start", "end", "text")}
+            for seg in result.get("segments", [])
+        ],
+        "asr_seconds": round(time.perf_counter() - start, 3),
+    }
+
+
+def modify_task(path: str, output_dir: str, job_id: str, options: dict) -> dict:
+    """
+    变声任务（在 CPU 进程池中执行），视频输入会同时输出替换音轨后的视频
+    """
+    start = time.perf_counter()
+    output = Path(output_dir)
+    output.mkdir(parents=True, exist_ok=True)
+
+    modified = WX_ASR.modify_buffer(
+        AudioBuffer.load(path),
+        noise_level=options.get("noise_level", stft_engine.DEFAULT_NOISE_LEVEL),
+        volume_gain=options.get("volume_gain", stft_engine.DEFAULT_VOLUME_GAIN),
+        engine=options.get("engine", "batched"),
+        tier=options.get("tier", stft_engine.DEFAULT_TIER),
+    )
+    audio_file = output / f"{job_id}.wav"
+    modified.write(str(audio_file))
+    result = {"audio": str(audio_file)}
+
+    if Path(path).suffix.lower() in VIDEO_EXTENSIONS:
+        video_file = output / f"{job_id}.mp4"
+        WX_ASR.modify_video_audio(path, modified, str(video_file))
+        result["video"] = str(video_file)
+
+    result["modify_seconds"] = round(time.perf_counter() - start, 3)
+    return result
+
+
+def compare_task(original: str, test: str) -> dict:
+    """
+    文本比较任务（在 CPU 进程池中执行）
+    """
+    return _worker_asr.compare_texts(original, test)
+
+
+class Job:
+    """
+    一个排队执行的任务及其状态，状态变化时通知等待中的事件流
+    """
+
+    def __init__(
+        self, job_id: str, kind: str, params: dict, upload: Optional[Path] = None
+    ) -> None:
+        self.id = job_id
+        self.kind = kind
+        self.params = params
+        # 上传的输入文件，任务结束后删除
+        self.upload = upload
+        # 先转录再比较的任务，转录结果在两个阶段之间传递
+        self.test: Optional[str] = None
+        self.status = "queued"
+        self.result: Optional[dict] = None
+        self.error: Optional[str] = None
+        self.created = time.time()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.changed = asyncio.Condition()
+
+    async def update(self, **fields) -> None:
+        for name, value in fields.items():
+            setattr(self, name, value)
+        async with self.changed:
+            self.changed.notify_all()
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "type": self.kind,
+            "status": self.status,
+            "params": self.params,
+            "created": round(self.created, 3),
+            "queue_seconds": (
+                round(self.started - self.created, 3) if self.started else None
+            ),
+            "run_seconds": (
+                round(self.finished - self.started, 3)
+                if self.finished and self.started
+                else None
+            ),
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+class HTTPError(Exception):
+    def __init__(self, status: HTTPStatus, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class JobService:
+    """
+    常驻的本地任务服务
+
+    启动时创建两个进程池并预热：转录进程各自加载一次模型，CPU 进程负责变声与文本比较。
+    每个进程池有自己的队列和与进程数相同的调度协程，取出的任务总能立即执行，
+    转录任务排队时不会占用 CPU 任务的调度协程。新提交的任务在排队数达到上限时被拒绝（503）；
+    先转录再比较的任务在转录完成后直接转入 CPU 队列（不受上限限制，只会让新提交更早被拒绝），
+    转录调度协程不会因 CPU 队列繁忙而停下。工作进程异常退出导致进程池损坏时，
+    当前任务记为失败并重建该进程池。
+    事件循环本身从不执行计算，单个请求的耗时只包含排队与推理本身。
+    """
+
+    def __init__(
+        self,
+        model_name: str = model_registry.DEFAULT_MODEL,
+        dtype: str = model_registry.DEFAULT_DTYPE,
+        threads: Optional[int] = None,
+        asr_workers: int = 1,
+        cpu_workers: int = 2,
+        queue_size: int = QUEUE_SIZE,
+        output_dir: Optional[str] = None,
+    ) -> None:
+        self.model_name = model_name
+        self.dtype = dtype
+        self.threads = threads
+        self.asr_workers = asr_workers
+        self.cpu_workers = cpu_workers
+        self.queue_size = queue_size
+        self.output_dir = (
+            Path(output_dir)
+            if output_dir
+            else ROOT_DIR / "media" / "output" / "service"
+        )
+        self.upload_dir = ROOT_DIR / "media" / "cache" / "uploads"
+
+        self.jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self.queues: Dict[str, asyncio.Queue] = {}
+        self.pools: Dict[str, ProcessPoolExecutor] = {}
+        self.consumers: List[asyncio.Task] = []
+
+    def _create_pool(self, pool: str) -> ProcessPoolExecutor:
+        """
+        创建转录（"asr"，进程启动时加载模型）或 CPU（"cpu"）进程池
+        """
+        return ProcessPoolExecutor(
+            max_workers=self.asr_workers if pool == "asr" else self.cpu_workers,
+            initializer=_init_worker,
+            initargs=(self.model_name, self.dtype, self.threads, pool == "asr"),
+        )
+
+    async def start(self) -> None:
+        """
+        创建并预热进程池，启动调度协程
+        """
+        loop = asyncio.get_running_loop()
+        # 队列本身不设上限：提交时由 _ensure_capacity 控制排队数，转入 CPU 队列时不会阻塞
+        self.queues = {"asr": asyncio.Queue(), "cpu": asyncio.Queue()}
+        self.pools = {pool: self._create_pool(pool) for pool in ("asr", "cpu")}
+
+        # 同时提交与进程数相同的空任务，使所有进程立即启动并完成初始化
+        print(f"[...] 正在启动工作进程并加载模型：{self.model_name} / {self.dtype}")
+        await asyncio.gather(
+            *(
+                loop.run_in_executor(self.pools["asr"], _ping)
+                for _ in range(self.asr_workers)
+            ),
+            *(
+                loop.run_in_executor(self.pools["cpu"], _ping)
+                for _ in range(self.cpu_workers)
+            ),
+        )
+
+        self.consumers = [
+            loop.create_task(self._consume(name))
+            for name, workers in (("asr", self.asr_workers), ("cpu", self.cpu_workers))
+            for _ in range(workers)
+        ]
+        print("[√] 工作进程已就绪")
+
+    def close(self) -> None:
+        for task in self.consumers:
+            task.cancel()
+        for pool in self.pools.values():
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _validate(self, kind: str, params: dict, upload: bool = False) -> None:
+        """
+        校验任务参数；upload 为 True 时输入文件尚未保存，跳过路径检查
+        """
+        if kind not in JOB_TYPES:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, f"[x] 不支持的任务类型：{kind}")
+
+        if kind == "compare" and "path" not in params and not upload:
+            if "original" not in params or "test" not in params:
+                raise HTTPError(
+                    HTTPStatus.BAD_REQUEST, "[x] 比较任务需要 original 与 test 文本"
+                )
+            return
+
+        if kind == "compare" and "original" not in params:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "[x] 比较任务需要 original 文本")
+        if params.get("mode", "full") not in TRANSCRIBE_MODES:
+            raise HTTPError(
+                HTTPStatus.BAD_REQUEST, f"[x] 不支持的转录模式：{params['mode']}"
+            )
+        if params.get("tier", stft_engine.DEFAULT_TIER) not in stft_engine.TIERS:
+            raise HTTPError(
+                HTTPStatus.BAD_REQUEST, f"[x] 不支持的处理档位：{params['tier']}"
+            )
+        if upload:
+            return
+        if "path" not in params:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "[x] 缺少输入文件路径 path")
+        if not os.path.exists(params["path"]):
+            raise HTTPError(
+                HTTPStatus.NOT_FOUND, f"[x] 未找到输入文件：{params['path']}"
+            )
+
+    @staticmethod
+    def _first_pool(kind: str, params: dict) -> str:
+        """
+        任务首先进入的进程池：转录（含先转录再比较）进入转录池，其余进入 CPU 池
+        """
+        if kind == "transcribe" or (kind == "compare" and "path" in params):
+            return "asr"
+        return "cpu"
+
+    def _ensure_capacity(self, pool: str) -> None:
+        if self.queues[pool].qsize() >= self.queue_size:
+            raise HTTPError(
+                HTTPStatus.SERVICE_UNAVAILABLE, "[x] 任务队列已满，请稍后重试"
+            )
+
+    def submit(
+        self,
+        kind: str,
+        params: dict,
+        job_id: Optional[str] = None,
+        upload: Optional[Path] = None,
+    ) -> Job:
+        """
+        校验并入队，队列满时抛出 503（不等待）
+        """
+        self._validate(kind, params)
+        pool = self._first_pool(kind, params)
+        self._ensure_capacity(pool)
+
+        job = Job(job_id or uuid.uuid4().hex[:12], kind, params, upload)
+        self.queues[pool].put_nowait(job)
+        self.jobs[job.id] = job
+
+        # 只淘汰已经结束的旧任务
+        while len(self.jobs) > MAX_JOBS:
+            oldest = next((j for j in self.jobs.values() if j.status in FINISHED), None)
+            if oldest is None:
+                break
+            del self.jobs[oldest.id]
+        return job
+
+    async def _consume(self, pool: str) -> None:
+        queue = self.queues[pool]
+        while True:
+            job = await queue.get()
+            try:
+                if job.status == "queued":
+                    await job.update(status="running", started=time.time())
+                result = await self._run(job, pool)
+                if result is None:
+                    # 转录完成，比较阶段转入 CPU 队列（不等待，转录调度协程继续取下一个任务）
+                    self.queues["cpu"].put_nowait(job)
+                else:
+                    await self._finish(job, status="done", result=result)
+            except Exception as e:
+                await self._finish(job, status="failed", error=str(e))
+            finally:
+                queue.task_done()
+
+    async def _finish(self, job: Job, **fields) -> None:
+        await job.update(finished=time.time(), **fields)
+        if job.upload is not None:
+            await asyncio.to_thread(job.upload.unlink, missing_ok=True)
+
+    async def _execute(self, pool: str, func, *args):
+        """
+        在进程池中执行函数；进程池已损坏（工作进程异常退出）时重建进程池并抛出异常
+        """
+        executor = self.pools[pool]
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                executor, func, *args
+            )
+        except BrokenProcessPool:
+            # 同一进程池上的多个任务会同时失败，只由第一个任务重建
+            if self.pools[pool] is executor:
+                print(f"[x] {pool} 进程池已损坏，正在重建")
+                executor.shutdown(wait=False, cancel_futures=True)
+                self.pools[pool] = self._create_pool(pool)
+            raise RuntimeError("[x] 工作进程异常退出，任务已中止")
+
+    async def _run(self, job: Job, pool: str) -> Optional[dict]:
+        """
+        在指定进程池中执行任务的一个阶段；返回 None 表示还需进入 CPU 池完成比较
+        """
+        params = job.params
+
+        if pool == "asr":
+            transcription = await self._execute(
+                "asr",
+                transcribe_task,
+                params["path"],
+                params.get("mode", "full"),
+            )
+            if job.kind == "transcribe":
+                return transcription
+            job.test = transcription["text"]
+            return None
+
+        if job.kind == "modify":
+            return await self._execute(
+                "cpu",
+                modify_task,
+                params["path"],
+                str(self.output_dir),
+                job.id,
+                params,
+            )
+
+        test = job.test if job.test is not None else params["test"]
+        comparison = await self._execute("cpu", compare_task, params["original"], test)
+        return {"test": test, "comparison": comparison}
+
+    def health(self) -> dict:
+        statuses: Dict[str, int] = {}
+        for job in self.jobs.values():
+            statuses[job.status] = statuses.get(job.status, 0) + 1
+        return {
+            "model": self.model_name,
+            "dtype": self.dtype,
+            "asr_workers": self.asr_workers,
+            "cpu_workers": self.cpu_workers,
+            "queued": {name: queue.qsize() for name, queue in self.queues.items()},
+            "queue_size": self.queue_size,
+            "jobs": statuses,
+        }
+
+    # ---- HTTP ----
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            method, path, query, headers = await asyncio.wait_for(
+                _read_head(reader), HEADER_TIMEOUT
+            )
+            await self._route(method, path, query, headers, reader, writer)
+        except HTTPError as e:
+            extra = (
+                {"Retry-After": "1"}
+                if e.status == HTTPStatus.SERVICE_UNAVAILABLE
+                else None
+            )
+            await _send_json(writer, e.status, {"error": str(e)}, extra)
+            await _discard_body(reader, writer)
+        except ValueError as e:
+            await _send_json(
+                writer, HTTPStatus.BAD_REQUEST, {"error": f"[x] 请求无效：{str(e)}"}
+            )
+            await _discard_body(reader, writer)
+        except (asyncio.TimeoutError, ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except Exception as e:
+            await _send_json(
+                writer, HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(e)}
+            )
+        finally:
+            try:
+                writer.close()
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _route(
+        self,
+        method: str,
+        path: str,
+        query: dict,
+        headers: dict,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        parts = [p for p in path.split("/") if p]
+
+        if method == "GET" and parts == ["health"]:
+            await _send_json(writer, HTTPStatus.OK, self.health())
+        elif method == "GET" and parts == ["jobs"]:
+            jobs = [job.to_dict() for job in self.jobs.values()]
+            await _send_json(writer, HTTPStatus.OK, {"jobs": jobs})
+        elif method == "POST" and parts == ["jobs"]:
+            job = await self._create_job(query, headers, reader)
+            await _send_json(writer, HTTPStatus.ACCEPTED, job.to_dict())
+        elif method == "GET" and len(parts) in (2, 3) and parts[0] == "jobs":
+            job = self.jobs.get(parts[1])
+            if job is None:
+                raise HTTPError(HTTPStatus.NOT_FOUND, f"[x] 未找到任务：{parts[1]}")
+            if len(parts) == 2:
+                await _send_json(writer, HTTPStatus.OK, job.to_dict())
+            elif parts[2] == "events":
+                await self._stream_events(job, writer)
+            else:
+                raise HTTPError(HTTPStatus.NOT_FOUND, f"[x] 未知路径：{path}")
+        else:
+            raise HTTPError(HTTPStatus.NOT_FOUND, f"[x] 未知路径：{method} {path}")
+
+    async def _create_job(
+        self, query: dict, headers: dict, reader: asyncio.StreamReader
+    ) -> Job:
+        """
+        JSON 请求体描述任务；其他请求体视为上传的媒体文件，任务参数放在查询字符串中
+        """
+        length = int(headers.get("content-length", 0))
+        if "chunked" in headers.get("transfer-encoding", ""):
+            raise HTTPError(HTTPStatus.LENGTH_REQUIRED, "[x] 需要 Content-Length")
+        if length > MAX_UPLOAD_BYTES:
+            raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "[x] 上传文件过大")
+
+        if headers.get("content-type", "").startswith("application/json"):
+            try:
+                spec = json.loads(await reader.readexactly(length))
+            except json.JSONDecodeError as e:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, f"[x] 无法解析请求：{str(e)}")
+            if not isinstance(spec, dict):
+                raise HTTPError(HTTPStatus.BAD_REQUEST, "[x] 请求体必须是 JSON 对象")
+            kind = spec.pop("type", "")
+            return self.submit(kind, spec)
+
+        if length == 0:
+            raise HTTPError(HTTPStatus.BAD_REQUEST, "[x] 上传内容为空")
+
+        kind = query.pop("type", "transcribe")
+        params = dict(query)
+        for name in ("noise_level", "volume_gain"):
+            if name in params:
+                params[name] = float(params[name])
+
+        # 参数无效或队列已满时不再接收上传内容
+        self._validate(kind, params, upload=True)
+        self._ensure_capacity(self._first_pool(kind, {**params, "path": None}))
+
+        job_id = uuid.uuid4().hex[:12]
+        suffix = Path(params.pop("filename", "upload.wav")).suffix or ".wav"
+        upload = await self._save_upload(reader, length, job_id + suffix)
+        params["path"] = str(upload)
+        try:
+            return self.submit(kind, params, job_id, upload)
+        except BaseException:
+            upload.unlink(missing_ok=True)
+            raise
+
+    async def _save_upload(
+        self, reader: asyncio.StreamReader, length: int, name: str
+    ) -> Path:
+        """
+        分块读取上传内容，文件写入放到线程中执行
+        """
+        self.upload_dir.mkdir(parents=True, exist_ok=True)
+        target = self.upload_dir / name
+        f = await asyncio.to_thread(open, target, "wb")
+        try:
+            remaining = length
+            while remaining:
+                chunk = await reader.read(min(UPLOAD_CHUNK, remaining))
+                if not chunk:
+                    raise ConnectionError("上传中断")
+                await asyncio.to_thread(f.write, chunk)
+                remaining -= len(chunk)
+        except BaseException:
+            f.close()
+            target.unlink(missing_ok=True)
+            raise
+        f.close()
+        return target
+
+    async def _stream_events(self, job: Job, writer: asyncio.StreamWriter) -> None:
+        """
+        以 Server-Sent Events 推送任务状态，任务结束后关闭连接
+        """
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: text/event-stream; charset=utf-8\r\n"
+            b"Cache-Control: no-cache\r\n"
+            b"Connection: close\r\n\r\n"
+        )
+        while True:
+            status = job.status
+            data = json.dumps(job.to_dict(), ensure_ascii=False)
+            writer.write(f"event: {status}\ndata: {data}\n\n".encode("utf-8"))
+            await writer.drain()
+            if status in FINISHED:
+                return
+
+            # 发送期间不持有锁，慢速客户端不会阻塞任务状态更新
+            async with job.changed:
+                await job.changed.wait_for(lambda: job.status != status)
+
+    async def serve(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> None:
+        await self.start()
+        server = await asyncio.start_server(self.handle, host, port)
+        print(f"[√] 任务服务已启动: http://{host}:{port}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.close()
+
+
+async def _read_head(reader: asyncio.StreamReader) -> Tuple[str, str, dict, dict]:
+    """
+    读取请求行与请求头
+
+    返回:
+        tuple: (方法, 路径, 查询参数, 小写请求头)
+    """
+    request_line = (await reader.readline()).decode("latin-1").strip()
+    if not request_line:
+        raise ConnectionError("连接已关闭")
+    method, target, _ = request_line.split(" ", 2)
+
+    headers: Dict[str, str] = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    url = urlsplit(target)
+    return method.upper(), url.path, dict(parse_qsl(url.query)), headers
+
+
+async def _discard_body(
+    reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+) -> None:
+    """
+    发送错误响应后关闭写方向，并在限定时间内丢弃客户端仍在发送的请求体
+    """
+
+    async def drain() -> None:
+        while await reader.read(UPLOAD_CHUNK):
+            pass
+
+    try:
+        if writer.can_write_eof():
+            writer.write_eof()
+        await asyncio.wait_for(drain(), DISCARD_TIMEOUT)
+    except (asyncio.TimeoutError, ConnectionError):
+        pass
+
+
+async def _send_json(
+    writer: asyncio.StreamWriter,
+    status: HTTPStatus,
+    payload: dict,
+    extra_headers: Optional[dict] = None,
+) -> None:
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    head = [
+        f"HTTP/1.1 {status.value} {status.phrase}",
+        "Content-Type: application/json; charset=utf-8",
+        f"Content-Length: {len(body)}",
+        "Connection: close",
+    ]
+    head += [f"{name}: {value}" for name, value in (extra_headers or {}).items()]
+    writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+    await writer.drain()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="本地 HTTP 任务服务（常驻模型）")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="监听地址")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="监听端口")
+    parser.add_argument(
+        "--model", default=model_registry.DEFAULT_MODEL, help="Whisper 模型名称"
+    )
+    parser.add_argument(
+        "--dtype",
+        choices=model_registry.DTYPES,
+        default=model_registry.DEFAULT_DTYPE,
+        help="模型精度",
+    )
+    parser.add_argument("--threads", type=int, help="每个转录进程的 CPU 线程数")
+    parser.add_argument("--asr-workers", type=int, default=1, help="转录进程数")
+    parser.add_argument("--cpu-workers", type=int, default=2, help="变声 / 比较进程数")
+    parser.add_argument(
+        "--queue-size", type=int, default=QUEUE_SIZE, help="排队任务上限"
+    )
+    parser.add_argument("-o", "--output", help="输出目录，默认 media/output/service")
+    args = parser.parse_args()
+
+    # 精度与设备不匹配时（例如在 CPU 上使用 fp16）启动前直接报错
+    try:
+        model_registry.check_dtype(args.dtype)
+    except ValueError as e:
+        parser.error(str(e))
+
+    service = JobService(
+        model_name=args.model,
+        dtype=args.dtype,
+        threads=args.threads,
+        asr_workers=args.asr_workers,
+        cpu_workers=args.cpu_workers,
+        queue_size=args.queue_size,
+        output_dir=args.output,
+    )
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        print("[√] 任务服务已停止")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,420 @@
+import numpy as np
+from typing import Dict, Optional, Tuple
+
+from src import lazy_import
+
+librosa = lazy_import.lazy("librosa")
+
+# 分段数量，与 modify_audio 原有的 np.array_split(audio, 40) 保持一致
+N_SEGMENTS: int = 40
+
+# 短时傅里叶变换参数（与 librosa.effects 的默认值一致）
+N_FFT: int = 2048
+HOP_LENGTH: int = 512
+
+# 处理档位（速度与质量的取舍），批量引擎使用：
+#   sample_rate: 处理前降采样到该采样率（None 为保持原采样率），STFT 与声码器计算量随之下降
+#   n_fft / hop_length: STFT 帧长与帧移
+#   res_type: 音高偏移的重采样方式，"linear" 为线性插值（没有抗混叠滤波，高频会折叠回可听频段，
+#             只用于 preview），其他取值交给 librosa.resample（soxr 系列为带限重采样）
+#   pitch_group: 相邻多少段共用一次音高偏移（1 为逐段）
+TIERS: Dict[str, dict] = {
+    "preview": {
+        "sample_rate": 22050,
+        "n_fft": 1024,
+        "hop_length": 512,
+        "res_type": "linear",
+        "pitch_group": 4,
+    },
+    "standard": {
+        "sample_rate": None,
+        "n_fft": N_FFT,
+        "hop_length": HOP_LENGTH,
+        "res_type": "soxr_mq",
+        "pitch_group": 1,
+    },
+    "final": {
+        "sample_rate": None,
+        "n_fft": N_FFT,
+        "hop_length": 256,
+        "res_type": "soxr_hq",
+        "pitch_group": 1,
+    },
+}
+DEFAULT_TIER: str = "standard"
+
+# 批量引擎默认的重采样方式（带限，耗时与线性插值相当）
+DEFAULT_RES_TYPE: str = "soxr_mq"
+
+# 相位声码器每次处理的输出帧数，用于限制临时数组的大小
+VOCODER_BLOCK: int = 4096
+
+# 可选的处理引擎
+ENGINES: Tuple[str, ...] = ("batched", "reference")
+
+# 默认处理参数：音量增益、白噪声标准差以及每段拉伸/音高的随机范围
+DEFAULT_VOLUME_GAIN: float = 0.85
+DEFAULT_NOISE_LEVEL: float = 0.02
+STRETCH_RANGE: Tuple[float, float] = (0.97, 1.03)
+PITCH_RANGE: Tuple[float, float] = (-1.5, 1.5)
+
+# 增益、加噪与限幅每次处理的采样数（float32 下 256KB，数据与噪声块都能留在 L2 缓存中）
+POSTPROCESS_BLOCK: int = 65536
+
+# 后处理共用的噪声生成器，直接生成 float32 噪声
+_noise_rng: np.random.Generator = np.random.default_rng()
+
+
+def seed(value: int) -> None:
+    """
+    固定随机种子：分段参数使用全局 np.random，白噪声使用共用的生成器
+    """
+    global _noise_rng
+    np.random.seed(value)
+    _noise_rng = np.random.default_rng(value)
+
+
+def draw_segment_factors(
+    n_segments: int = N_SEGMENTS,
+    stretch_range: Tuple[float, float] = STRETCH_RANGE,
+    pitch_range: Tuple[float, float] = PITCH_RANGE,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    为每一段抽取时间拉伸系数和音高偏移量
+
+    抽取顺序与原逐段处理逻辑完全相同（拉伸、音高交替），
+    因此在相同随机种子下两种引擎得到的参数一致。
+
+    参数:
+        stretch_range (tuple): 拉伸系数的取值范围
+        pitch_range (tuple): 音高偏移（半音）的取值范围
+
+    返回:
+        Tuple[np.ndarray, np.ndarray]: (拉伸系数, 音高偏移半音数)
+    """
+    stretch = np.empty(n_segments)
+    pitch = np.empty(n_segments)
+
+    for i in range(n_segments):
+        stretch[i] = np.random.uniform(*stretch_range)
+        pitch[i] = np.random.uniform(*pitch_range)
+
+    return stretch, pitch
+
+
+def tier_settings(tier: str) -> dict:
+    """
+    返回处理档位的参数（sample_rate、n_fft、hop_length、res_type、pitch_group）
+    """
+    if tier not in TIERS:
+        raise ValueError(f"[x] 不支持的处理档位：{tier}")
+    return dict(TIERS[tier])
+
+
+def group_pitch(pitch: np.ndarray, pitch_group: int = 1) -> np.ndarray:
+    """
+    相邻 pitch_group 段共用组内第一段的音高偏移
+
+    抽取顺序不变（仍逐段抽取），只是组内其余段的音高被覆盖，
+    因此分组后的参数与逐段参数在相同随机种子下一一对应。
+    """
+    if pitch_group <= 1:
+        return pitch
+    return np.repeat(np.asarray(pitch)[::pitch_group], pitch_group)[: len(pitch)]
+
+
+def segment_bounds(n_samples: int, n_segments: int = N_SEGMENTS) -> np.ndarray:
+    """
+    计算与 np.array_split 相同的分段边界
+
+    返回:
+        np.ndarray: 长度为 n_segments + 1 的采样点边界数组
+    """
+    base, extra = divmod(n_samples, n_segments)
+    sizes = np.full(n_segments, base, dtype=np.int64)
+    sizes[:extra] += 1
+
+    return np.concatenate([[0], np.cumsum(sizes)])
+
+
+def reference_modify(
+    audio: np.ndarray, sr: int, stretch: np.ndarray, pitch: np.ndarray
+) -> np.ndarray:
+    """
+    参考实现：逐段调用 librosa 进行时间拉伸和音高偏移
+
+    每段都会重新计算一次 STFT、相位声码器和重采样，速度较慢，
+    仅作为批量引擎的对照基准保留。
+    """
+    segments = np.array_split(audio, len(stretch))
+    modified_segments = []
+
+    for segment, stretch_factor, pitch_shift in zip(segments, stretch, pitch):
+        if len(segment) == 0:
+            continue
+
+        # 时间拉伸
+        stretched = librosa.effects.time_stretch(segment, rate=stretch_factor)
+
+        # 音高偏移
+        shifted = librosa.effects.pitch_shift(stretched, sr=sr, n_steps=pitch_shift)
+
+        modified_segments.append(shifted)
+
+    return np.concatenate([seg for seg in modified_segments if len(seg) > 0])
+
+
+def _phase_vocoder(
+    stft_matrix: np.ndarray,
+    time_steps: np.ndarray,
+    hop_length: int,
+    block: int = VOCODER_BLOCK,
+    resets: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    支持逐帧变速的相位声码器
+
+    与 librosa.phase_vocoder 的算法相同，但 time_steps 可以是任意单调序列，
+    并按块向量化计算，块与块之间只传递累积相位。
+    resets 中的输出帧重新从分析帧的相位开始累积（与逐段调用 librosa 时每段的起点一致），
+    避免音高突变后相邻频点的相位关系错乱、叠加时互相抵消导致整段音量下降。
+    """
+    n_bins = stft_matrix.shape[0]
+    phi_advance = np.linspace(0, np.pi * hop_length, n_bins)[:, None]
+
+    # 末尾补零，保证 idx + 1 不越界
+    padded = np.pad(stft_matrix, [(0, 0), (0, 2)], mode="constant")
+
+    output = np.empty((n_bins, len(time_steps)), dtype=stft_matrix.dtype)
+    phase_acc = np.angle(padded[:, 0])
+
+    is_reset = np.zeros(len(time_steps), dtype=bool)
+    if resets is not None:
+        is_reset[resets[resets < len(time_steps)]] = True
+
+    for start in range(0, len(time_steps), block):
+        steps = time_steps[start : start + block]
+        idx = steps.astype(np.int64)
+        alpha = (steps - idx)[None, :]
+
+        left = padded[:, idx]
+        right = padded[:, idx + 1]
+
+        # 幅度线性插值
+        magnitude = (1.0 - alpha) * np.abs(left) + alpha * np.abs(right)
+
+        # 相位增量（去除期望相位推进后折回 [-pi, pi]）
+        dphase = np.angle(right) - np.angle(left) - phi_advance
+        dphase -= 2.0 * np.pi * np.round(dphase / (2.0 * np.pi))
+        dphase += phi_advance
+
+        # 每帧使用的是从最近的起点累加到上一帧为止的相位：
+        # 起点为重置帧时取该帧的分析相位，否则取上一块传入的累积相位
+        cumulative = np.cumsum(dphase, axis=1) - dphase
+        reset = is_reset[start : start + len(steps)]
+        positions = np.arange(len(steps))
+        anchor = np.maximum.accumulate(np.where(reset, positions, 0))
+        base = np.where(reset[None, :], np.angle(left), 0.0)
+        if not reset[0]:
+            base[:, 0] = phase_acc
+        phase = base[:, anchor] + cumulative - cumulative[:, anchor]
+
+        output[:, start : start + len(steps)] = magnitude * np.exp(1j * phase)
+        # 折回 [0, 2pi)，避免长音频累积相位丢失精度
+        phase_acc = np.mod(phase[:, -1] + dphase[:, -1], 2.0 * np.pi)
+
+    return output
+
+
+def batched_modify(
+    audio: np.ndarray,
+    sr: int,
+    stretch: np.ndarray,
+    pitch: np.ndarray,
+    n_fft: int = N_FFT,
+    hop_length: int = HOP_LENGTH,
+    res_type: str = DEFAULT_RES_TYPE,
+) -> np.ndarray:
+    """
+    批量引擎：整段音频只做一次 STFT 和一次逆变换
+
+    librosa 的 pitch_shift 等价于先按 2^(-n/12) 做时间拉伸再重采样，
+    因此每段的拉伸与音高可以合并为一个变速相位声码器映射，
+    最后再做一次逐段变速率的重采样（音高相同的相邻段合并为一次重采样）。
+
+    参数:
+        audio (np.ndarray): 单声道音频
+        sr (int): 采样率
+        stretch (np.ndarray): 每段的时间拉伸系数
+        pitch (np.ndarray): 每段的音高偏移（半音）
+        n_fft (int): STFT 帧长
+        hop_length (int): STFT 帧移
+        res_type (str): 交给 librosa.resample 的重采样方式（默认 "soxr_mq"，最终导出用 "soxr_hq"）；
+                        "linear" 为线性插值，没有抗混叠滤波，只适合预览
+
+    返回:
+        np.ndarray: 处理后的音频，长度约为各段 len / stretch 之和
+    """
+    n_segments = len(stretch)
+    bounds = segment_bounds(len(audio), n_segments)
+    seg_lengths = np.diff(bounds)
+
+    # 音高偏移对应的速率以及合并后的声码器速率
+    pitch_rate = 2.0 ** (-np.asarray(pitch) / 12.0)
+    vocoder_rate = np.asarray(stretch) * pitch_rate
+
+    # 一次性计算整段 STFT
+    stft_matrix = librosa.stft(audio, n_fft=n_fft, hop_length=hop_length)
+    n_frames = stft_matrix.shape[1]
+
+    # 将采样点边界映射到帧边界，并为每段生成变速的帧位置
+    frame_bounds = np.minimum(np.round(bounds / hop_length).astype(np.int64), n_frames)
+    frame_bounds[-1] = n_frames
+
+    # 每段的输出帧数按拉伸后累计长度的帧边界取整，取整误差不随段数累积，
+    # 各段内容与后面按 stretched_bounds 切分的重采样区间保持对齐
+    stretched_lengths = np.round(seg_lengths / vocoder_rate).astype(np.int64)
+    stretched_bounds = np.concatenate([[0], np.cumsum(stretched_lengths)])
+    output_frames = np.diff(np.round(stretched_bounds / hop_length).astype(np.int64))
+    time_steps = np.concatenate(
+        [
+            frame_bounds[i]
+            + np.arange(output_frames[i])
+            * ((frame_bounds[i + 1] - frame_bounds[i]) / max(output_frames[i], 1))
+            for i in range(n_segments)
+        ]
+    )
+
+    # 变速相位声码器 + 一次逆变换
+    # 每段的第一帧重新从分析相位开始
+    segment_starts = np.cumsum(output_frames)[:-1]
+    stretched = librosa.istft(
+        _phase_vocoder(stft_matrix, time_steps, hop_length, resets=segment_starts),
+        hop_length=hop_length,
+        n_fft=n_fft,
+        length=int(stretched_lengths.sum()),
+    )
+    del stft_matrix
+
+    # 逐段变速率重采样，完成音高偏移；音高相同的相邻段一起重采样
+    run_starts = np.flatnonzero(np.diff(pitch_rate, prepend=np.nan) != 0)
+    run_ends = np.append(run_starts[1:], n_segments)
+    modified_segments = []
+
+    for first, last in zip(run_starts, run_ends):
+        start, end = stretched_bounds[first], stretched_bounds[last]
+        if end <= start:
+            continue
+
+        rate = pitch_rate[first]
+        if res_type == "linear":
+            # 多取一个采样点，使段尾插值能跨越边界
+            source = stretched[start : min(end + 1, len(stretched))]
+            positions = np.arange(0, end - start, 1.0 / rate)
+            shifted = np.interp(positions, np.arange(len(source)), source)
+        else:
+            shifted = librosa.resample(
+                stretched[start:end], orig_sr=sr / rate, target_sr=sr, res_type=res_type
+            )
+        modified_segments.append(shifted.astype(audio.dtype))
+
+    return np.concatenate(modified_segments)
+
+
+def tiered_modify(
+    audio: np.ndarray,
+    sr: int,
+    stretch: np.ndarray,
+    pitch: np.ndarray,
+    tier: str = DEFAULT_TIER,
+) -> Tuple[np.ndarray, int]:
+    """
+    按处理档位运行批量引擎
+
+    参数:
+        audio (np.ndarray): 单声道音频
+        sr (int): 采样率
+        stretch (np.ndarray): 每段的时间拉伸系数
+        pitch (np.ndarray): 每段的音高偏移（半音）
+        tier (str): "preview"、"standard"（默认，与 batched_modify 的默认参数一致）或 "final"
+
+    返回:
+        Tuple[np.ndarray, int]: (处理后的音频, 采样率)，preview 档位输出降采样后的音频
+    """
+    settings = tier_settings(tier)
+
+    target_sr = settings["sample_rate"]
+    if target_sr and sr > target_sr:
+        # 预览只需听感接近，降采样使用最快的 soxr 模式
+        audio = librosa.resample(
+            audio, orig_sr=sr, target_sr=target_sr, res_type="soxr_qq"
+        )
+        sr = target_sr
+
+    modified = batched_modify(
+        audio,
+        sr,
+        stretch,
+        group_pitch(pitch, settings["pitch_group"]),
+        n_fft=settings["n_fft"],
+        hop_length=settings["hop_length"],
+        res_type=settings["res_type"],
+    )
+    return modified, sr
+
+
+def postprocess(
+    audio: np.ndarray,
+    volume_gain: float = DEFAULT_VOLUME_GAIN,
+    noise_level: float = DEFAULT_NOISE_LEVEL,
+    rng: Optional[np.random.Generator] = None,
+    block_size: int = POSTPROCESS_BLOCK,
+    inplace: bool = False,
+    normalize: bool = True,
+) -> np.ndarray:
+    """
+    音量调整、添加白噪声、限幅并按峰值标准化，全部在 float32 上完成
+
+    按 block_size 分块处理：每块依次乘增益、加噪声、限幅并记录峰值，
+    整个过程只额外占用一个块大小的噪声缓冲区；最后再整体原地除以峰值。
+
+    参数:
+        audio (np.ndarray): 变速变调后的音频
+        volume_gain (float): 加噪前的音量增益
+        noise_level (float): 白噪声标准差
+        rng (np.random.Generator): 噪声生成器，默认使用模块共用的生成器
+        block_size (int): 每块的采样数
+        inplace (bool): 直接修改 audio（调用方不再使用原数组时可省去一次复制；
+                        audio 不是可写的 float32 数组时仍会复制）
+        normalize (bool): 是否按峰值标准化（流式处理在写出时统一标准化）
+
+    返回:
+        np.ndarray: 处理后的 float32 音频
+    """
+    if not inplace or audio.dtype != np.float32 or not audio.flags.writeable:
+        audio = np.array(audio, dtype=np.float32)
+    rng = rng or _noise_rng
+
+    flat = audio.reshape(-1)
+    scratch = np.empty(min(block_size, len(flat)), dtype=np.float32)
+    gain = np.float32(volume_gain)
+    level = np.float32(noise_level)
+    peak = np.float32(0)
+
+    for start in range(0, len(flat), block_size):
+        block = flat[start : start + block_size]
+        noise = scratch[: len(block)]
+
+        np.multiply(block, gain, out=block)
+        rng.standard_normal(out=noise, dtype=np.float32)
+        np.multiply(noise, level, out=noise)
+        np.add(block, noise, out=block)
+        np.clip(block, -1.0, 1.0, out=block)
+
+        # 噪声缓冲区复用为绝对值缓冲区
+        np.abs(block, out=noise)
+        peak = max(peak, noise.max())
+
+    if normalize and peak > 0:
+        np.multiply(audio, np.float32(1.0 / peak), out=audio)
+    return audio
@@ -0,0 +1,185 @@
+import os
+import tempfile
+import numpy as np
+from typing import Iterator, Optional, Tuple
+
+from src import lazy_import, stft_engine
+from src.audio_buffer import output_format
+
+sf = lazy_import.lazy("soundfile")
+
+# 每块读取的时长（秒）以及相邻块之间的重叠时长（秒）
+BLOCK_SECONDS: float = 10.0
+OVERLAP_SECONDS: float = 0.25
+
+# 标准化策略
+NORMALIZE_MODES: Tuple[str, ...] = ("two_pass", "running_peak")
+
+
+def _read_blocks(file_path: str, blocksize: int, overlap: int) -> Iterator[np.ndarray]:
+    """
+    按块读取音频并混缩为单声道 float32（与 librosa.load 的 mono 行为一致）
+    """
+    with sf.SoundFile(file_path) as f:
+        for block in f.blocks(
+            blocksize=blocksize, overlap=overlap, dtype="float32", always_2d=True
+        ):
+            yield block.mean(axis=1)
+
+
+def _crossfade(tail: np.ndarray, head: np.ndarray) -> np.ndarray:
+    """
+    等功率交叉淡化两段等长音频
+    """
+    ramp = np.linspace(0.0, np.pi / 2, len(tail), dtype=np.float32)
+    return tail * np.cos(ramp) + head * np.sin(ramp)
+
+
+def _modified_blocks(
+    file_path: str,
+    block_seconds: float,
+    overlap_seconds: float,
+    noise_level: float,
+    volume_gain: float,
+) -> Iterator[np.ndarray]:
+    """
+    逐块执行变速变调、增益和加噪，并在块边界做重叠交叉淡化
+
+    每块沿用其所在全局分段（共 N_SEGMENTS 段）的拉伸与音高参数，
+    因此整体效果与一次性处理整文件一致，而内存只与块大小有关。
+    """
+    info = sf.info(file_path)
+    sr = info.samplerate
+    blocksize = max(int(block_seconds * sr), stft_engine.N_FFT * 4)
+    overlap = min(int(overlap_seconds * sr), blocksize // 4)
+    step = blocksize - overlap
+
+    stretch, pitch = stft_engine.draw_segment_factors(stft_engine.N_SEGMENTS)
+    bounds = stft_engine.segment_bounds(info.frames, stft_engine.N_SEGMENTS)
+
+    tail: Optional[np.ndarray] = None
+    for index, block in enumerate(_read_blocks(file_path, blocksize, overlap)):
+        if len(block) <= overlap and tail is not None:
+            break
+
+        # 以块中心所在的全局分段确定本块参数
+        center = index * step + len(block) // 2
+        segment = min(
+            int(np.searchsorted(bounds, center, side="right")) - 1,
+            stft_engine.N_SEGMENTS - 1,
+        )
+        out = stft_engine.batched_modify(
+            block, sr, stretch[segment : segment + 1], pitch[segment : segment + 1]
+        )
+
+        # 音量调整、白噪声与限幅（float32 原地分块处理，峰值标准化在写出时统一进行）
+        out = stft_engine.postprocess(
+            out, volume_gain, noise_level, inplace=True, normalize=False
+        )
+
+        # 与上一块的尾部重叠区交叉淡化
+        fade = min(int(round(overlap / stretch[segment])), len(out) // 2)
+        if tail is not None:
+            fade = min(fade, len(tail))
+            yield _crossfade(tail[:fade], out[:fade])
+            body = out[fade:]
+        else:
+            body = out
+
+        if fade > 0 and len(body) > fade:
+            tail = body[-fade:].copy()
+            yield body[:-fade]
+        else:
+            tail = None
+            yield body
+
+    if tail is not None:
+        yield tail
+
+
+def stream_modify_audio(
+    file_path: str,
+    output_path: str,
+    block_seconds: float = BLOCK_SECONDS,
+    overlap_seconds: float = OVERLAP_SECONDS,
+    normalize: str = "two_pass",
+    noise_level: float = stft_engine.DEFAULT_NOISE_LEVEL,
+    volume_gain: float = stft_engine.DEFAULT_VOLUME_GAIN,
+    encoding: Optional[str] = None,
+) -> Tuple[int, int]:
+    """
+    流式处理音频文件，峰值内存与输入时长无关
+
+    参数:
+        file_path (str): 输入音频（需为 libsndfile 支持的格式，如 wav/flac/ogg）
+        output_path (str): 输出音频路径
+        block_seconds (float): 每块时长（秒）
+        overlap_seconds (float): 块间重叠交叉淡化时长（秒）
+        normalize (str): "two_pass" 先写入临时文件并记录峰值，再按全局峰值缩放输出；
+                         "running_peak" 单次写出，按截至当前的最大峰值缩放
+        noise_level (float): 白噪声标准差
+        volume_gain (float): 加噪前的音量增益
+        encoding (str): 输出编码，"pcm16"、"float32" 或 "flac"（见 audio_buffer.output_format）
+
+    返回:
+        Tuple[int, int]: (输出采样点数, 采样率)
+    """
+    if normalize not in NORMALIZE_MODES:
+        raise ValueError(f"[x] 不支持的标准化方式：{normalize}")
+    file_format, subtype = output_format(output_path, encoding)
+
+    sr = sf.info(file_path).samplerate
+    blocks = _modified_blocks(
+        file_path, block_seconds, overlap_seconds, noise_level, volume_gain
+    )
+    frames = 0
+
+    if normalize == "running_peak":
+        peak = 0.0
+        with sf.SoundFile(
+            output_path,
+            "w",
+            samplerate=sr,
+            channels=1,
+            subtype=subtype,
+            format=file_format,
+        ) as out:
+            for block in blocks:
+                peak = max(peak, float(np.max(np.abs(block), initial=0.0)))
+                out.write(block / peak if peak > 0 else block)
+                frames += len(block)
+        return frames, sr
+
+    # 第一遍：写入同目录下的 float32 临时文件，同时记录全局峰值
+    output_dir = os.path.dirname(os.path.abspath(output_path))
+    fd, temp_path = tempfile.mkstemp(suffix=".wav", dir=output_dir)
+    os.close(fd)
+
+    try:
+        peak = 0.0
+        with sf.SoundFile(
+            temp_path, "w", samplerate=sr, channels=1, subtype="FLOAT"
+        ) as temp:
+            for block in blocks:
+                peak = max(peak, float(np.max(np.abs(block), initial=0.0)))
+                temp.write(block)
+
+        # 第二遍：按全局峰值缩放并写出最终文件
+        scale = 1.0 / peak if peak > 0 else 1.0
+        blocksize = int(block_seconds * sr)
+        with sf.SoundFile(temp_path) as temp, sf.SoundFile(
+            output_path,
+            "w",
+            samplerate=sr,
+            channels=1,
+            subtype=subtype,
+            format=file_format,
+        ) as out:
+            for block in temp.blocks(blocksize=blocksize, dtype="float32"):
+                block *= scale
+                out.write(block)
+                frames += len(block)
+    finally:
+        os.remove(temp_path)
+
+    return frames, sr
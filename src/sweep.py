@@ -0,0 +1,312 @@
+import sys
+import csv
+import json
+import random
+import argparse
+import itertools
+import numpy as np
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence
+
+# 直接运行本文件时也能以 src 包的形式导入同级模块
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src import stft_engine
+from src.audio_buffer import AudioBuffer
+from src.logic_component import WX_ASR
+
+ROOT_DIR = Path(__file__).parent.parent
+
+# 可调参数及默认搜索空间
+DEFAULT_SPACE: Dict[str, List[float]] = {
+    "noise_level": [0.005, 0.01, 0.02, 0.04],
+    "volume_gain": [0.6, 0.85, 1.0],
+    "stretch_spread": [0.01, 0.03, 0.05],
+    "pitch_spread": [0.5, 1.5, 2.5],
+}
+
+# 第一轮只评估每个片段的前若干秒
+EXCERPT_SECONDS: float = 30.0
+
+# 每轮保留的比例（逐轮淘汰）
+KEEP_FRACTION: float = 0.25
+
+# 优化目标："min" 让识别结果尽量偏离原文，"max" 尽量保持一致
+OBJECTIVES = ("min", "max")
+
+# 评估进程内的状态：每个进程只加载一次模型，并缓存已解码的片段
+_worker_asr: Optional[WX_ASR] = None
+_worker_buffers: Dict[str, AudioBuffer] = {}
+
+
+def grid_configs(space: Dict[str, Sequence[float]]) -> List[dict]:
+    """
+    网格搜索：枚举所有参数组合
+    """
+    names = list(space)
+    return [dict(zip(names, values)) for values in itertools.product(*space.values())]
+
+
+def random_configs(
+    space: Dict[str, Sequence[float]], n_samples: int, seed: int = 0
+) -> List[dict]:
+    """
+    随机搜索：每个参数在其取值列表的最小值与最大值之间均匀采样
+    """
+    rng = random.Random(seed)
+    return [
+        {
+            name: round(rng.uniform(min(values), max(values)), 4)
+            for name, values in space.items()
+        }
+        for _ in range(n_samples)
+    ]
+
+
+def _init_worker() -> None:
+    global _worker_asr
+    _worker_asr = WX_ASR()
+    _worker_asr.model
+
+
+def _load_clip(path: str) -> AudioBuffer:
+    if path not in _worker_buffers:
+        _worker_buffers[path] = AudioBuffer.load(path)
+    return _worker_buffers[path]
+
+
+def evaluate(
+    config: dict,
+    clips: List[str],
+    excerpt_seconds: Optional[float],
+    seed: int,
+    tier: str = stft_engine.DEFAULT_TIER,
+) -> dict:
+    """
+    用一组参数处理所有片段，转录后计算与原始转录的相似度
+
+    处理走与 WX_ASR.modify_audio 相同的 modify_buffer（相同的分段方式、随机参数与档位），
+    因此 stft_engine.seed(seed) 后用最佳参数调用 modify_audio 即可得到评估时的同一音频。
+    任一片段处理、转录或比较失败时，该组参数记录失败片段数与错误信息，不参与排序
+    （各项平均值只统计成功的片段）。
+
+    返回:
+        dict: 参数、各项平均相似度、平均字错误率、每个片段的综合相似度及失败片段数
+    """
+    similarities, word_sims, sentence_sims, char_errors = [], [], [], []
+    errors: List[str] = []
+
+    for path in clips:
+        try:
+            source = _load_clip(path)
+            if excerpt_seconds:
+                source = source.derive(
+                    source.samples[: int(excerpt_seconds * source.sr)], "excerpt"
+                )
+
+            # 固定种子，保证不同参数之间的比较只受参数影响
+            stft_engine.seed(seed)
+            modified = WX_ASR.modify_buffer(
+                source,
+                noise_level=config["noise_level"],
+                volume_gain=config["volume_gain"],
+                stretch_range=(
+                    1 - config["stretch_spread"],
+                    1 + config["stretch_spread"],
+                ),
+                pitch_range=(-config["pitch_spread"], config["pitch_spread"]),
+                tier=tier,
+            )
+            test = _worker_asr.transcribe(modified)["text"]
+
+            # 原始转录走内容缓存，同一片段只会真正识别一次
+            original = _worker_asr.transcribe(source)["text"]
+            result = _worker_asr.compare_texts(original, test)
+        except Exception as e:
+            result = {"错误": str(e)}
+        if "错误" in result:
+            errors.append(f"{Path(path).name}: {result['错误']}")
+            continue
+
+        analysis = result["比较结果"]["相似度分析"]
+        similarities.append(float(analysis["百分比"].strip("%")))
+        word_sims.append(float(analysis["语义分析"]["词语相似度"].strip("%")))
+        sentence_sims.append(float(analysis["语义分析"]["句子相似度"].strip("%")))
+        char_errors.append(
+            float(result["比较结果"]["错误率分析"]["字错误率"].strip("%"))
+        )
+
+    def mean(values: List[float]) -> float:
+        return round(float(np.mean(values)), 2) if values else float("nan")
+
+    return {
+        **config,
+        "综合相似度": mean(similarities),
+        "词语相似度": mean(word_sims),
+        "句子相似度": mean(sentence_sims),
+        "字错误率": mean(char_errors),
+        "片段相似度": json.dumps([round(v, 2) for v in similarities]),
+        "失败片段数": len(errors),
+        "错误": "; ".join(errors),
+    }
+
+
+def rank(results: List[dict], objective: str = "min") -> List[dict]:
+    """
+    按目标排序，有失败片段的组合排在最后（min 目标视为 +inf，max 目标视为 -inf）
+    """
+    worst = float("inf") if objective == "min" else float("-inf")
+    return sorted(
+        results,
+        key=lambda r: worst if r["失败片段数"] else r["综合相似度"],
+        reverse=objective == "max",
+    )
+
+
+def run_sweep(
+    clips: List[str],
+    configs: List[dict],
+    output_file: Optional[str] = None,
+    workers: int = 2,
+    excerpt_seconds: float = EXCERPT_SECONDS,
+    keep_fraction: float = KEEP_FRACTION,
+    objective: str = "min",
+    seed: int = 0,
+    tier: str = stft_engine.DEFAULT_TIER,
+) -> List[dict]:
+    """
+    并行评估所有参数组合，逐轮淘汰表现差的组合
+
+    第一轮只用每个片段的前 excerpt_seconds 秒评估全部组合，
+    按目标排序保留 keep_fraction 的组合，最后一轮用完整片段评估幸存者。
+
+    参数:
+        clips (list): 参与评估的音频/视频文件
+        configs (list): 参数组合列表（见 grid_configs / random_configs）
+        output_file (str): 结果表（CSV）路径，默认 media/output/sweep_results.csv
+        workers (int): 评估进程数（每个进程加载一份模型）
+        excerpt_seconds (float): 第一轮使用的片段时长，0 表示直接使用完整片段
+        keep_fraction (float): 每轮保留的比例
+        objective (str): "min" 相似度越低越好，"max" 相似度越高越好
+        seed (int): 所有组合共用的随机种子
+        tier (str): 处理档位，与最终调用 modify_audio 时使用的档位一致
+
+    返回:
+        List[dict]: 最终一轮的结果，按目标排序
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"[x] 不支持的优化目标：{objective}")
+    if tier not in stft_engine.TIERS:
+        raise ValueError(f"[x] 不支持的处理档位：{tier}")
+
+    output = (
+        Path(output_file)
+        if output_file
+        else ROOT_DIR / "media" / "output" / "sweep_results.csv"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+
+    # 先用片段开头筛选，再用完整片段评估幸存者
+    rounds = [excerpt_seconds, None] if excerpt_seconds else [None]
+    rows: List[dict] = []
+    survivors = configs
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        for round_index, excerpt in enumerate(rounds):
+            label = f"前{excerpt:g}秒" if excerpt else "完整片段"
+            print(
+                f"[...] 第 {round_index + 1} 轮（{label}）：评估 {len(survivors)} 组参数"
+            )
+
+            results = list(
+                pool.map(
+                    evaluate,
+                    survivors,
+                    itertools.repeat(clips),
+                    itertools.repeat(excerpt),
+                    itertools.repeat(seed),
+                    itertools.repeat(tier),
+                )
+            )
+            results = rank(results, objective)
+            rows.extend(
+                {"轮次": round_index + 1, "评估范围": label, **r} for r in results
+            )
+
+            # 失败的组合不进入下一轮
+            succeeded = [r for r in results if not r["失败片段数"]]
+            if not succeeded:
+                raise ValueError(f"[x] 第 {round_index + 1} 轮所有参数组合均评估失败")
+
+            if excerpt:
+                keep = max(1, int(np.ceil(len(succeeded) * keep_fraction)))
+                survivors = [
+                    {name: r[name] for name in configs[0]} for r in succeeded[:keep]
+                ]
+
+    with open(output, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+    print(f"[√] 参数扫描结果已保存至: {output}")
+    best = results[0]
+    print(
+        "[√] 最佳参数: "
+        + ", ".join(f"{name}={best[name]}" for name in configs[0])
+        + f"（综合相似度 {best['综合相似度']}%）"
+    )
+    print(
+        f"[√] 复现：stft_engine.seed({seed}) 后调用 WX_ASR.modify_audio("
+        f"noise_level={best['noise_level']}, volume_gain={best['volume_gain']}, "
+        f"stretch_range=(1 - {best['stretch_spread']}, 1 + {best['stretch_spread']}), "
+        f"pitch_range=(-{best['pitch_spread']}, {best['pitch_spread']}), tier={tier!r})"
+    )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="噪声/拉伸/音高参数扫描")
+    parser.add_argument("clips", nargs="+", help="参与评估的音频/视频文件")
+    parser.add_argument("-o", "--output", help="结果表路径（CSV）")
+    parser.add_argument("-w", "--workers", type=int, default=2, help="评估进程数")
+    parser.add_argument(
+        "--random", type=int, default=0, help="随机搜索的组合数，0 表示网格搜索"
+    )
+    parser.add_argument(
+        "--excerpt", type=float, default=EXCERPT_SECONDS, help="第一轮片段时长（秒）"
+    )
+    parser.add_argument(
+        "--keep", type=float, default=KEEP_FRACTION, help="每轮保留比例"
+    )
+    parser.add_argument("--objective", choices=OBJECTIVES, default="min")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--tier",
+        choices=list(stft_engine.TIERS),
+        default=stft_engine.DEFAULT_TIER,
+        help="处理档位",
+    )
+    args = parser.parse_args()
+
+    configs = (
+        random_configs(DEFAULT_SPACE, args.random, args.seed)
+        if args.random
+        else grid_configs(DEFAULT_SPACE)
+    )
+    run_sweep(
+        [str(Path(c).resolve()) for c in args.clips],
+        configs,
+        output_file=args.output,
+        workers=args.workers,
+        excerpt_seconds=args.excerpt,
+        keep_fraction=args.keep,
+        objective=args.objective,
+        seed=args.seed,
+        tier=args.tier,
+    )
+
+
+if __name__ == "__main__":
+    main()
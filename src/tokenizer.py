@@ -0,0 +1,109 @@
+import hashlib
+import threading
+from pathlib import Path
+from collections import OrderedDict
+from typing import Iterator, Optional, Tuple
+
+from src import lazy_import
+
+jieba = lazy_import.lazy("jieba")
+
+# jieba 前缀词典的序列化缓存，避免每次启动重新构建（约 1 秒）
+DICT_CACHE_FILE = Path(__file__).parent.parent / "media" / "cache" / "jieba.cache"
+
+# 分词结果的内存缓存条目上限（按最近使用淘汰）
+MAX_ENTRIES: int = 256
+
+_cache: "OrderedDict[bytes, Tuple[str, ...]]" = OrderedDict()
+_cache_lock = threading.Lock()
+_warm_thread: Optional[threading.Thread] = None
+
+
+def initialize() -> None:
+    """
+    加载 jieba 词典：优先读取序列化缓存文件，不存在时构建并写入该文件
+    """
+    if jieba.dt.initialized:
+        return
+    DICT_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    jieba.dt.cache_file = str(DICT_CACHE_FILE)
+    jieba.dt.tmp_dir = str(DICT_CACHE_FILE.parent)
+    jieba.initialize()
+
+
+def warm_up(background: bool = True) -> Optional[threading.Thread]:
+    """
+    预加载 jieba 词典，使第一次文本比较不再承担词典构建的延迟
+
+    参数:
+        background (bool): 在后台线程中加载（GUI 启动时不阻塞界面）
+
+    返回:
+        threading.Thread: 后台加载线程（同步加载或已加载时为 None）
+    """
+    global _warm_thread
+    # 尚未导入 jieba 时不在调用线程中检查，导入本身也交给后台线程
+    if lazy_import.is_loaded("jieba") and jieba.dt.initialized:
+        return None
+    if not background:
+        initialize()
+        return None
+
+    # 多次调用只启动一个加载线程
+    with _cache_lock:
+        if _warm_thread is None or not _warm_thread.is_alive():
+            _warm_thread = threading.Thread(target=initialize, daemon=True)
+            _warm_thread.start()
+        return _warm_thread
+
+
+def tokenize(text: str) -> Tuple[str, ...]:
+    """
+    jieba 分词（结果与 jieba.cut 一致，包含标点和空白）
+
+    以文本的哈希为键缓存分词结果，同一段文本在重复比较中只分词一次。
+    """
+    key = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+    with _cache_lock:
+        tokens = _cache.get(key)
+        if tokens is not None:
+            _cache.move_to_end(key)
+            return tokens
+
+    initialize()
+    tokens = tuple(jieba.cut(text))
+
+    with _cache_lock:
+        _cache[key] = tokens
+        while len(_cache) > MAX_ENTRIES:
+            _cache.popitem(last=False)
+    return tokens
+
+
+def _is_word(token: str) -> bool:
+    return any(ch.isalnum() for ch in token)
+
+
+def words(text: str) -> Tuple[str, ...]:
+    """
+    去掉空白与标点后的词语序列（至少包含一个文字或数字字符）
+    """
+    return tuple(token for token in tokenize(text) if _is_word(token))
+
+
+def iter_words(text: str) -> Iterator[str]:
+    """
+    逐个产出词语（过滤规则同 words），不写入分词缓存，适合一次性扫描的长文本
+    """
+    initialize()
+    for token in jieba.cut(text):
+        if _is_word(token):
+            yield token
+
+
+def clear() -> None:
+    """
+    清空分词结果缓存
+    """
+    with _cache_lock:
+        _cache.clear()
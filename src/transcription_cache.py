@@ -0,0 +1,132 @@
+import os
+import json
+import hashlib
+import tempfile
+import threading
+import numpy as np
+from pathlib import Path
+from typing import Optional, Union
+
+# 默认缓存目录与容量上限
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent / "media" / "cache" / "transcribe"
+DEFAULT_MAX_BYTES: int = 256 * 1024 * 1024
+
+# 保存到缓存中的分段字段
+SEGMENT_KEYS = ("id", "start", "end", "text", "avg_logprob", "no_speech_prob")
+
+
+def evict_lru(directory: Path, pattern: str, max_bytes: int) -> int:
+    """
+    按最近使用时间（mtime）删除最旧的缓存文件，直至总大小不超过上限
+
+    返回:
+        int: 被删除的文件数量
+    """
+    entries = []
+    for path in Path(directory).glob(pattern):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            path.unlink()
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+
+    return removed
+
+
+class TranscriptionCache:
+    """
+    基于内容哈希的转录结果磁盘缓存
+
+    键由解码后的音频数据、模型名称、语言和解码参数共同决定，
+    同一段音频无论文件名如何变化都会命中缓存。
+    超出容量上限时按最近使用时间（文件 mtime）淘汰。
+    """
+
+    def __init__(
+        self,
+        cache_dir: Union[str, Path] = DEFAULT_CACHE_DIR,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(audio: np.ndarray, model_name: str, options: dict) -> str:
+        """
+        计算缓存键：音频内容哈希 + 模型名称 + 解码参数
+        """
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(np.ascontiguousarray(audio).tobytes())
+        digest.update(model_name.encode("utf-8"))
+        digest.update(json.dumps(options, sort_keys=True, default=str).encode("utf-8"))
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional[dict]:
+        """
+        读取缓存，命中时刷新其最近使用时间
+        """
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                result = json.load(f)
+            os.utime(path)
+            return result
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def put(self, key: str, result: dict) -> dict:
+        """
+        写入缓存（原子替换），并在超出容量时淘汰最久未使用的条目
+
+        返回:
+            dict: 实际写入的条目（只保留文本和分段的主要字段）
+        """
+        entry = {
+            "text": result.get("text", ""),
+            "segments": [
+                {k: seg[k] for k in SEGMENT_KEYS if k in seg}
+                for seg in result.get("segments", [])
+            ],
+        }
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(suffix=".tmp", dir=self.cache_dir)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(temp_path, self._path(key))
+
+        self.evict()
+        return entry
+
+    def evict(self) -> int:
+        """
+        按 LRU 淘汰直至总大小不超过上限
+
+        返回:
+            int: 被删除的条目数量
+        """
+        with self._lock:
+            return evict_lru(self.cache_dir, "*.json", self.max_bytes)
+
+    def clear(self) -> None:
+        """
+        清空缓存目录
+        """
+        for path in self.cache_dir.glob("*.json"):
+            path.unlink(missing_ok=True)
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# 测试直接以 src 包的形式导入项目模块
+sys.path.append(str(Path(__file__).parent.parent))
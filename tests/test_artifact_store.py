@@ -0,0 +1,80 @@
+import os
+
+import numpy as np
+import pytest
+
+from src.artifact_store import ArtifactStore, link_or_copy
+from src.audio_buffer import AudioBuffer
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ArtifactStore(tmp_path / "artifacts")
+
+
+def test_link_or_copy_hardlinks(tmp_path):
+    source = tmp_path / "source.wav"
+    source.write_bytes(b"audio")
+
+    target = link_or_copy(source, tmp_path / "copies" / "target.wav")
+    assert target.read_bytes() == b"audio"
+    assert os.path.samefile(source, target)
+    assert [name for name in os.listdir(target.parent)] == ["target.wav"]
+
+
+def test_link_or_copy_falls_back_to_copy(monkeypatch, tmp_path):
+    def no_link(*args):
+        raise OSError("跨文件系统")
+
+    monkeypatch.setattr(os, "link", no_link)
+    source = tmp_path / "source.wav"
+    source.write_bytes(b"audio")
+
+    target = link_or_copy(source, tmp_path / "target.wav")
+    assert target.read_bytes() == b"audio"
+    assert not os.path.samefile(source, target)
+
+
+def test_identical_artifacts_share_one_blob(store, tmp_path):
+    path = tmp_path / "modified.wav"
+    path.write_bytes(b"same content")
+
+    first = store.create_job("pipeline")
+    second = store.create_job("pipeline")
+    digest = store.put_file(first, "modified.wav", path)
+    assert store.put_bytes(second, "modified.wav", b"same content") == digest
+    assert store.put_file(second, "copy.wav", path, link=True) == digest
+
+    blobs = [name for _, _, files in os.walk(store.blob_dir) for name in files]
+    assert blobs == [digest]
+    assert store.get_job(second)["artifacts"]["copy.wav"]["size"] == len(
+        b"same content"
+    )
+
+
+def test_linked_file_is_not_copied(store, tmp_path):
+    path = tmp_path / "modified.wav"
+    path.write_bytes(b"output")
+    job = store.create_job("pipeline")
+
+    store.put_file(job, "modified.wav", path, link=True)
+    assert os.path.samefile(store.artifact_path(job, "modified.wav"), path)
+
+
+def test_jobs_round_trip(store, tmp_path):
+    source = tmp_path / "input.wav"
+    source.write_bytes(b"input")
+    job = store.create_job("pipeline", source, params={"seed": 1})
+    store.put_text(job, "original.txt", "今天天气很好")
+    store.put_json(job, "segments.json", [{"text": "今天"}])
+    store.put_audio(job, "clip.wav", AudioBuffer(np.zeros(160, np.float32), 16000))
+    store.put_metrics(job, {"cer": 0.25})
+    store.finish_job(job)
+
+    assert store.get_text(job, "original.txt") == "今天天气很好"
+    assert store.get_json(job, "segments.json") == [{"text": "今天"}]
+    assert store.get_metrics(job) == {"cer": 0.25}
+    assert [found["id"] for found in store.find_jobs(source=str(source))] == [job]
+    assert store.find_jobs(source=str(source), params={"seed": 2}) == []
+    with pytest.raises(KeyError):
+        store.artifact_path(job, "missing.txt")
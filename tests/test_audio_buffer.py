@@ -0,0 +1,77 @@
+import os
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from src import audio_buffer
+from src.audio_buffer import WHISPER_SAMPLE_RATE, AudioBuffer
+
+
+@pytest.fixture
+def buffer():
+    rng = np.random.default_rng(0)
+    samples = rng.uniform(-0.5, 0.5, 3 * audio_buffer.WRITE_BLOCK + 17)
+    return AudioBuffer(samples.astype(np.float32), 22050, source="input.wav")
+
+
+@pytest.mark.parametrize(
+    "name, encoding, subtype",
+    [
+        ("out.wav", None, "PCM_16"),
+        ("out.wav", "float32", "FLOAT"),
+        ("out.flac", None, "PCM_16"),
+    ],
+)
+def test_write_encodings(tmp_path, buffer, name, encoding, subtype):
+    path = tmp_path / name
+    buffer.write(str(path), encoding)
+
+    info = sf.info(str(path))
+    assert info.subtype == subtype
+    assert info.frames == len(buffer.samples)
+    # 分块写出与一次性写出的内容一致，临时文件已被替换
+    data, sr = sf.read(str(path), dtype="float32")
+    assert sr == buffer.sr
+    tolerance = 0 if subtype == "FLOAT" else 1 / 32768
+    np.testing.assert_allclose(data, buffer.samples, atol=tolerance)
+    assert os.listdir(tmp_path) == [name]
+
+
+def test_pcm16_matches_soundfile_default(tmp_path, buffer):
+    buffer.write(str(tmp_path / "chunked.wav"))
+    sf.write(str(tmp_path / "direct.wav"), buffer.samples, buffer.sr)
+    assert (tmp_path / "chunked.wav").read_bytes() == (
+        tmp_path / "direct.wav"
+    ).read_bytes()
+
+
+def test_mismatched_encoding_raises(tmp_path, buffer):
+    with pytest.raises(ValueError):
+        buffer.write(str(tmp_path / "out.wav"), "flac")
+    with pytest.raises(ValueError):
+        buffer.write(str(tmp_path / "out.wav"), "mp3")
+
+
+def test_intermediate_round_trip(tmp_path, buffer):
+    path = buffer.save_intermediate(str(tmp_path / "clip.npy"))
+    loaded = AudioBuffer.load(path)
+    assert isinstance(loaded.samples, np.memmap)
+    np.testing.assert_array_equal(loaded.samples, buffer.samples)
+    assert (loaded.sr, loaded.source) == (buffer.sr, buffer.source)
+    assert loaded.history[-1] == "mmap"
+
+    # 写时复制：修改映射不会改动文件
+    loaded.samples[0] = 1.0
+    np.testing.assert_array_equal(np.load(path), buffer.samples)
+
+    AudioBuffer.remove_intermediate(path)
+    assert os.listdir(tmp_path) == []
+
+
+def test_whisper_intermediate_skips_resampling(tmp_path, buffer):
+    path = buffer.save_intermediate(str(tmp_path / "clip.npy"), for_whisper=True)
+    loaded = AudioBuffer.open_intermediate(path)
+    assert loaded.sr == WHISPER_SAMPLE_RATE
+    assert loaded.for_whisper() is loaded.samples
+    np.testing.assert_allclose(loaded.samples, buffer.for_whisper())
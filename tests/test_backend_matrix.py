@@ -0,0 +1,109 @@
+import threading
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from src import asr_backends, backend_matrix, model_registry, segment_asr
+from src.asr_backends import ASRBackend
+
+
+class EchoBackend(ASRBackend):
+    """
+    返回固定文本的引擎
+    """
+
+    name = "echo"
+
+    def __init__(self, text: str = "今天天气很好") -> None:
+        self.text = text
+
+    def load(self) -> None:
+        pass
+
+    def transcribe(self, audio: np.ndarray) -> str:
+        return self.text
+
+
+class BrokenBackend(ASRBackend):
+    """
+    识别时抛出异常的引擎
+    """
+
+    name = "broken"
+
+    def load(self) -> None:
+        pass
+
+    def transcribe(self, audio: np.ndarray) -> str:
+        raise RuntimeError("模型损坏")
+
+
+class UnpicklableBackend(EchoBackend):
+    """
+    识别结果无法传回主进程的引擎（对应的 future 抛出异常）
+    """
+
+    name = "unpicklable"
+
+    def transcribe(self, audio: np.ndarray):
+        return lambda: None
+
+
+@pytest.fixture
+def wav_file(tmp_path):
+    path = tmp_path / "input.wav"
+    sf.write(path, np.random.default_rng(0).normal(0, 0.1, 16000), 16000)
+    return str(path)
+
+
+def test_failing_backend_does_not_abort_matrix(monkeypatch, tmp_path, wav_file):
+    # 工作进程以 fork 启动，继承这里注册的引擎
+    monkeypatch.setitem(asr_backends.BACKENDS, "echo", EchoBackend)
+    monkeypatch.setitem(asr_backends.BACKENDS, "broken", BrokenBackend)
+    monkeypatch.setitem(asr_backends.BACKENDS, "unpicklable", UnpicklableBackend)
+
+    report = backend_matrix.run_matrix(
+        wav_file,
+        backends=["echo", "broken", "unpicklable", "echo:今天天气不错"],
+        output_file=str(tmp_path / "matrix.json"),
+    )
+
+    runs = {run["backend"]: run for run in report["runs"]}
+    assert "模型损坏" in runs["broken"]["error"]
+    assert runs["unpicklable"]["error"]
+    assert runs["echo"]["text"] == "今天天气很好"
+    assert report["backends"] == ["echo", "echo:今天天气不错"]
+    assert len(report["cer_matrix"]) == 2
+    assert report["cer_matrix"][0][0] == 0
+
+
+def test_batch_texts_follow_window_index(monkeypatch):
+    # 相邻窗口的起始时间四舍五入到毫秒后相同，仍应各自对应回原片段
+    def fake_transcribe_windows(model, audio, windows, language):
+        return [
+            {"id": 0, "window": 1, "start": 0.0, "end": 0.0, "text": "第二段"},
+            {"id": 1, "window": 2, "start": 0.0, "end": 0.0, "text": "第三段"},
+        ]
+
+    monkeypatch.setattr(model_registry, "get_model", lambda *args: object())
+    monkeypatch.setattr(
+        model_registry, "inference_lock", lambda *args: threading.Lock()
+    )
+    monkeypatch.setattr(segment_asr, "transcribe_windows", fake_transcribe_windows)
+
+    backend = asr_backends.WhisperBackend()
+    audios = [np.zeros(1, np.float32) for _ in range(3)]
+    assert backend.transcribe_batch(audios) == ["", "第二段", "第三段"]
+
+
+def test_whisper_close_keeps_shared_model(monkeypatch):
+    shared = object()
+    monkeypatch.setattr(model_registry, "get_model", lambda *args: shared)
+    monkeypatch.setattr(
+        model_registry, "evict", lambda *args: pytest.fail("不应释放共享模型")
+    )
+
+    with asr_backends.WhisperBackend() as backend:
+        assert backend.model is shared
+    assert backend._model is None
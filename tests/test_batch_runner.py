@@ -0,0 +1,74 @@
+import time
+from pathlib import Path
+
+import pytest
+
+from src import batch_runner
+
+
+def fake_modify_job(input_path, output_path, encoding, intermediate_dir, tier):
+    # 修改很快：只写出两个中间文件，并记录此时磁盘上已有的中间文件数
+    directory = Path(intermediate_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    stem = Path(output_path).stem
+    intermediates = [str(directory / f"{stem}.{name}.npy") for name in ("a", "b")]
+    for path in intermediates:
+        Path(path).write_bytes(b"")
+    return {
+        "input": input_path,
+        "output": output_path,
+        "duration": 1.0,
+        "intermediates": intermediates,
+        "pending_intermediates": len(list(directory.glob("*.npy"))),
+    }
+
+
+def fake_transcribe_job(input_path, output_path, intermediates=None):
+    # 转录较慢，完成后删除中间文件
+    time.sleep(0.05)
+    for path in intermediates:
+        Path(path).unlink()
+    if Path(input_path).stem == "broken":
+        raise RuntimeError("识别失败")
+    return {"original_text": "原文", "modified_text": "原文", "cer": 0.0}
+
+
+def noop(*args) -> None:
+    pass
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    source = tmp_path / "input"
+    source.mkdir()
+    for i in range(12):
+        (source / f"clip{i:02d}.wav").write_bytes(b"")
+    (source / "broken.wav").write_bytes(b"")
+    return source
+
+
+def test_intermediates_bounded_by_in_flight_cap(monkeypatch, tmp_path, inputs):
+    monkeypatch.setattr(batch_runner, "modify_job", fake_modify_job)
+    monkeypatch.setattr(batch_runner, "transcribe_job", fake_transcribe_job)
+    monkeypatch.setattr(batch_runner, "_init_asr_worker", noop)
+
+    output = tmp_path / "output"
+    stats = batch_runner.run_batch(str(inputs), str(output), workers=4, asr_workers=1)
+    assert stats["文件数"] == 12
+
+    records = [
+        batch_runner.json.loads(line)
+        for line in (output / batch_runner.PROGRESS_FILE).read_text().splitlines()
+    ]
+    done = [r for r in records if r["status"] == "done"]
+    failed = [r for r in records if r["status"] == "failed"]
+    assert len(done) == 12 and len(failed) == 1
+
+    # 每个文件两份中间文件，同时在处理的文件不超过 2 × 转录进程数
+    cap = batch_runner.IN_FLIGHT_PER_ASR_WORKER * 1
+    assert max(r["pending_intermediates"] for r in done) <= 2 * cap
+    assert not list((output / ".intermediate").glob("*.npy"))
+
+    # 续跑时跳过已完成的文件，只重试失败的文件
+    stats = batch_runner.run_batch(str(inputs), str(output), workers=4, asr_workers=1)
+    assert stats["文件数"] == 0
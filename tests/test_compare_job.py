@@ -0,0 +1,51 @@
+import pytest
+
+from src import artifact_store
+from src.artifact_store import ArtifactStore
+from src.logic_component import WX_ASR
+
+ORIGINAL = "今天天气很好。我们去公园散步。"
+MODIFIED = "今天天气很好。我们去公园跑步。"
+
+
+@pytest.fixture
+def wx(monkeypatch, tmp_path):
+    store = ArtifactStore(tmp_path / "artifacts")
+    monkeypatch.setattr(artifact_store, "_default_store", store)
+    return WX_ASR()
+
+
+@pytest.fixture
+def job_id(wx, tmp_path):
+    source = tmp_path / "clip.wav"
+    source.write_bytes(b"clip")
+    return wx.store.create_job("pipeline", str(source))
+
+
+def test_repetition_rate_reads_job_artifacts(wx, job_id):
+    wx.store.put_text(job_id, "original.txt", ORIGINAL)
+    wx.store.put_text(job_id, "modified.txt", MODIFIED)
+
+    cer = wx.get_subtitle_repetition_rate(job_id, metric="cer")
+    expected = wx.compare_texts(ORIGINAL, MODIFIED)["比较结果"]["错误率分析"][
+        "字错误率"
+    ]
+    assert cer == expected
+    assert wx.store.get_json(job_id, "comparison.json")["比较结果"]
+    assert set(wx.store.get_metrics(job_id)) == {"similarity", "cer", "wer"}
+
+
+def test_repetition_rate_missing_artifact_reports_error(wx, job_id):
+    wx.store.put_text(job_id, "original.txt", ORIGINAL)
+
+    assert wx.get_subtitle_repetition_rate(job_id).startswith("Error:")
+
+
+def test_compare_transcriptions_uses_given_files(wx, tmp_path):
+    original = tmp_path / "a.txt"
+    modified = tmp_path / "b.txt"
+    original.write_text(ORIGINAL, encoding="utf-8")
+    modified.write_text(ORIGINAL, encoding="utf-8")
+
+    result = wx.compare_transcriptions(str(original), str(modified))
+    assert result["比较结果"]["错误率分析"]["字错误率"] == "0.00%"
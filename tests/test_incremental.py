@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from src.audio_buffer import AudioBuffer
+from src.incremental import IncrementalProcessor, silence_bounds, transcription_windows
+
+SAMPLE_RATE = 16000
+N_SEGMENTS = 4
+
+
+class CountingASR:
+    """
+    记录每次识别的音频，按调用次序返回文本
+    """
+
+    def __init__(self) -> None:
+        self.calls = []
+
+    def transcribe(self, buffer: AudioBuffer) -> dict:
+        self.calls.append(buffer.samples.copy())
+        return {"text": f"段{len(self.calls)}"}
+
+
+@pytest.fixture
+def buffer():
+    t = np.arange(2 * SAMPLE_RATE) / SAMPLE_RATE
+    samples = (0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+    # 在等分点附近放一段静音，分段边界应落在静音处
+    samples[int(0.55 * SAMPLE_RATE) : int(0.6 * SAMPLE_RATE)] = 0
+    return AudioBuffer(samples=samples, sr=SAMPLE_RATE, source="input.wav")
+
+
+@pytest.fixture
+def processor(tmp_path):
+    return IncrementalProcessor(
+        CountingASR(), cache_dir=tmp_path, n_segments=N_SEGMENTS
+    )
+
+
+def test_silence_bounds_move_to_silence(buffer):
+    bounds = silence_bounds(buffer.samples, buffer.sr, N_SEGMENTS)
+    assert bounds[0] == 0 and bounds[-1] == len(buffer.samples)
+    assert np.all(np.diff(bounds) >= 0)
+    assert 0.55 * SAMPLE_RATE <= bounds[1] <= 0.6 * SAMPLE_RATE
+
+
+def test_transcription_windows_group_by_duration():
+    bounds = [0, 10, 20, 20, 40]
+    # 空段被跳过，超过窗口时长时另起一个窗口
+    assert transcription_windows(bounds, sr=1, window_seconds=20) == [[0, 1], [3]]
+
+
+def test_only_changed_segments_are_recomputed(processor, buffer):
+    first = processor.process(buffer, seed=3, transcribe=False)
+    assert first["recomputed"] == list(range(N_SEGMENTS))
+
+    # 只改增益与噪声：全部命中缓存
+    again = processor.process(buffer, seed=3, gain=0.5, noise=0.01, transcribe=False)
+    assert again["recomputed"] == []
+
+    # 单独重抽一段：只有该段重新计算
+    resampled = processor.process(
+        buffer, seed=3, segment_seeds={2: 9}, transcribe=False
+    )
+    assert resampled["recomputed"] == [2]
+
+    # 相同参数再次处理得到完全相同的音频
+    repeat = processor.process(buffer, seed=3, transcribe=False)
+    np.testing.assert_array_equal(repeat["audio"].samples, first["audio"].samples)
+
+
+def test_transcribes_each_window(processor, buffer):
+    result = processor.process(buffer, seed=0)
+    asr = processor.wx_asr
+    assert len(asr.calls) == len(result["segments"])
+    assert [seg["ids"] for seg in result["segments"]] == [list(range(N_SEGMENTS))]
+    assert result["text"] == "段1"
+    assert result["segments"][0]["start"] == 0
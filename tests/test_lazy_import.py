@@ -0,0 +1,40 @@
+import subprocess
+import sys
+from pathlib import Path
+
+from src import lazy_import
+
+ROOT_DIR = Path(__file__).parent.parent
+
+
+def loaded_after(code: str) -> set:
+    """
+    在新的解释器中执行 code，返回其后已导入的重量级依赖
+    """
+    script = (
+        "import sys\n"
+        f"{code}\n"
+        f"print(','.join(m for m in {lazy_import.HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=ROOT_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return set(filter(None, output.rstrip("\n").rpartition("\n")[2].split(",")))
+
+
+def test_default_instance_imports_nothing_heavy():
+    assert loaded_after("from src.logic_component import WX_ASR\nWX_ASR()") == set()
+
+
+def test_warm_up_imports_in_background():
+    loaded = loaded_after(
+        "from src.logic_component import WX_ASR\n"
+        "from src import tokenizer\n"
+        "WX_ASR(warm_up=True)\n"
+        "tokenizer.warm_up().join()"
+    )
+    assert "jieba" in loaded
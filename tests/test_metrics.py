@@ -0,0 +1,76 @@
+import random
+
+import pytest
+
+from src import metrics
+
+# 随机用例数量与序列长度上限（小字母表使对齐路径出现大量平局）
+N_CASES: int = 5000
+MAX_LENGTH: int = 30
+
+
+def dp_distance(a, b) -> int:
+    """
+    教科书式的 O(n * m) Levenshtein 动态规划，作为位并行实现的对照
+    """
+    previous = list(range(len(b) + 1))
+    for i, x in enumerate(a, 1):
+        current = [i]
+        for j, y in enumerate(b, 1):
+            current.append(
+                min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (x != y))
+            )
+        previous = current
+    return previous[-1]
+
+
+def random_cases(n_cases: int, seed: int = 0):
+    rng = random.Random(seed)
+    for _ in range(n_cases):
+        alphabet = "abcd"[: rng.randint(1, 4)]
+        a = [rng.choice(alphabet) for _ in range(rng.randint(0, MAX_LENGTH))]
+        b = [rng.choice(alphabet) for _ in range(rng.randint(0, MAX_LENGTH))]
+        yield a, b
+
+
+def test_edit_distance_matches_dp():
+    for a, b in random_cases(N_CASES):
+        assert metrics.edit_distance(a, b) == dp_distance(a, b), (a, b)
+
+
+def test_align_counts_form_optimal_path():
+    for ref, hyp in random_cases(N_CASES, seed=1):
+        result = metrics.align(ref, hyp)
+        distance = dp_distance(ref, hyp)
+
+        assert result["距离"] == distance, (ref, hyp)
+        assert result["替换"] + result["插入"] + result["删除"] == distance
+        assert result["插入"] - result["删除"] == len(hyp) - len(ref)
+        assert result["正确"] + result["替换"] + result["删除"] == len(ref)
+        assert min(result["替换"], result["插入"], result["删除"], result["正确"]) >= 0
+
+
+def test_long_sequences_match_dp():
+    # 超过一个机器字长和初始带宽的序列
+    rng = random.Random(2)
+    for _ in range(5):
+        ref = [rng.choice("abcdef") for _ in range(400)]
+        hyp = list(ref)
+        for _ in range(rng.randint(0, 150)):
+            position = rng.randrange(len(hyp) + 1)
+            operation = rng.random()
+            if operation < 0.4 and hyp:
+                del hyp[min(position, len(hyp) - 1)]
+            elif operation < 0.7:
+                hyp.insert(position, rng.choice("abcdefg"))
+            elif hyp:
+                hyp[min(position, len(hyp) - 1)] = rng.choice("abcdefg")
+
+        assert metrics.align(ref, hyp)["距离"] == dp_distance(ref, hyp)
+
+
+def test_cer_handles_insertion_without_positional_shift():
+    result = metrics.cer("今天天气很好", "我今天天气很好")
+    assert result["插入"] == 1
+    assert result["替换"] == 0 and result["删除"] == 0
+    assert result["错误率"] == pytest.approx(1 / 6)
@@ -0,0 +1,62 @@
+from types import SimpleNamespace
+
+import pytest
+
+from src import model_registry
+
+
+@pytest.fixture
+def loads(monkeypatch):
+    """
+    替换 whisper.load_model，记录实际加载的次数
+    """
+    calls = []
+
+    def load_model(name, device=None):
+        calls.append((name, device))
+        return SimpleNamespace(name=name, device=device)
+
+    monkeypatch.setattr(
+        model_registry, "whisper", SimpleNamespace(load_model=load_model)
+    )
+    monkeypatch.setattr(
+        model_registry,
+        "torch",
+        SimpleNamespace(cuda=SimpleNamespace(is_available=lambda: False)),
+    )
+    monkeypatch.setattr(model_registry, "_models", {})
+    return calls
+
+
+def test_same_config_shares_one_model(loads):
+    first = model_registry.get_model("base", "cpu")
+    second = model_registry.get_model("base", "cpu")
+    other = model_registry.get_model("tiny", "cpu")
+
+    assert first is second
+    assert other is not first
+    assert loads == [("base", "cpu"), ("tiny", "cpu")]
+    assert sorted(model_registry.loaded_models()) == [
+        ("base", "cpu", "fp32"),
+        ("tiny", "cpu", "fp32"),
+    ]
+
+
+def test_evict_reloads_on_next_use(loads):
+    model_registry.get_model("base", "cpu")
+    model_registry.get_model("tiny", "cpu")
+
+    assert model_registry.evict("base", "cpu") == 1
+    assert model_registry.loaded_models() == [("tiny", "cpu", "fp32")]
+
+    model_registry.get_model("base", "cpu")
+    assert loads.count(("base", "cpu")) == 2
+
+
+@pytest.mark.parametrize(
+    "dtype, device", [("fp16", "cpu"), ("int8", "cuda"), ("bf16", "cpu")]
+)
+def test_mismatched_dtype_rejected_before_loading(loads, dtype, device):
+    with pytest.raises(ValueError):
+        model_registry.get_model("base", device, dtype)
+    assert loads == []
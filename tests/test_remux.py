@@ -0,0 +1,75 @@
+import json
+import os
+import stat
+import sys
+
+import numpy as np
+import pytest
+
+from src import remux
+from src.audio_buffer import AudioBuffer
+
+# 假的 ffmpeg：记录参数与标准输入长度；复制视频流时失败，重新编码时写出输出文件
+FAKE_FFMPEG = f"""#!{sys.executable}
+import json, sys
+args = sys.argv[1:]
+data = sys.stdin.buffer.read()
+with open({{log!r}}, "a") as f:
+    f.write(json.dumps({{{{"args": args, "stdin": len(data)}}}}) + "\\n")
+if args[args.index("-c:v") + 1] == "copy":
+    sys.stderr.write("codec not supported in container")
+    sys.exit(1)
+open(args[-1], "wb").write(b"video")
+"""
+
+
+@pytest.fixture
+def ffmpeg_log(monkeypatch, tmp_path):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    log = tmp_path / "ffmpeg.log"
+    script = bin_dir / "ffmpeg"
+    script.write_text(FAKE_FFMPEG.format(log=str(log)))
+    script.chmod(script.stat().st_mode | stat.S_IEXEC)
+    monkeypatch.setenv("PATH", str(bin_dir) + os.pathsep + os.environ["PATH"])
+    return log
+
+
+def read_calls(log):
+    return [json.loads(line) for line in log.read_text().splitlines()]
+
+
+def test_falls_back_to_reencoding(ffmpeg_log, tmp_path):
+    output = tmp_path / "out" / "video.mp4"
+    samples = np.zeros((16000, 2), np.float32)
+    remux.replace_audio(
+        "input.avi", AudioBuffer(samples=samples, sr=16000), str(output)
+    )
+
+    calls = read_calls(ffmpeg_log)
+    codecs = [call["args"][call["args"].index("-c:v") + 1] for call in calls]
+    assert codecs == ["copy", remux.FALLBACK_VIDEO_CODEC]
+    for call in calls:
+        assert "-nostdin" in call["args"]
+        assert call["args"][call["args"].index("-ac") + 1] == "2"
+        # 采样数据经管道传入
+        assert call["stdin"] == samples.nbytes
+
+    assert output.read_bytes() == b"video"
+    # 临时文件已被替换或清理
+    assert os.listdir(output.parent) == ["video.mp4"]
+
+
+def test_failure_cleans_up_temp_file(monkeypatch, ffmpeg_log, tmp_path):
+    monkeypatch.setattr(remux, "FALLBACK_VIDEO_CODEC", "copy")
+    output = tmp_path / "video.mp4"
+    with pytest.raises(ValueError, match="codec not supported"):
+        remux.replace_audio("input.avi", "audio.wav", str(output))
+
+    calls = read_calls(ffmpeg_log)
+    assert len(calls) == 2
+    args = calls[0]["args"]
+    inputs = [args[i + 1] for i, arg in enumerate(args) if arg == "-i"]
+    assert inputs == ["input.avi", "audio.wav"]
+    assert not output.exists()
+    assert [name for name in os.listdir(tmp_path) if name.startswith(".")] == []
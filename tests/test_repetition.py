@@ -0,0 +1,81 @@
+import json
+import os
+import random
+import subprocess
+import sys
+from pathlib import Path
+
+from src import repetition
+from src.repetition import CountMinSketch, RepetitionAnalyzer
+
+ROOT = Path(__file__).parent.parent
+
+ITEMS = ["今天", "天气", ("今天", "天气"), 42]
+
+
+def random_words(seed: int, n: int = 5000):
+    rng = random.Random(seed)
+    vocab = [f"词{i}" for i in range(300)]
+    return [rng.choice(vocab) for _ in range(n)]
+
+
+def test_sketch_indices_are_deterministic_across_processes():
+    # 子进程的字符串哈希随机化不同，计数器位置仍应一致
+    script = (
+        "import json; from src.repetition import CountMinSketch; "
+        "sketch = CountMinSketch(1000, seed=7); "
+        "print(json.dumps([sketch._indices(item) for item in "
+        "['今天', '天气', ('今天', '天气'), 42]]))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=ROOT,
+        env={**os.environ, "PYTHONHASHSEED": "123"},
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    sketch = CountMinSketch(1000, seed=7)
+    assert json.loads(output) == [sketch._indices(item) for item in ITEMS]
+
+
+def test_sketch_seeds_change_indices():
+    first, second = CountMinSketch(1 << 20, seed=0), CountMinSketch(1 << 20, seed=1)
+    assert [first._indices(item) for item in ITEMS] != [
+        second._indices(item) for item in ITEMS
+    ]
+
+
+def test_sketch_never_underestimates():
+    words = random_words(0)
+    sketch = CountMinSketch(64, seed=3)
+    for word in words:
+        sketch.add(word)
+    for word in set(words):
+        assert sketch.estimate(word) >= words.count(word)
+
+
+def test_approximate_analyzer_close_to_exact():
+    words = random_words(1)
+    exact = RepetitionAnalyzer().feed(words).result()
+    approximate = RepetitionAnalyzer(sketch_width=4096).feed(words).result()
+
+    assert not exact["近似统计"] and approximate["近似统计"]
+    assert approximate["总字数"] == exact["总字数"] == len(words)
+    # 近似计数只会偏高，宽度足够时与精确值几乎一致
+    assert 0 <= exact["重复字数"] - approximate["重复字数"] <= 5
+    assert (
+        approximate["高频重复词"][0]["出现次数"] >= exact["高频重复词"][0]["出现次数"]
+    )
+
+
+def test_file_chunks_do_not_split_words(monkeypatch, tmp_path):
+    # 按空白切分的假分词器，便于检查切块位置
+    monkeypatch.setattr(
+        repetition.tokenizer, "iter_words", lambda text: iter(text.split())
+    )
+    path = tmp_path / "archive.txt"
+    path.write_text("今天 天气 很好 " * 50, encoding="utf-8")
+
+    words = list(repetition.iter_file_words(str(path), chunk_chars=7))
+    assert words == ["今天", "天气", "很好"] * 50
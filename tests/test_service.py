@@ -0,0 +1,98 @@
+import asyncio
+import os
+import time
+
+import pytest
+
+from src import service
+from src.service import JobService
+
+
+def fake_init_worker(*args) -> None:
+    pass
+
+
+def slow_modify_task(path, output_dir, job_id, options):
+    if options.get("crash"):
+        # 模拟工作进程被系统终止
+        os._exit(1)
+    time.sleep(options.get("seconds", 0))
+    return {"audio": path}
+
+
+def fake_transcribe_task(path, mode):
+    return {"text": "今天天气很好", "segments": [], "asr_seconds": 0.0}
+
+
+def fake_compare_task(original, test):
+    return {"相同": original == test}
+
+
+@pytest.fixture
+def patched(monkeypatch):
+    # 工作进程以 fork 启动，继承替换后的任务函数
+    monkeypatch.setattr(service, "_init_worker", fake_init_worker)
+    monkeypatch.setattr(service, "modify_task", slow_modify_task)
+    monkeypatch.setattr(service, "transcribe_task", fake_transcribe_task)
+    monkeypatch.setattr(service, "compare_task", fake_compare_task)
+
+
+async def wait_finished(job, timeout: float = 10.0) -> None:
+    async with job.changed:
+        await asyncio.wait_for(
+            job.changed.wait_for(lambda: job.status in service.FINISHED), timeout
+        )
+
+
+def run(coroutine_function, **options):
+    async def main():
+        svc = JobService(asr_workers=1, cpu_workers=1, **options)
+        await svc.start()
+        try:
+            return await coroutine_function(svc)
+        finally:
+            svc.close()
+
+    return asyncio.run(main())
+
+
+def test_transcription_not_blocked_by_full_cpu_queue(patched, tmp_path):
+    clip = tmp_path / "clip.wav"
+    clip.write_bytes(b"")
+
+    async def scenario(svc):
+        # CPU 进程忙于一个慢任务，另有一个任务排满 CPU 队列
+        busy = svc.submit("modify", {"path": str(clip), "seconds": 1.5})
+        await asyncio.sleep(0.2)
+        svc.submit("modify", {"path": str(clip)})
+        svc.submit("modify", {"path": str(clip)})
+        with pytest.raises(service.HTTPError):
+            svc.submit("modify", {"path": str(clip)})
+
+        # 先转录再比较的任务转录完成后转入 CPU 队列，转录调度不应因此停下
+        compare = svc.submit("compare", {"path": str(clip), "original": "今天天气很好"})
+        transcribe = svc.submit("transcribe", {"path": str(clip)})
+        await wait_finished(transcribe)
+        assert transcribe.status == "done"
+        assert busy.status == "running"
+
+        await wait_finished(compare)
+        assert compare.result["comparison"] == {"相同": True}
+
+    run(scenario, queue_size=2)
+
+
+def test_broken_pool_is_recreated(patched, tmp_path):
+    clip = tmp_path / "clip.wav"
+    clip.write_bytes(b"")
+
+    async def scenario(svc):
+        crashed = svc.submit("modify", {"path": str(clip), "crash": True})
+        await wait_finished(crashed)
+        assert crashed.status == "failed"
+
+        job = svc.submit("modify", {"path": str(clip)})
+        await wait_finished(job)
+        assert job.status == "done"
+
+    run(scenario)
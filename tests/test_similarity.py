@@ -0,0 +1,85 @@
+import random
+
+import pytest
+
+from src import similarity
+
+# 随机用例数量
+N_CASES: int = 2000
+
+
+def nested_loop_similarity(text1: str, text2: str) -> float:
+    """
+    原有的两两比较实现：每个非空句子与所有句子逐一计算 Jaccard 相似度取最大值
+    """
+    sentences1 = text1.split("。")
+    sentences2 = text2.split("。")
+    sentence_pairs = []
+    for s1 in sentences1:
+        if s1.strip():
+            max_sim = max(
+                (len(set(s1) & set(s2)) / len(set(s1) | set(s2)) if s2.strip() else 0)
+                for s2 in sentences2
+            )
+            sentence_pairs.append(max_sim)
+
+    return sum(sentence_pairs) / len(sentence_pairs) if sentence_pairs else 0
+
+
+def random_text(rng: random.Random) -> str:
+    # 小字符集（含空格）使句子之间大量共享字符，并产生空白句子
+    alphabet = "今天气很好我们讨论 "
+    sentences = [
+        "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 8)))
+        for _ in range(rng.randint(0, 6))
+    ]
+    return "。".join(sentences)
+
+
+def test_exact_matches_nested_loop():
+    rng = random.Random(0)
+    for _ in range(N_CASES):
+        text1, text2 = random_text(rng), random_text(rng)
+        assert similarity.sentence_similarity(text1, text2) == pytest.approx(
+            nested_loop_similarity(text1, text2)
+        ), (text1, text2)
+
+
+def test_approximate_never_exceeds_exact():
+    rng = random.Random(1)
+    for _ in range(N_CASES):
+        text1, text2 = random_text(rng), random_text(rng)
+        exact = similarity.sentence_similarity(text1, text2)
+        approximate = similarity.sentence_similarity(text1, text2, approximate=True)
+        assert approximate <= exact + 1e-12, (text1, text2)
+
+
+def test_edge_cases():
+    assert (
+        similarity.sentence_similarity(
+            "今天天气很好。我们讨论", "今天天气很好。我们讨论"
+        )
+        == 1
+    )
+    assert similarity.sentence_similarity("", "今天天气很好") == 0
+    assert similarity.sentence_similarity("。 。", "今天天气很好") == 0
+    assert similarity.sentence_similarity("今天天气很好", "") == 0
+    assert similarity.sentence_similarity("今天", "明日") == 0
+
+
+def test_long_text_matches_nested_loop():
+    # 大字符集的长文本：候选句对稀疏，走稀疏矩阵路径
+    rng = random.Random(2)
+    alphabet = [chr(code) for code in range(0x4E00, 0x4E00 + 300)]
+    text1, text2 = (
+        "。".join(
+            "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 20)))
+            for _ in range(300)
+        )
+        for _ in range(2)
+    )
+    exact = similarity.sentence_similarity(text1, text2)
+    assert exact == pytest.approx(nested_loop_similarity(text1, text2))
+    assert (
+        similarity.sentence_similarity(text1, text2, approximate=True) <= exact + 1e-12
+    )
@@ -0,0 +1,97 @@
+import numpy as np
+import pytest
+
+from src import stft_engine
+from src.audio_buffer import AudioBuffer
+from src.logic_component import WX_ASR
+
+librosa = pytest.importorskip("librosa")
+
+SAMPLE_RATE: int = 22050
+N_SEGMENTS: int = 8
+SEGMENT_SECONDS: float = 0.6
+
+
+def harmonic_segments(seed: int = 0):
+    """
+    每段一个固定基频的谐波音，便于逐段比较音高
+    """
+    rng = np.random.default_rng(seed)
+    f0 = rng.uniform(110, 220, N_SEGMENTS)
+    t = np.arange(int(SEGMENT_SECONDS * SAMPLE_RATE)) / SAMPLE_RATE
+    audio = np.concatenate(
+        [sum(np.sin(2 * np.pi * k * f * t) / k for k in range(1, 5)) for f in f0]
+    )
+    return (0.3 * audio).astype(np.float32), f0
+
+
+def segment_stats(audio: np.ndarray, lengths: np.ndarray):
+    """
+    每段（去掉两端各 20%，避开段边界的过渡）的 YIN 基频中位数与 RMS
+    """
+    bounds = np.concatenate([[0], np.cumsum(lengths)])
+    pitch, rms = [], []
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        margin = (end - start) // 5
+        segment = audio[start + margin : end - margin]
+        f0 = librosa.yin(segment, fmin=80, fmax=300, sr=SAMPLE_RATE, frame_length=2048)
+        pitch.append(np.median(f0))
+        rms.append(np.sqrt(np.mean(np.square(segment))))
+    return np.array(pitch), np.array(rms)
+
+
+@pytest.mark.parametrize("n_samples", [0, 7, 40, 12345])
+def test_segment_bounds_match_array_split(n_samples):
+    bounds = stft_engine.segment_bounds(n_samples)
+    sizes = [len(part) for part in np.array_split(np.zeros(n_samples), 40)]
+    np.testing.assert_array_equal(np.diff(bounds), sizes)
+
+
+def test_modify_buffer_is_reproducible_with_seed():
+    audio, _ = harmonic_segments()
+    buffer = AudioBuffer(samples=audio, sr=SAMPLE_RATE)
+
+    outputs = []
+    for _ in range(2):
+        stft_engine.seed(5)
+        outputs.append(WX_ASR.modify_buffer(buffer).samples)
+    np.testing.assert_array_equal(outputs[0], outputs[1])
+    # 原始音频不被原地修改
+    np.testing.assert_array_equal(buffer.samples, harmonic_segments()[0])
+
+    with pytest.raises(ValueError):
+        WX_ASR.modify_buffer(buffer, engine="unknown")
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_batched_matches_reference_per_segment(seed):
+    audio, f0 = harmonic_segments(seed)
+    stft_engine.seed(seed)
+    stretch, pitch = stft_engine.draw_segment_factors(N_SEGMENTS)
+
+    batched = stft_engine.batched_modify(audio, SAMPLE_RATE, stretch, pitch)
+    reference = stft_engine.reference_modify(audio, SAMPLE_RATE, stretch, pitch)
+
+    # 两种引擎每段的输出长度都约为 段长 / 拉伸系数
+    lengths = np.round(
+        np.diff(stft_engine.segment_bounds(len(audio), N_SEGMENTS)) / stretch
+    )
+    lengths = lengths.astype(np.int64)
+    assert abs(len(batched) - lengths.sum()) <= N_SEGMENTS
+    assert abs(len(reference) - lengths.sum()) <= N_SEGMENTS
+
+    batched_pitch, batched_rms = segment_stats(batched, lengths)
+    reference_pitch, reference_rms = segment_stats(reference, lengths)
+    expected_pitch = f0 * 2.0 ** (pitch / 12.0)
+
+    # 音高误差以音分计（1 半音 = 100 音分）
+    def cents(a, b):
+        return np.abs(1200 * np.log2(a / b))
+
+    assert np.all(cents(batched_pitch, reference_pitch) < 10)
+    assert np.all(cents(batched_pitch, expected_pitch) < 10)
+    # 音量：相位声码器本身会损失一部分音量（参考实现最多约 20%），
+    # 批量引擎在段起点重置相位，每段音量不低于参考实现，也不会跨段累积损失
+    input_rms = np.sqrt(np.mean(np.square(audio)))
+    assert np.all(batched_rms > 0.9 * reference_rms)
+    assert np.all(batched_rms > 0.8 * input_rms)
@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+import soundfile as sf
+
+from src import stft_engine, stream_engine
+
+
+def test_postprocess_copies_unless_inplace():
+    audio = np.linspace(-0.5, 0.5, 10000, dtype=np.float32)
+    original = audio.copy()
+
+    result = stft_engine.postprocess(audio, 0.8, 0.01, np.random.default_rng(0))
+    np.testing.assert_array_equal(audio, original)
+    assert np.max(np.abs(result)) == np.float32(1.0)
+
+    inplace = stft_engine.postprocess(
+        audio, 0.8, 0.01, np.random.default_rng(0), inplace=True
+    )
+    assert inplace is audio
+    np.testing.assert_array_equal(inplace, result)
+
+
+def test_postprocess_without_normalize_only_clips():
+    audio = np.full(5000, 0.5, dtype=np.float32)
+    result = stft_engine.postprocess(
+        audio, 3.0, 0.0, np.random.default_rng(0), normalize=False
+    )
+    np.testing.assert_array_equal(result, np.ones(5000, dtype=np.float32))
+
+
+def test_stream_modify_is_seeded_float32(tmp_path):
+    sr = 16000
+    t = np.arange(sr * 6) / sr
+    source = tmp_path / "long.wav"
+    sf.write(source, 0.4 * np.sin(2 * np.pi * 220 * t), sr)
+
+    outputs = []
+    for name in ("a.wav", "b.wav"):
+        stft_engine.seed(3)
+        frames, out_sr = stream_engine.stream_modify_audio(
+            str(source), str(tmp_path / name), block_seconds=2.0, encoding="float32"
+        )
+        audio, _ = sf.read(tmp_path / name, dtype="float32")
+        assert out_sr == sr and len(audio) == frames
+        outputs.append(audio)
+
+    # 噪声来自 stft_engine 的共用生成器，固定种子后结果可复现
+    np.testing.assert_array_equal(outputs[0], outputs[1])
+    assert np.max(np.abs(outputs[0])) <= 1.0
+    assert abs(frames / (sr * 6) - 1) < 0.1
+
+
+def test_stream_normalize_modes(tmp_path):
+    sr = 16000
+    t = np.arange(sr * 5) / sr
+    source = tmp_path / "long.wav"
+    # 后半段音量更大，running_peak 只能按截至当前的峰值缩放
+    sf.write(source, np.where(t < 2.5, 0.1, 0.6) * np.sin(2 * np.pi * 200 * t), sr)
+
+    peaks = {}
+    for mode in stream_engine.NORMALIZE_MODES:
+        stft_engine.seed(0)
+        output = tmp_path / f"{mode}.wav"
+        frames, _ = stream_engine.stream_modify_audio(
+            str(source),
+            str(output),
+            block_seconds=1.0,
+            normalize=mode,
+            encoding="float32",
+        )
+        audio, _ = sf.read(output, dtype="float32")
+        assert len(audio) == frames
+        peaks[mode] = np.max(np.abs(audio))
+
+    # 两遍标准化的全局峰值为 1，单遍方式不会超过 1
+    assert peaks["two_pass"] == pytest.approx(1.0, abs=1e-6)
+    assert peaks["running_peak"] <= 1.0 + 1e-6
+
+    with pytest.raises(ValueError):
+        stream_engine.stream_modify_audio(
+            str(source), str(tmp_path / "x.wav"), normalize="unknown"
+        )
+
+
+@pytest.mark.parametrize("block_seconds", [0.5, 2.0])
+def test_stream_length_independent_of_block_size(tmp_path, block_seconds):
+    sr = 16000
+    source = tmp_path / "long.wav"
+    sf.write(source, np.random.default_rng(0).normal(0, 0.1, sr * 4), sr)
+
+    stft_engine.seed(0)
+    stretch, _ = stft_engine.draw_segment_factors(stft_engine.N_SEGMENTS)
+    expected = np.sum(np.diff(stft_engine.segment_bounds(sr * 4)) / stretch)
+
+    stft_engine.seed(0)
+    frames, _ = stream_engine.stream_modify_audio(
+        str(source), str(tmp_path / "out.wav"), block_seconds=block_seconds
+    )
+    assert abs(frames / expected - 1) < 0.05
@@ -0,0 +1,69 @@
+import json
+
+import numpy as np
+import pytest
+import soundfile as sf
+
+from src import model_registry, stft_engine, sweep
+from src.logic_component import WX_ASR
+
+CONFIG = {
+    "noise_level": 0.01,
+    "volume_gain": 0.85,
+    "stretch_spread": 0.03,
+    "pitch_spread": 1.5,
+}
+
+
+@pytest.fixture
+def transcribed(monkeypatch):
+    """
+    记录每次送去识别的音频，识别结果为采样的粗略摘要
+    """
+    calls = []
+
+    def fake_transcribe(self, audio, **kwargs):
+        calls.append(audio)
+        return {"text": "。".join(f"{v:.1f}" for v in audio.samples[::4000])}
+
+    monkeypatch.setattr(model_registry, "get_model", lambda *args: object())
+    monkeypatch.setattr(WX_ASR, "transcribe", fake_transcribe)
+    sweep._init_worker()
+    return calls
+
+
+@pytest.fixture
+def clip(tmp_path):
+    path = tmp_path / "clip.wav"
+    t = np.arange(22050 * 2) / 22050
+    sf.write(path, 0.3 * np.sin(2 * np.pi * 220 * t), 22050)
+    return str(path)
+
+
+def test_evaluate_matches_modify_audio(transcribed, clip, tmp_path):
+    result = sweep.evaluate(CONFIG, [clip], None, seed=7, tier="preview")
+    assert result["失败片段数"] == 0
+    evaluated = transcribed[0]
+
+    # 用扫描打印的复现方式调用 modify_audio，得到完全相同的音频
+    stft_engine.seed(7)
+    audio, sr = WX_ASR.modify_audio(
+        clip,
+        str(tmp_path / "best.wav"),
+        noise_level=CONFIG["noise_level"],
+        volume_gain=CONFIG["volume_gain"],
+        stretch_range=(1 - CONFIG["stretch_spread"], 1 + CONFIG["stretch_spread"]),
+        pitch_range=(-CONFIG["pitch_spread"], CONFIG["pitch_spread"]),
+        tier="preview",
+    )
+    assert sr == evaluated.sr
+    np.testing.assert_array_equal(audio, evaluated.samples)
+
+
+def test_unreadable_clip_is_recorded_as_failure(transcribed, clip, tmp_path):
+    missing = str(tmp_path / "missing.wav")
+    result = sweep.evaluate(CONFIG, [missing, clip], 1.0, seed=0)
+
+    assert result["失败片段数"] == 1
+    assert "missing.wav" in result["错误"]
+    assert len(json.loads(result["片段相似度"])) == 1
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from src import stft_engine
+from src.audio_buffer import AudioBuffer
+from src.logic_component import WX_ASR
+from test_stft_engine import N_SEGMENTS, SAMPLE_RATE, harmonic_segments, segment_stats
+
+librosa = pytest.importorskip("librosa")
+
+
+@pytest.mark.parametrize("tier", list(stft_engine.TIERS))
+def test_tiers_keep_segment_pitch(tier):
+    audio, f0 = harmonic_segments()
+    stft_engine.seed(0)
+    stretch, pitch = stft_engine.draw_segment_factors(N_SEGMENTS)
+
+    settings = stft_engine.tier_settings(tier)
+    modified, sr = stft_engine.tiered_modify(audio, SAMPLE_RATE, stretch, pitch, tier)
+    assert sr == min(SAMPLE_RATE, settings["sample_rate"] or SAMPLE_RATE)
+
+    lengths = np.round(
+        np.diff(stft_engine.segment_bounds(len(audio), N_SEGMENTS)) / stretch
+    )
+    measured, _ = segment_stats(modified, lengths.astype(np.int64))
+    expected = f0 * 2.0 ** (
+        stft_engine.group_pitch(pitch, settings["pitch_group"]) / 12.0
+    )
+    assert np.all(np.abs(1200 * np.log2(measured / expected)) < 10)
+
+
+def test_preview_downsamples_high_rate_input():
+    audio, _ = harmonic_segments()
+    high_rate = librosa.resample(audio, orig_sr=SAMPLE_RATE, target_sr=2 * SAMPLE_RATE)
+    stretch, pitch = np.ones(N_SEGMENTS), np.zeros(N_SEGMENTS)
+
+    preview_rate = stft_engine.tier_settings("preview")["sample_rate"]
+    modified, sr = stft_engine.tiered_modify(
+        high_rate, 2 * SAMPLE_RATE, stretch, pitch, "preview"
+    )
+    assert sr == preview_rate
+    assert abs(len(modified) - len(audio)) <= N_SEGMENTS
+
+    # 其他档位保持原采样率
+    _, sr = stft_engine.tiered_modify(
+        high_rate, 2 * SAMPLE_RATE, stretch, pitch, "standard"
+    )
+    assert sr == 2 * SAMPLE_RATE
+
+
+def test_modify_buffer_records_tier_sample_rate():
+    audio, _ = harmonic_segments()
+    high_rate = librosa.resample(audio, orig_sr=SAMPLE_RATE, target_sr=2 * SAMPLE_RATE)
+    buffer = AudioBuffer(samples=high_rate, sr=2 * SAMPLE_RATE)
+
+    preview = WX_ASR.modify_buffer(buffer, tier="preview")
+    assert preview.sr == stft_engine.tier_settings("preview")["sample_rate"]
+    assert np.max(np.abs(preview.samples)) <= 1.0
+
+
+def test_group_pitch_shares_first_offset():
+    pitch = np.arange(10, dtype=float)
+    np.testing.assert_array_equal(
+        stft_engine.group_pitch(pitch, 4), [0, 0, 0, 0, 4, 4, 4, 4, 8, 8]
+    )
+    assert stft_engine.group_pitch(pitch, 1) is pitch
+
+
+def test_unknown_tier_raises():
+    with pytest.raises(ValueError):
+        stft_engine.tier_settings("ultra")
+    # 返回副本，修改不影响档位定义
+    settings = stft_engine.tier_settings("preview")
+    settings["n_fft"] = 1
+    assert stft_engine.TIERS["preview"]["n_fft"] != 1
@@ -0,0 +1,65 @@
+from types import SimpleNamespace
+
+import pytest
+
+from src import tokenizer
+
+
+@pytest.fixture
+def cuts(monkeypatch):
+    """
+    用按字符切分的假 jieba 替换真实分词器，记录实际分词的文本
+    """
+    calls = []
+
+    def cut(text):
+        calls.append(text)
+        return iter(text)
+
+    monkeypatch.setattr(
+        tokenizer,
+        "jieba",
+        SimpleNamespace(dt=SimpleNamespace(initialized=True), cut=cut),
+    )
+    tokenizer.clear()
+    yield calls
+    tokenizer.clear()
+
+
+def test_tokenize_is_cached(cuts):
+    first = tokenizer.tokenize("今天，天气 好")
+    assert first == ("今", "天", "，", "天", "气", " ", "好")
+    assert tokenizer.tokenize("今天，天气 好") is first
+    assert cuts == ["今天，天气 好"]
+
+    tokenizer.clear()
+    tokenizer.tokenize("今天，天气 好")
+    assert len(cuts) == 2
+
+
+def test_words_drop_punctuation_and_whitespace(cuts):
+    assert tokenizer.words("今天，好 1。") == ("今", "天", "好", "1")
+    assert list(tokenizer.iter_words("今天，好 1。")) == ["今", "天", "好", "1"]
+
+
+def test_cache_is_bounded_lru(cuts, monkeypatch):
+    monkeypatch.setattr(tokenizer, "MAX_ENTRIES", 2)
+    tokenizer.tokenize("甲")
+    tokenizer.tokenize("乙")
+    # 访问“甲”后插入“丙”，最久未使用的“乙”被淘汰
+    tokenizer.tokenize("甲")
+    tokenizer.tokenize("丙")
+    assert len(tokenizer._cache) == 2
+
+    tokenizer.tokenize("甲")
+    tokenizer.tokenize("乙")
+    assert cuts == ["甲", "乙", "丙", "乙"]
+
+
+def test_warm_up_skips_loaded_dictionary(cuts, monkeypatch):
+    monkeypatch.setattr(tokenizer.lazy_import, "is_loaded", lambda name: True)
+    monkeypatch.setattr(
+        tokenizer, "initialize", lambda: pytest.fail("词典已加载，不应重复初始化")
+    )
+    assert tokenizer.warm_up() is None
+    assert tokenizer.warm_up(background=False) is None
@@ -0,0 +1,79 @@
+import threading
+
+import numpy as np
+import pytest
+
+from src import artifact_store, model_registry, segment_asr
+from src.artifact_store import ArtifactStore
+from src.audio_buffer import WHISPER_SAMPLE_RATE, AudioBuffer
+from src.logic_component import WX_ASR
+from src.segment_asr import TranscriptionCancelled
+from src.transcription_cache import TranscriptionCache
+
+AUDIO = AudioBuffer(
+    samples=np.random.default_rng(0)
+    .normal(0, 0.1, WHISPER_SAMPLE_RATE)
+    .astype(np.float32),
+    sr=WHISPER_SAMPLE_RATE,
+)
+
+
+@pytest.fixture
+def wx(monkeypatch, tmp_path):
+    monkeypatch.setattr(
+        artifact_store, "_default_store", ArtifactStore(tmp_path / "artifacts")
+    )
+    monkeypatch.setattr(model_registry, "get_model", lambda *args: object())
+    monkeypatch.setattr(
+        model_registry, "inference_lock", lambda *args: threading.Lock()
+    )
+    monkeypatch.setattr(segment_asr, "vad_windows", lambda audio: [(0, len(audio))])
+
+    wx = WX_ASR()
+    wx.cache = TranscriptionCache(tmp_path / "cache")
+    return wx
+
+
+def test_cancel_during_decoding_writes_no_artifacts(monkeypatch, wx):
+    cancel = threading.Event()
+
+    def cancelled_mid_decode(model, audio, windows, language, batch_size, **kwargs):
+        # 解码期间用户点击取消
+        cancel.set()
+        return [{"id": 0, "window": 0, "start": 0.0, "end": 1.0, "text": "你好"}]
+
+    monkeypatch.setattr(segment_asr, "transcribe_windows", cancelled_mid_decode)
+    job_id = wx.store.create_job("pipeline", AUDIO)
+
+    with pytest.raises(TranscriptionCancelled):
+        wx.ASR_Tester(
+            AUDIO, mode="vad", job_id=job_id, name="original", cancel_event=cancel
+        )
+    with pytest.raises(KeyError):
+        wx.store.get_text(job_id, "original.txt")
+
+
+def test_cancel_before_inference_skips_model(monkeypatch, wx):
+    cancel = threading.Event()
+    cancel.set()
+    monkeypatch.setattr(
+        segment_asr,
+        "transcribe_windows",
+        lambda *args, **kwargs: pytest.fail("不应解码"),
+    )
+
+    with pytest.raises(TranscriptionCancelled):
+        wx.transcribe(AUDIO, mode="vad", cancel_event=cancel)
+
+
+def test_uncancelled_transcription_is_stored(monkeypatch, wx):
+    monkeypatch.setattr(
+        segment_asr,
+        "transcribe_windows",
+        lambda *args, **kwargs: [
+            {"id": 0, "window": 0, "start": 0.0, "end": 1.0, "text": "你好"}
+        ],
+    )
+
+    text = wx.ASR_Tester(AUDIO, mode="vad", cancel_event=threading.Event())
+    assert text == "你好"
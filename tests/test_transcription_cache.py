@@ -0,0 +1,80 @@
+import os
+import threading
+
+import numpy as np
+import pytest
+
+from src import model_registry
+from src.audio_buffer import WHISPER_SAMPLE_RATE, AudioBuffer
+from src.logic_component import WX_ASR
+from src.transcription_cache import TranscriptionCache
+
+AUDIO = np.random.default_rng(0).normal(0, 0.1, WHISPER_SAMPLE_RATE).astype(np.float32)
+
+
+def test_key_depends_on_content_model_and_options():
+    key = TranscriptionCache.make_key(AUDIO, "base", {"language": "zh"})
+
+    # 内容相同的不同数组（包括非连续视图）得到相同的键
+    assert TranscriptionCache.make_key(AUDIO.copy(), "base", {"language": "zh"}) == key
+    strided = np.repeat(AUDIO, 2)[::2]
+    assert TranscriptionCache.make_key(strided, "base", {"language": "zh"}) == key
+
+    changed = AUDIO.copy()
+    changed[100] += 1e-3
+    assert TranscriptionCache.make_key(changed, "base", {"language": "zh"}) != key
+    assert TranscriptionCache.make_key(AUDIO, "small", {"language": "zh"}) != key
+    assert TranscriptionCache.make_key(AUDIO, "base", {"language": "en"}) != key
+
+
+def test_lru_eviction_keeps_recently_used(tmp_path):
+    cache = TranscriptionCache(tmp_path, max_bytes=10**9)
+    for i in range(3):
+        cache.put(f"k{i}", {"text": "字" * 100})
+        os.utime(tmp_path / f"k{i}.json", (i, i))
+
+    # 读取 k0 刷新其使用时间，之后超出容量时先淘汰 k1
+    assert cache.get("k0")["text"] == "字" * 100
+    cache.max_bytes = 2 * (tmp_path / "k0.json").stat().st_size
+    assert cache.evict() == 1
+    assert cache.get("k1") is None
+    assert cache.get("k0") is not None and cache.get("k2") is not None
+
+
+@pytest.fixture
+def counted(monkeypatch, tmp_path):
+    """
+    替换模型，记录真正推理的次数
+    """
+    calls = []
+
+    class FakeModel:
+        def transcribe(self, audio, **options):
+            calls.append(options)
+            return {"text": "你好", "segments": [{"id": 0, "text": "你好"}]}
+
+    monkeypatch.setattr(model_registry, "get_model", lambda *args: FakeModel())
+    monkeypatch.setattr(
+        model_registry, "inference_lock", lambda *args: threading.Lock()
+    )
+    return calls, TranscriptionCache(tmp_path)
+
+
+def test_transcribe_hits_cache_by_content(counted):
+    calls, cache = counted
+    wx = WX_ASR()
+    wx.cache = cache
+
+    buffer = AudioBuffer(samples=AUDIO, sr=WHISPER_SAMPLE_RATE, source="a.wav")
+    renamed = AudioBuffer(samples=AUDIO.copy(), sr=WHISPER_SAMPLE_RATE, source="b.wav")
+    assert wx.transcribe(buffer)["text"] == "你好"
+    assert wx.transcribe(renamed)["text"] == "你好"
+    assert len(calls) == 1
+
+    # 跳过缓存、或精度不同（缓存键不同）时重新识别
+    wx.transcribe(buffer, use_cache=False)
+    assert len(calls) == 2
+    quantized = WX_ASR(dtype="int8")
+    quantized.cache = cache
+    quantized.transcribe(buffer)
+    assert len(calls) == 3